@@ -0,0 +1,27 @@
+"""Add claim columns to flow_run
+
+Revision ID: 3b7e2d9c41f0
+Revises: 19a3279afd31
+Create Date: 2026-10-18 09:12:41.302117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2d9c41f0'
+down_revision = '19a3279afd31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('flow_run', sa.Column('claimed_by', sa.String(), nullable=True))
+    op.add_column('flow_run', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('flow_run', 'claimed_at')
+    op.drop_column('flow_run', 'claimed_by')
@@ -0,0 +1,25 @@
+"""Add arguments to task_operation
+
+Revision ID: 5c9a1f3e7b82
+Revises: 8e41c07a5d26
+Create Date: 2026-10-18 13:05:27.904611
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = '5c9a1f3e7b82'
+down_revision = '8e41c07a5d26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_operation', sa.Column('arguments', app.models.types.text_pickle.TextPickleType(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_operation', 'arguments')
@@ -0,0 +1,25 @@
+"""Add attempts to task_run
+
+Revision ID: 6f3b8d2e9a14
+Revises: a2d4e6f81c39
+Create Date: 2026-10-18 15:02:44.318265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = '6f3b8d2e9a14'
+down_revision = 'a2d4e6f81c39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_run', sa.Column('attempts', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_run', 'attempts')
@@ -0,0 +1,27 @@
+"""Add prompt_hash to task_prep_prompt
+
+Revision ID: 8e41c07a5d26
+Revises: 3b7e2d9c41f0
+Create Date: 2026-10-18 11:47:03.518342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = '8e41c07a5d26'
+down_revision = '3b7e2d9c41f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_prep_prompt', sa.Column('prompt_hash', sa.String(), nullable=True))
+    op.create_index(op.f('ix_task_prep_prompt_prompt_hash'), 'task_prep_prompt', ['prompt_hash'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_task_prep_prompt_prompt_hash'), table_name='task_prep_prompt')
+    op.drop_column('task_prep_prompt', 'prompt_hash')
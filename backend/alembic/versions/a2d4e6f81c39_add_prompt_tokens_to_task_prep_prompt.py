@@ -0,0 +1,25 @@
+"""Add prompt_tokens to task_prep_prompt
+
+Revision ID: a2d4e6f81c39
+Revises: 5c9a1f3e7b82
+Create Date: 2026-10-18 14:21:56.120493
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = 'a2d4e6f81c39'
+down_revision = '5c9a1f3e7b82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_prep_prompt', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_prep_prompt', 'prompt_tokens')
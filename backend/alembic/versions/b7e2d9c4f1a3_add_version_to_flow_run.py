@@ -0,0 +1,26 @@
+"""Add version to flow run
+
+Revision ID: b7e2d9c4f1a3
+Revises: e8c3f1a6d2b9
+Create Date: 2026-10-18 17:48:05.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d9c4f1a3'
+down_revision = 'e8c3f1a6d2b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # With a constant default, existing rows are not rewritten
+    op.add_column('flow_run', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('flow_run', 'version')
@@ -0,0 +1,52 @@
+"""Add keyset pagination indexes
+
+Revision ID: d4a7c2e9b1f6
+Revises: 6f3b8d2e9a14
+Create Date: 2026-10-18 16:41:09.502817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7c2e9b1f6'
+down_revision = '6f3b8d2e9a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_flow_created_date_id', 'flow', ['created_date', 'id'], unique=False)
+    op.create_index(
+        'ix_flow_created_by_email_created_date_id', 'flow', ['created_by_email', 'created_date', 'id'], unique=False
+    )
+    op.create_index('ix_flow_run_triggered_time_id', 'flow_run', ['triggered_time', 'id'], unique=False)
+    op.create_index(
+        'ix_flow_run_status_triggered_time_id', 'flow_run', ['status', 'triggered_time', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_flow_run_triggered_by_triggered_time_id', 'flow_run', ['triggered_by', 'triggered_time', 'id'], unique=False
+    )
+    op.create_index('ix_task_run_start_time_id', 'task_run', ['start_time', 'id'], unique=False)
+    op.create_index('ix_task_run_status_start_time_id', 'task_run', ['status', 'start_time', 'id'], unique=False)
+    op.create_index('ix_flow_request_created_date_id', 'flow_request', ['created_date', 'id'], unique=False)
+    op.create_index(
+        'ix_flow_request_created_by_email_created_date_id',
+        'flow_request',
+        ['created_by_email', 'created_date', 'id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_flow_request_created_by_email_created_date_id', table_name='flow_request')
+    op.drop_index('ix_flow_request_created_date_id', table_name='flow_request')
+    op.drop_index('ix_task_run_status_start_time_id', table_name='task_run')
+    op.drop_index('ix_task_run_start_time_id', table_name='task_run')
+    op.drop_index('ix_flow_run_triggered_by_triggered_time_id', table_name='flow_run')
+    op.drop_index('ix_flow_run_status_triggered_time_id', table_name='flow_run')
+    op.drop_index('ix_flow_run_triggered_time_id', table_name='flow_run')
+    op.drop_index('ix_flow_created_by_email_created_date_id', table_name='flow')
+    op.drop_index('ix_flow_created_date_id', table_name='flow')
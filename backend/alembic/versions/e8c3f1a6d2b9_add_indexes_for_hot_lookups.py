@@ -0,0 +1,49 @@
+"""Add indexes for hot lookups
+
+Revision ID: e8c3f1a6d2b9
+Revises: d4a7c2e9b1f6
+Create Date: 2026-10-18 17:12:36.884120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import app.models.types
+
+# revision identifiers, used by Alembic.
+revision = 'e8c3f1a6d2b9'
+down_revision = 'd4a7c2e9b1f6'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index condition)
+INDEXES = [
+    ('ix_task_run_flow_run_start_time_id', 'task_run', ['flow_run', 'start_time', 'id'], None),
+    ('ix_flow_run_flow_triggered_time_id', 'flow_run', ['flow', 'triggered_time', 'id'], None),
+    ('ix_flow_request_flow_created_date', 'flow_request', ['flow', 'created_date'], None),
+    ('ix_task_operation_flow', 'task_operation', ['flow'], None),
+    ('ix_dependency_flow', 'dependency', ['flow'], None),
+    ('ix_task_definition_active_task_name', 'task_definition', ['task_name'], 'deleted_at IS NULL'),
+    ('ix_task_definition_active_created_date', 'task_definition', ['created_date'], 'deleted_at IS NULL'),
+    ('ix_integration_credential_modified_by_email', 'integration_credential', ['modified_by_email'], None),
+]
+
+
+def upgrade():
+    # Built concurrently, outside of the migration transaction, so writes to the run tables are not blocked
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
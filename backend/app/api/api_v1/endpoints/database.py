@@ -0,0 +1,21 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.core.auth import Auth0User, auth
+from app.db.session import async_engine, engine
+
+router = APIRouter()
+
+
+@router.get("/pool_stats", response_model=Dict[str, Any])
+def read_pool_stats(
+    *,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Get the connection counts and checkout wait times of the database connection pools of this process, of the
+    sync engine and of the async engine.
+    """
+
+    return {"sync": engine.pool.stats(), "async": async_engine.pool.stats()}
@@ -1,8 +1,11 @@
-from typing import Any, List
-from fastapi import APIRouter, Body, Depends
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError
 
 from app.core.auth import Auth0User, auth
 
@@ -54,6 +57,38 @@ def read_all_flow_requests(
     return response
 
 
+@router.get("/page", response_model=schemas.Page[schemas.FlowRequest])
+def read_flow_requests_page(
+    *,
+    db: Session = Depends(deps.get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    flow_id: Optional[UUID] = None,
+    created_by_email: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Retrieve a page of flow requests, most recently created first. Pass `next_cursor` of a page as `cursor` to get
+    the next.
+    """
+    try:
+        flow_requests, next_cursor = crud.flow_request.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            flow_id=flow_id,
+            created_by_email=created_by_email,
+            since=since,
+            until=until,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return schemas.Page[schemas.FlowRequest](
+        items=[schemas.FlowRequest.from_orm(flow_request) for flow_request in flow_requests], next_cursor=next_cursor
+    )
+
 @router.get("/", response_model=schemas.FlowRequest)
 def read_flow_request(
     *,
@@ -1,20 +1,31 @@
-from typing import Any, List
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
 from app.core.auth import Auth0User, auth
+from app.core.config import settings
+from app.core.shared_models import FlowStatus
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.flow_execution.async_core import AsyncExecutionContext
+from app.flow_execution.events import Subscription, SubscriptionLaggedError, event_broker
+from app.worker.flow_runs import run_flow
 
 
 router = APIRouter()
 
 @router.get("/all", response_model=List[schemas.FlowRun])
-def read_all_flows_runs(
+async def read_all_flows_runs(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     current_user: Auth0User = Depends(auth.get_user),
@@ -22,8 +33,42 @@ def read_all_flows_runs(
     """
     Retrieve all flow runs.
     """
-    response = crud.flow_run.get_multi(db=db, skip=skip, limit=limit)
-    return response
+    flow_runs = await crud.async_flow_run.get_multi(db=db, skip=skip, limit=limit)
+    return [schemas.FlowRun.from_orm(flow_run) for flow_run in flow_runs]
+
+@router.get("/page", response_model=schemas.Page[schemas.FlowRun])
+async def read_flow_runs_page(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    flow_id: Optional[UUID] = None,
+    status: Optional[FlowStatus] = None,
+    triggered_by: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Retrieve a page of flow runs, most recently triggered first. Pass `next_cursor` of a page as `cursor` to get the
+    next.
+    """
+    try:
+        flow_runs, next_cursor = await crud.async_flow_run.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            flow_id=flow_id,
+            status=status,
+            triggered_by=triggered_by,
+            since=since,
+            until=until,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return schemas.Page[schemas.FlowRun](
+        items=[schemas.FlowRun.from_orm(flow_run) for flow_run in flow_runs], next_cursor=next_cursor
+    )
 
 @router.post("/", response_model=schemas.FlowRun)
 def create_flow_run(
@@ -39,24 +84,84 @@ def create_flow_run(
     flow_run = crud.flow_run.create(db, obj_in=flow_run_in, current_user=current_user)
     return flow_run
 
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether the ETags of an If-None-Match header include `etag`, compared weakly as RFC 9110 prescribes.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def _not_modified(db: AsyncSession, id: UUID, if_none_match: Optional[str]) -> Optional[Response]:
+    """
+    Returns a 304 response if the client already has the current version of the flow run, reading nothing but its
+    version.
+    """
+    if if_none_match is None:
+        return None
+    version = await crud.async_flow_run.get_version(db, id)
+    if version is not None and _etag_matches(if_none_match, _etag(version)):
+        return Response(status_code=304, headers={"ETag": _etag(version)})
+    return None
+
+
 @router.get("/", response_model=schemas.FlowRun)
-def read_flow_run(
+async def read_flow_run(
     *,
-    db: Session = Depends(deps.get_db),
-    id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: Auth0User = Depends(auth.get_user),
 ) -> Any:
     """
-    Get flow run by id.
+    Get flow run by id. Responds with 304 Not Modified if the ETag in If-None-Match is still current.
     """
-    
-    return crud.flow_run.get(db, id)
+    not_modified = await _not_modified(db, id, if_none_match)
+    if not_modified:
+        return not_modified
+
+    flow_run = await crud.async_flow_run.get(db, id)
+    if flow_run:
+        response.headers["ETag"] = _etag(flow_run.version)
+    return flow_run
+
+
+@router.get("/summary", response_model=schemas.FlowRunSummary)
+async def read_flow_run_summary(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Get the status and timings of a flow run and its task runs, without their results, for polling its progress.
+    Responds with 304 Not Modified if the ETag in If-None-Match is still current.
+    """
+    not_modified = await _not_modified(db, id, if_none_match)
+    if not_modified:
+        return not_modified
+
+    flow_run = await crud.async_flow_run.get_summary(db, id)
+    if not flow_run:
+        raise HTTPException(status_code=404, detail="Flow run not found.")
+    response.headers["ETag"] = _etag(flow_run.version)
+    return schemas.FlowRunSummary.from_orm(flow_run)
 
 @router.get("/all_for_flow_id", response_model=List[schemas.FlowRun])
-def read_all_for_flow_id(
+async def read_all_for_flow_id(
     *,
-    db: Session = Depends(deps.get_db),
-    flow_id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    flow_id: UUID,
     skip: int = 0,
     limit: int = 100,
     current_user: Auth0User = Depends(auth.get_user),
@@ -65,4 +170,129 @@ def read_all_for_flow_id(
     Get all flow runs by flow_id.
     """
     
-    return crud.flow_run.get_multi_by_flow_id(db, flow_id, skip=skip, limit=limit)
\ No newline at end of file
+    flow_runs = await crud.async_flow_run.get_multi_by_flow_id(db, flow_id, skip=skip, limit=limit)
+    return [schemas.FlowRun.from_orm(flow_run) for flow_run in flow_runs]
+
+
+# Statuses after which a flow run publishes no more events, unless it is resumed
+FINISHED_STATUSES = (FlowStatus.COMPLETED, FlowStatus.FAILED, FlowStatus.CANCELLED)
+
+
+def _server_sent_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _stream_flow_run_events(flow_run: schemas.FlowRun, subscription: Subscription) -> AsyncIterator[str]:
+    """
+    Streams the flow run as it is now, followed by its events until it is finished.
+    """
+    try:
+        yield _server_sent_event("snapshot", flow_run.model_dump_json())
+        if flow_run.status in FINISHED_STATUSES:
+            return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), timeout=settings.FLOW_RUN_EVENT_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            except SubscriptionLaggedError:
+                # The client reconnects and starts over from a new snapshot
+                return
+
+            yield _server_sent_event(event.type.value, event.model_dump_json())
+            if event.type == schemas.FlowRunEventType.FLOW_RUN and event.status in FINISHED_STATUSES:
+                return
+    finally:
+        subscription.close()
+
+
+@router.get("/events")
+async def stream_flow_run_events(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    id: UUID,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Stream the progress of a flow run as Server-Sent Events, instead of polling it.
+
+    The first event ("snapshot") is the flow run with its task runs as stored. It is followed by a "task_run" event
+    for every transition of a task run (started, retried, closed with its preparation answer and result) and a
+    "flow_run" event when the flow run closes, after which the stream ends.
+    """
+    # Subscribe before reading the snapshot, so no transition falls between the two
+    subscription = await event_broker.subscribe(id)
+    try:
+        flow_run = await crud.async_flow_run.get(db, id)
+    except Exception:
+        subscription.close()
+        raise
+    if not flow_run:
+        subscription.close()
+        raise HTTPException(status_code=404, detail="Flow run not found.")
+
+    return StreamingResponse(
+        _stream_flow_run_events(schemas.FlowRun.from_orm(flow_run), subscription),
+        media_type="text/event-stream",
+        # Proxies must pass the events on as they come instead of buffering the response
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/resume", response_model=schemas.FlowRun)
+def resume_flow_run(
+    *,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(deps.get_db),
+    id: str,
+    max_concurrency: Optional[int] = None,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Resume a failed or cancelled flow run by id, or one left in progress by a process that died: its claim was not
+    refreshed for FLOW_RUN_CLAIM_TIMEOUT_SECONDS.
+    Task operations that already completed keep their results; only the failed, interrupted and
+    downstream task operations are executed again.
+    """
+    flow_run_db = crud.flow_run.get(db, id)
+    if not flow_run_db:
+        raise HTTPException(status_code=404, detail="Flow run not found.")
+    if flow_run_db.status not in (FlowStatus.FAILED, FlowStatus.CANCELLED, FlowStatus.IN_PROGRESS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Only failed, cancelled or orphaned flow runs can be resumed, this flow run is "
+            f"{flow_run_db.status.value}.",
+        )
+
+    user_schema = crud.user.get_cached_by_email(db, email=current_user.email)
+    flow_schema = schemas.Flow.from_orm(crud.flow.get(db=db, id=flow_run_db.flow))
+
+    # Resumed in process, the flow run is in progress right away; for Celery it is pending until a worker claims it
+    status = FlowStatus.IN_PROGRESS if settings.FLOW_RUN_EXECUTOR == "in_process" else FlowStatus.PENDING
+    flow_run_db = crud.flow_run.reopen(
+        db, id=flow_run_db.id, status=status, claim_timeout_seconds=settings.FLOW_RUN_CLAIM_TIMEOUT_SECONDS
+    )
+    if not flow_run_db:
+        raise HTTPException(
+            status_code=409, detail="The flow run is still executing or was resumed by another request."
+        )
+    flow_run_schema = schemas.FlowRun.from_orm(flow_run_db)
+
+    if settings.FLOW_RUN_EXECUTOR == "in_process":
+        execution_context = AsyncExecutionContext(
+            db=None,
+            user=user_schema,
+            flow=flow_schema,
+            flow_run=flow_run_schema,
+            max_concurrency=max_concurrency,
+            resume=True,
+        )
+        background_tasks.add_task(execution_context.run_flow)
+    else:
+        run_flow.delay(str(flow_run_schema.id), user_schema.email, max_concurrency)
+
+    return flow_run_schema
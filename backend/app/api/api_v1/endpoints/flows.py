@@ -1,22 +1,27 @@
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Optional
 from uuid import UUID
 from app.core.utils.flow_validation import validate_flow
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
 from app.core.auth import Auth0User, auth
+from app.core.config import settings
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError
 from app.core.flow_generator import flow_generator
 from app.schemas.flow import Flow, FlowBase, FlowInDBBase
 from app.schemas.task_operation import TaskOperationBase
 from app.schemas.dependency import DependencyBase
 from app.flow_execution.core import ExecutionContext
+from app.flow_execution.async_core import AsyncExecutionContext
 from app.schemas.flow_run import FlowRunBase
 from app.core.shared_models import FlowStatus
+from app.worker.flow_runs import run_flow
 
 
 router = APIRouter()
@@ -61,9 +66,9 @@ def update_flow(
     return schemas.Flow.from_orm(flow)
 
 @router.get("/all", response_model=List[schemas.Flow])
-def read_all_flows(
+async def read_all_flows(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     current_user: Auth0User = Depends(auth.get_user),
@@ -72,22 +77,45 @@ def read_all_flows(
     Retrieve all flows.
     """
 
-    response = crud.flow.get_multi(db=db, skip=skip, limit=limit)
-    return response
+    flows = await crud.async_flow.get_multi(db=db, skip=skip, limit=limit)
+    return [schemas.Flow.from_orm(flow) for flow in flows]
+
+
+@router.get("/page", response_model=schemas.Page[schemas.Flow])
+async def read_flows_page(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    created_by_email: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Retrieve a page of flows, most recently created first. Pass `next_cursor` of a page as `cursor` to get the next.
+    """
+    try:
+        flows, next_cursor = await crud.async_flow.get_page(
+            db, cursor=cursor, limit=limit, created_by_email=created_by_email, since=since, until=until
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return schemas.Page[schemas.Flow](items=[schemas.Flow.from_orm(flow) for flow in flows], next_cursor=next_cursor)
 
 
 @router.get("/", response_model=schemas.Flow)
-def read_flow(
+async def read_flow(
     *,
-    db: Session = Depends(deps.get_db),
-    id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    id: UUID,
     current_user: Auth0User = Depends(auth.get_user),
 ) -> Any:
     """
     Get flow by id.
     """
 
-    return crud.flow.get(db, id)
+    return await crud.async_flow.get(db, id)
 
 
 @router.delete("/", response_model=schemas.Flow)
@@ -121,7 +149,7 @@ def generate_flow_and_execute(
     generated_flow_in.task_operations = generated_flow_in.topological_sort()
 
     generated_flow_db = crud.flow.create(db=db, flow=generated_flow_in, current_user=current_user)
-    user = crud.user.get_by_email(db, email=current_user.email)
+    user = crud.user.get_cached_by_email(db, email=current_user.email)
     generate_flow_schema = schemas.Flow.from_orm(generated_flow_db)
 
     execution_context = ExecutionContext(user=user, flow=generate_flow_schema)
@@ -155,32 +183,42 @@ def execute(
     background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     id: str,
+    max_concurrency: Optional[int] = None,
     current_user: Auth0User = Depends(auth.get_user),
 ) -> schemas.FlowRun:
     """
     Execute flow by given Flow ID.
+    Independent task operations run concurrently, up to `max_concurrency` at the same time.
+
+    By default the flow run runs on the event loop of the API process through the AsyncExecutionContext.
+    With FLOW_RUN_EXECUTOR set to "celery", it is enqueued for the Celery workers instead, so it survives
+    API restarts and scales with the number of workers.
     """
-    user = crud.user.get_by_email(db, email=current_user.email)
+    user_schem = crud.user.get_cached_by_email(db, email=current_user.email)
     flow_db = crud.flow.get(db=db, id=id)
     
     flow_schema = schemas.Flow.from_orm(flow_db)
-    user_schem = schemas.User.from_orm(user)    
-    flow_run_schema = _create_flow_run(db, flow_schema, user)
 
-    execution_context = ExecutionContext(db=db, user=user_schem, flow=flow_schema, flow_run=flow_run_schema)
-    
-    background_tasks.add_task(execution_context.run_flow)
+    if settings.FLOW_RUN_EXECUTOR == "in_process":
+        flow_run_schema = _create_flow_run(db, flow_schema, user_schem, status=FlowStatus.IN_PROGRESS)
+        execution_context = AsyncExecutionContext(
+            db=None, user=user_schem, flow=flow_schema, flow_run=flow_run_schema, max_concurrency=max_concurrency
+        )
+        background_tasks.add_task(execution_context.run_flow)
+    else:
+        flow_run_schema = _create_flow_run(db, flow_schema, user_schem, status=FlowStatus.PENDING)
+        run_flow.delay(str(flow_run_schema.id), user_schem.email, max_concurrency)
 
     return flow_run_schema
 
 def _create_flow_run(
-    db: Session, flow: Flow, user: schemas.User
+    db: Session, flow: Flow, user: schemas.User, status: FlowStatus = FlowStatus.IN_PROGRESS
 ) -> schemas.FlowRun:
     flow_run = models.FlowRun(
         flow=flow.id,
-        status=FlowStatus.IN_PROGRESS,
+        status=status,
         triggered_time=datetime.now(),
         triggered_by=user.email,
     )
     flow_run_db = crud.flow_run.create(db=db, obj_in=flow_run, current_user=user)
-    return schemas.FlowRun.from_orm(flow_run_db)
\ No newline at end of file
+    return schemas.FlowRun.from_orm(flow_run_db)
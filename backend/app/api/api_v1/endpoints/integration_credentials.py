@@ -6,6 +6,7 @@ from app.api import deps
 
 from app.core.auth import Auth0User, auth
 from app.core.secrets import key_vault
+from app.flow_execution.integration_pool import integration_pool
 from app.models import Integration, IntegrationCredential
 
 router = APIRouter()
@@ -37,6 +38,8 @@ def create_or_update_by_integration_and_user_email(
         integration_credential = crud.integration_credential.create(db, obj_in=integration_credential_in, current_user=current_user)
         key_vault.set_secret(integration_credential.id, integration_credential_in.credential)
 
+    integration_pool.invalidate(current_user.email, integration_credential.integration)
+
     return integration_credential
 
 
@@ -67,4 +70,7 @@ def remove_integration_credential(
     
     key_vault.delete_secret(id)
 
-    return crud.integration_credential.remove(db=db, id=id)
+    integration_credential = crud.integration_credential.remove(db=db, id=id)
+    integration_pool.invalidate(integration_credential.modified_by_email, integration_credential.integration)
+
+    return integration_credential
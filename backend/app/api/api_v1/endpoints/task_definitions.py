@@ -97,3 +97,28 @@ def retrieve_task_definitions(
     """
 
     return task_definition_retrieval_manager.retrieve_similar_task_definitions(request)
+
+
+@router.get("/index_sync", response_model=schemas.TaskDefinitionIndexSync)
+def read_task_definition_index_sync(
+    *,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Get the progress of the latest sync of the task definition embeddings with the catalog.
+    """
+
+    return task_definition_retrieval_manager.index_sync
+
+
+@router.post("/index_sync", response_model=schemas.TaskDefinitionIndexSync)
+def start_task_definition_index_sync(
+    *,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Start syncing the task definition embeddings with the catalog in the background, unless a sync is running.
+    Only new and changed task definitions are embedded.
+    """
+
+    return task_definition_retrieval_manager.start_index_sync()
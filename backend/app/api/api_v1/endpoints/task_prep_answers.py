@@ -1,11 +1,12 @@
 
-from typing import Any, List
+from typing import Any, Dict, List
 from fastapi import APIRouter, Body, Depends
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
 
 from app.core.auth import Auth0User, auth
+from app.core.task_prep_cache import task_prep_cache
 
 router = APIRouter()
 
@@ -40,6 +41,18 @@ def read_all_task_prep_answers(
     return response
 
 
+@router.get("/cache_stats", response_model=Dict[str, Any])
+def read_task_prep_cache_stats(
+    *,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Get the hit and miss counters of the task preparation cache of this process.
+    """
+
+    return task_prep_cache.stats()
+
+
 @router.get("/", response_model=schemas.TaskPrepAnswer)
 def read_task_prep_answer(
     *,
@@ -1,8 +1,13 @@
-from typing import Any, List
-from fastapi import APIRouter, Body, Depends
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
+from app.core.shared_models import TaskStatus
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError
 
 from app.core.auth import Auth0User, auth
 
@@ -20,13 +25,15 @@ def create_task_run(
     """
 
     task_run = crud.task_run.create(db, obj_in=task_run_in, current_user=current_user)
+    crud.flow_run.increment_version(db, ids=[task_run.flow_run])
+    db.commit()
     return task_run
 
 
 @router.get("/all", response_model=List[schemas.TaskRun])
-def read_all_task_runs(
+async def read_all_task_runs(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     current_user: Auth0User = Depends(auth.get_user),
@@ -35,22 +42,56 @@ def read_all_task_runs(
     Retrieve all task runs.
     """
     
-    response = crud.task_run.get_multi(db=db, skip=skip, limit=limit)
-    return response
+    task_runs = await crud.async_task_run.get_multi(db=db, skip=skip, limit=limit)
+    return [schemas.TaskRun.from_orm(task_run) for task_run in task_runs]
+
 
+@router.get("/page", response_model=schemas.Page[schemas.TaskRun])
+async def read_task_runs_page(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    flow_run_id: Optional[UUID] = None,
+    status: Optional[TaskStatus] = None,
+    triggered_by: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Auth0User = Depends(auth.get_user),
+) -> Any:
+    """
+    Retrieve a page of task runs, most recently started first. Pass `next_cursor` of a page as `cursor` to get the
+    next.
+    """
+    try:
+        task_runs, next_cursor = await crud.async_task_run.get_page(
+            db,
+            cursor=cursor,
+            limit=limit,
+            flow_run_id=flow_run_id,
+            status=status,
+            triggered_by=triggered_by,
+            since=since,
+            until=until,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return schemas.Page[schemas.TaskRun](
+        items=[schemas.TaskRun.from_orm(task_run) for task_run in task_runs], next_cursor=next_cursor
+    )
 
 @router.get("/", response_model=schemas.TaskRun)
-def read_task_run(
+async def read_task_run(
     *,
-    db: Session = Depends(deps.get_db),
-    id: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    id: UUID,
     current_user: Auth0User = Depends(auth.get_user),
 ) -> Any:
     """
     Get task run by id.
     """
     
-    return crud.task_run.get(db, id)
+    return await crud.async_task_run.get(db, id)
 
 @router.delete("/", response_model=schemas.TaskRun)
 def remove_task_run(
@@ -63,4 +104,12 @@ def remove_task_run(
     Delete task run by id.
     """
     
-    return crud.task_run.remove(db=db, id=id)
\ No newline at end of file
+    task_run = crud.task_run.get(db, id)
+    if not task_run:
+        raise HTTPException(status_code=404, detail="Task run not found.")
+    flow_run_id = task_run.flow_run
+
+    task_run = crud.task_run.remove(db=db, id=id)
+    crud.flow_run.increment_version(db, ids=[flow_run_id])
+    db.commit()
+    return task_run
\ No newline at end of file
@@ -1,5 +1,5 @@
-from typing import Generator
-from app.db.session import SessionLocal
+from typing import AsyncGenerator, Generator
+from app.db.session import AsyncSessionLocal, SessionLocal
 
 
 def get_db() -> Generator:
@@ -7,4 +7,9 @@ def get_db() -> Generator:
         db = SessionLocal()
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
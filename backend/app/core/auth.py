@@ -1,16 +1,23 @@
+import hashlib
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, Header, Request, status
 from fastapi.openapi.models import OAuthFlows, OAuthFlowImplicit
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import (HTTPAuthorizationCredentials, HTTPBearer,
                               OAuth2, OAuth2AuthorizationCodeBearer,
                               OAuth2PasswordBearer, OpenIdConnect, SecurityScopes)
 from pydantic import BaseModel, Field, ValidationError
 from typing_extensions import TypedDict
 import urllib.parse
+import urllib.request
 from jose import jwt
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 from app.core.config import settings
+from app.core.services import services
 
 logger = logging.getLogger('auth_logging')
 
@@ -82,8 +89,17 @@ class Auth0:
         self.auth0_user_model = auth0user_model
 
         self.algorithms = ['RS256']
-        r = urllib.request.urlopen(f'https://{domain}/.well-known/jwks.json')
-        self.jwks: JwksDict = json.loads(r.read())
+        # Signing keys by their kid. Fetched on first use or on warm-up, so importing the app does not depend on Auth0
+        # being reachable, and refreshed when they get old or when a token is signed with a key that is not among them
+        self._signing_keys: Dict[str, JwksKeyDict] = {}
+        self._jwks_fetched_at: Optional[float] = None
+        self._jwks_attempted_at = float('-inf')
+        self._jwks_refreshing = False
+        self._jwks_lock = threading.Lock()
+        # Claims of verified tokens by the SHA-256 of the token, with the time the token expires; least recently
+        # used first
+        self._verified_tokens: OrderedDict[str, Tuple[float, Dict]] = OrderedDict()
+        self._verified_tokens_lock = threading.Lock()
 
         authorization_url_qs = urllib.parse.urlencode({'audience': api_audience})
         authorization_url = f'https://{domain}/authorize?{authorization_url_qs}'
@@ -98,6 +114,79 @@ class Auth0:
             scopes=scopes)
         self.oidc_scheme = OpenIdConnect(openIdConnectUrl=f'https://{domain}/.well-known/openid-configuration')
         
+    def load_jwks(self) -> None:
+        """
+        Fetches the public keys the tokens are signed with, unless they were fetched already.
+        """
+        if self._jwks_fetched_at is None:
+            self.refresh_jwks(fetched_at=None)
+
+    def refresh_jwks(self, fetched_at: Optional[float]) -> None:
+        """
+        Fetches the public keys the tokens are signed with, unless they were refreshed since `fetched_at` (the time the
+        keys the caller found lacking were fetched), so concurrent callers wait for one request instead of making one
+        each.
+        """
+        with self._jwks_lock:
+            if self._jwks_fetched_at != fetched_at:
+                return
+            self._jwks_attempted_at = time.monotonic()
+            with urllib.request.urlopen(
+                f'https://{self.domain}/.well-known/jwks.json', timeout=settings.AUTH0_JWKS_TIMEOUT_SECONDS
+            ) as r:
+                jwks: JwksDict = json.loads(r.read())
+            self._signing_keys = {
+                key['kid']: {'kty': key['kty'], 'kid': key['kid'], 'use': key['use'], 'n': key['n'], 'e': key['e']}
+                for key in jwks['keys']
+            }
+            self._jwks_fetched_at = time.monotonic()
+            logger.info(f'Fetched {len(self._signing_keys)} signing keys of {self.domain}')
+
+    async def _get_signing_key(self, kid: str) -> Optional[JwksKeyDict]:
+        fetched_at = self._jwks_fetched_at
+        key = self._signing_keys.get(kid)
+        if key is None:
+            # Keys may have been rotated; refetching is rate limited, as anyone can send a token with an unknown kid
+            if fetched_at is None or (
+                time.monotonic() - self._jwks_attempted_at >= settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS
+            ):
+                await run_in_threadpool(self.refresh_jwks, fetched_at)
+                key = self._signing_keys.get(kid)
+        elif time.monotonic() - fetched_at >= settings.AUTH0_JWKS_MAX_AGE_SECONDS and not self._jwks_refreshing:
+            # The keys still verify tokens meanwhile; only ever one refresh in the background
+            self._jwks_refreshing = True
+            threading.Thread(target=self._refresh_jwks_in_background, args=(fetched_at,), daemon=True).start()
+        return key
+
+    def _refresh_jwks_in_background(self, fetched_at: float) -> None:
+        try:
+            self.refresh_jwks(fetched_at)
+        except Exception as e:
+            logger.warning(f'Refreshing the signing keys failed: {e}')
+        finally:
+            self._jwks_refreshing = False
+
+    def _get_verified_claims(self, token_hash: str) -> Optional[Dict]:
+        with self._verified_tokens_lock:
+            entry = self._verified_tokens.get(token_hash)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._verified_tokens[token_hash]
+                return None
+            self._verified_tokens.move_to_end(token_hash)
+            return entry[1]
+
+    def _put_verified_claims(self, token_hash: str, payload: Dict) -> None:
+        expires_at = payload.get('exp')
+        if not isinstance(expires_at, (int, float)):
+            return
+        with self._verified_tokens_lock:
+            self._verified_tokens[token_hash] = (expires_at, payload)
+            self._verified_tokens.move_to_end(token_hash)
+            while len(self._verified_tokens) > settings.AUTH0_TOKEN_CACHE_MAX_SIZE:
+                self._verified_tokens.popitem(last=False)
+
     async def validate_api_key(self, api_key: str) -> Optional[Auth0User]:
         # Implement your API key validation logic here
         # This is a placeholder implementation
@@ -158,6 +247,48 @@ class Auth0:
                 return None
 
         token = creds.credentials
+        token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        payload = self._get_verified_claims(token_hash)
+        if payload is None:
+            payload = await self._decode_token(token)
+            if payload is None:
+                return None
+            self._put_verified_claims(token_hash, payload)
+
+        if self.scope_auto_error:
+            token_scope_str: str = payload.get('scope', '')
+
+            if isinstance(token_scope_str, str):
+                token_scopes = token_scope_str.split()
+
+                for scope in security_scopes.scopes:
+                    if scope not in token_scopes:
+                        raise Auth0UnauthorizedException(detail=f'Missing "{scope}" scope',
+                            headers={'WWW-Authenticate': f'Bearer scope="{security_scopes.scope_str}"'})
+            else:
+                # This is an unlikely case but handle it just to be safe (perhaps auth0 will change the scope format)
+                raise Auth0UnauthorizedException(detail='Token "scope" field must be a string')
+
+        try:
+            user = self.auth0_user_model(**payload)
+
+            if self.email_auto_error and not user.email:
+                raise Auth0UnauthorizedException(detail=f'Missing email claim (check auth0 rule "Add email to access token")')
+
+            return user
+
+        except ValidationError as e:
+            logger.error(f'Handled exception parsing Auth0User: "{e}"', exc_info=True)
+            if self.auto_error:
+                raise Auth0UnauthorizedException(detail='Error parsing Auth0User')
+            else:
+                return None
+
+    async def _decode_token(self, token: str) -> Optional[Dict]:
+        """
+        Verifies the token and returns its claims.
+        If there is any problem and auto_error = True then raise Auth0UnauthenticatedException, otherwise return None.
+        """
         payload: Dict = {}
         try:
             unverified_header = jwt.get_unverified_header(token)
@@ -169,17 +300,7 @@ class Auth0:
                     logger.warning(msg)
                     return None
                 
-            rsa_key = {}
-            for key in self.jwks['keys']:
-                if key['kid'] == unverified_header['kid']:
-                    rsa_key = {
-                        'kty': key['kty'],
-                        'kid': key['kid'],
-                        'use': key['use'],
-                        'n': key['n'],
-                        'e': key['e']
-                    }
-                    break
+            rsa_key = await self._get_signing_key(unverified_header['kid'])
             if rsa_key:
                 payload = jwt.decode(
                     token,
@@ -231,35 +352,9 @@ class Auth0:
             else:
                 return None
 
-        if self.scope_auto_error:
-            token_scope_str: str = payload.get('scope', '')
-
-            if isinstance(token_scope_str, str):
-                token_scopes = token_scope_str.split()
-
-                for scope in security_scopes.scopes:
-                    if scope not in token_scopes:
-                        raise Auth0UnauthorizedException(detail=f'Missing "{scope}" scope',
-                            headers={'WWW-Authenticate': f'Bearer scope="{security_scopes.scope_str}"'})
-            else:
-                # This is an unlikely case but handle it just to be safe (perhaps auth0 will change the scope format)
-                raise Auth0UnauthorizedException(detail='Token "scope" field must be a string')
-
-        try:
-            user = self.auth0_user_model(**payload)
-
-            if self.email_auto_error and not user.email:
-                raise Auth0UnauthorizedException(detail=f'Missing email claim (check auth0 rule "Add email to access token")')
-
-            return user
-
-        except ValidationError as e:
-            logger.error(f'Handled exception parsing Auth0User: "{e}"', exc_info=True)
-            if self.auto_error:
-                raise Auth0UnauthorizedException(detail='Error parsing Auth0User')
-            else:
-                return None
+        return payload
             
             
 auth = Auth0(domain=settings.AUTH0_DOMAIN, api_audience=settings.AUTH0_API_IDENTIFIER)
+services.add_warm_up("auth_jwks", auth.load_jwks)
 
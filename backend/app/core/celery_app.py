@@ -0,0 +1,14 @@
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery("worker", broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
+
+celery_app.conf.update(
+    # Flow runs are only acknowledged once they have finished, so a run is redelivered to another
+    # worker when the worker executing it dies. Claiming the run in the database keeps this idempotent.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+)
@@ -39,10 +39,38 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
+    # Connections the API processes may open together, and the number of API processes (uvicorn reads the same
+    # variable for --workers). Each process gets DB_MAX_CONNECTIONS // WEB_CONCURRENCY connections: two publish and
+    # listen for flow run events and the rest are split evenly between the sync and the async engine, so by default
+    # 12 * (2 + 2 * 6) = 168. Keep the budget below max_connections of the server, leaving room for the Celery
+    # workers (2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) + 1 per worker process), migrations and administration.
+    DB_MAX_CONNECTIONS: int = 180
+    WEB_CONCURRENCY: int = 12
+    # Connection pool of each engine: size + overflow bounds its connections; waiting for one fails after the timeout.
+    # The size is derived from the budget above unless set.
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: int = 0
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Connections are replaced after this long, before the server or a proxy closes them as idle
+    DB_POOL_RECYCLE_SECONDS: int = 30 * 60
+    # Tests every connection on checkout (one round trip); disable to rely on recycling and reconnect on error instead
+    DB_POOL_PRE_PING: bool = True
+
     AUTH0_DOMAIN: str
     AUTH0_CLIENT_ID: str
     AUTH0_API_IDENTIFIER: str
     AUTH0_RULE_NAMESPACE: str
+    AUTH0_JWKS_TIMEOUT_SECONDS: float = 5.0
+    # The signing keys are refreshed in the background once they are this old, and at most this often when a token is
+    # signed with an unknown key (e.g. right after Auth0 rotated its keys)
+    AUTH0_JWKS_MAX_AGE_SECONDS: float = 60 * 60
+    AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS: float = 30.0
+    # Verified tokens whose claims are reused until they expire, so a token is only verified once per process
+    AUTH0_TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Users looked up by the email of the token on every request are cached per process for this long
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
 
     AZURE_TENANT_ID: str
     AZURE_KEYVAULT_NAME: str
@@ -53,7 +81,101 @@ class Settings(BaseSettings):
 
     OPENAI_API_KEY: str
 
-    PINECONE_API_KEY: str
+    # Vector index of the task definition embeddings: "local" (in the process, persisted to TASK_DEFINITION_INDEX_PATH
+    # and memory-mapped) or "pinecone", which needs the optional pinecone-client package
+    TASK_DEFINITION_INDEX_BACKEND: str = "local"
+    TASK_DEFINITION_INDEX_PATH: str = "/tmp/neena/task_definition_index"
+    PINECONE_API_KEY: Optional[str] = None
+    PINECONE_INDEX_NAME: str = "task-definitions-te3-small-quickstart"
+    # Task definitions embedded per request (and upserted per call) when syncing the index with the catalog
+    TASK_DEFINITION_EMBEDDING_BATCH_SIZE: int = 100
+
+    # Maximum number of task operations of a single flow run that are executed at the same time
+    FLOW_RUN_MAX_CONCURRENCY: int = 4
+    # Either "in_process" to run flow runs in the API process, or "celery" to enqueue them for Celery workers, which
+    # needs a worker started separately (celery -A app.worker worker) and a CELERY_BROKER_URL both processes can reach
+    FLOW_RUN_EXECUTOR: str = "in_process"
+    # A worker refreshes the claim on the flow run it executes at this interval; a claim that was not refreshed for
+    # the timeout (the worker stopped) may be claimed by another worker, which resumes the flow run
+    FLOW_RUN_CLAIM_HEARTBEAT_SECONDS: float = 60.0
+    FLOW_RUN_CLAIM_TIMEOUT_SECONDS: int = 5 * 60
+
+    # Broker of the flow run events streamed to clients, as the dotted path of an EventBroker class. The default
+    # broker goes through Postgres LISTEN/NOTIFY, so it reaches clients connected to any uvicorn worker whichever
+    # process executes the flow run. "app.flow_execution.events.InProcessEventBroker" saves the round trip through
+    # the database, but only works with a single uvicorn worker and FLOW_RUN_EXECUTOR "in_process".
+    FLOW_RUN_EVENT_BROKER: str = "app.flow_execution.events.PostgresEventBroker"
+    # Events buffered per subscriber; a subscriber that falls further behind is disconnected
+    FLOW_RUN_EVENT_QUEUE_SIZE: int = 1000
+    # Interval of the keep-alive comments on an idle event stream, so proxies do not close it
+    FLOW_RUN_EVENT_HEARTBEAT_SECONDS: float = 15.0
+
+    # HTTP clients of the integrations; HTTP/2 requires the h2 package (httpx[http2])
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_READ_TIMEOUT_SECONDS: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP2_ENABLED: bool = False
+
+    # Integration instances (credentials and HTTP clients) are reused across flow runs for this long
+    INTEGRATION_POOL_TTL_SECONDS: int = 15 * 60
+
+    # Calls per second and burst size per credential, per process; Trello allows 100 calls per 10 seconds per token
+    TRELLO_RATE_LIMIT_PER_SECOND: float = 10.0
+    TRELLO_RATE_LIMIT_BURST: int = 100
+    SLACK_RATE_LIMIT_PER_SECOND: float = 1.0
+    SLACK_RATE_LIMIT_BURST: int = 5
+    # Calls that would wait longer than this for their rate limit budget fail with RateLimitedError instead
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 60.0
+
+    # Upper bound of the exponential backoff between attempts of a task, and the time after which it is not retried
+    TASK_RETRY_MAX_DELAY_SECONDS: float = 30.0
+    TASK_RETRY_DEADLINE_SECONDS: float = 5 * 60
+
+    # Task preparation answers are reused for identical prompts of completed task runs
+    TASK_PREP_CACHE_ENABLED: bool = True
+    TASK_PREP_CACHE_MAX_SIZE: int = 1024
+    TASK_PREP_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
+    # Estimated token budget of a task preparation prompt, and the number of list items kept per output
+    TASK_PREP_PROMPT_TOKEN_BUDGET: int = 6000
+    TASK_PREP_PROMPT_MAX_LIST_ITEMS: int = 50
+
+    # Generated flows are reused for requests that are the same once normalized, or whose embeddings have at least
+    # this cosine similarity; entries are dropped when the task definition catalog changes
+    FLOW_GENERATION_CACHE_ENABLED: bool = True
+    FLOW_GENERATION_CACHE_PATH: str = "/tmp/neena/flow_generation_cache"
+    FLOW_GENERATION_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    FLOW_GENERATION_CACHE_MAX_SIZE: int = 5000
+
+    # Services are built and the catalog is synced in the background once the server accepts traffic; disable to
+    # do it before the server starts (e.g. in tests)
+    WARM_UP_IN_BACKGROUND: bool = True
+
+    CELERY_BROKER_URL: str = "memory://"
+    CELERY_RESULT_BACKEND: Optional[str] = None
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+
+    @validator("DB_POOL_SIZE", always=True)
+    def assemble_db_pool_size(cls, v: Optional[int], values: Dict[str, Any]) -> int:
+        if v is not None:
+            return v
+        connections_per_process = values["DB_MAX_CONNECTIONS"] // values["WEB_CONCURRENCY"]
+        if connections_per_process < 4:
+            raise ValueError(
+                f"DB_MAX_CONNECTIONS {values['DB_MAX_CONNECTIONS']} leaves fewer than 4 connections to each of the "
+                f"{values['WEB_CONCURRENCY']} processes"
+            )
+        return (connections_per_process - 2) // 2
+
+    @validator("CELERY_TASK_ALWAYS_EAGER")
+    def check_celery_broker(cls, v: bool, values: Dict[str, Any]) -> bool:
+        # The in-memory broker is private to the process, so no worker would ever receive the flow runs
+        broker_url = values.get("CELERY_BROKER_URL") or ""
+        if values.get("FLOW_RUN_EXECUTOR") == "celery" and broker_url.startswith("memory://") and not v:
+            raise ValueError('FLOW_RUN_EXECUTOR "celery" needs a CELERY_BROKER_URL that workers can reach')
+        return v
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
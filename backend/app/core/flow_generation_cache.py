@@ -0,0 +1,173 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, ContextManager, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.services import services
+from app.core.task_definition_retriever import OpenAIEmbeddingService, openai_embedder
+from app.core.vector_index import LocalVectorIndex
+from app.crud.crud_task_definition import task_definition
+from app.db.session import session_scope
+from app.schemas import FlowBase
+
+# Embeddings of the requests looked up most recently are kept, so storing the flow of a miss does not embed it again
+RECENT_EMBEDDINGS_SIZE = 128
+
+
+class FlowGenerationCache:
+    """
+    Semantic cache of generated flows, keyed on the normalized request text.
+
+    A request that normalizes to one seen before is answered without any call to OpenAI. Otherwise the request is
+    embedded, and answered with the flow of the most similar cached request if their cosine similarity is at least
+    `similarity_threshold`: the higher the threshold, the closer a request must be to reuse a flow.
+
+    Flows are stored as skeletons (the task operations and their dependencies) in a LocalVectorIndex, so processes
+    sharing its path share the cache and it survives restarts. The task operations refer to task definitions by id,
+    so every entry is tied to the version of the task definition catalog it was generated with, and entries of
+    another version are dropped once the catalog changed. Beyond `max_size` entries, the oldest are evicted.
+    """
+
+    def __init__(
+        self,
+        index: LocalVectorIndex,
+        embedder: OpenAIEmbeddingService,
+        similarity_threshold: float,
+        max_size: int,
+        enabled: bool = True,
+        session_factory: Callable[[], ContextManager[Session]] = session_scope,
+    ) -> None:
+        self.index = index
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.max_size = max_size
+        self.enabled = enabled
+        self.session_factory = session_factory
+        self._catalog_version: Optional[str] = None
+        self._embeddings: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(request: str) -> str:
+        """
+        Returns the request in lower case, with runs of whitespace collapsed and without trailing punctuation.
+        """
+        return " ".join(request.lower().split()).rstrip(".!?")
+
+    @staticmethod
+    def key(normalized_request: str) -> str:
+        return hashlib.sha256(normalized_request.encode("utf-8")).hexdigest()
+
+    def get(self, request: str) -> Optional[FlowBase]:
+        """
+        Returns the cached flow for the request or for the most similar request above the threshold, or None on a
+        miss. Failures of the cache are logged and count as a miss.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            catalog_version = self._get_catalog_version()
+            normalized_request = self.normalize(request)
+            key = self.key(normalized_request)
+
+            metadata = self.index.fetch_metadata([key]).get(key)
+            if metadata and metadata["catalog_version"] == catalog_version:
+                with self._lock:
+                    self.exact_hits += 1
+                return FlowBase.model_validate_json(metadata["flow"])
+
+            for match in self.index.query(self._embed(normalized_request), top_k=5):
+                if match["score"] < self.similarity_threshold:
+                    break
+                if match["metadata"]["catalog_version"] == catalog_version:
+                    logger.info(f"Reusing the flow of \"{match['metadata']['request']}\" ({match['score']:.3f})")
+                    with self._lock:
+                        self.similar_hits += 1
+                    return FlowBase.model_validate_json(match["metadata"]["flow"])
+        except Exception as e:
+            logger.warning(f"Looking up a generated flow failed: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, request: str, flow: FlowBase) -> None:
+        """
+        Stores the flow generated for the request. Failures are logged, as the flow is still usable.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            catalog_version = self._get_catalog_version()
+            normalized_request = self.normalize(request)
+            self.index.upsert(
+                [
+                    {
+                        "id": self.key(normalized_request),
+                        "values": self._embed(normalized_request),
+                        "metadata": {
+                            "request": normalized_request,
+                            "catalog_version": catalog_version,
+                            "flow": flow.model_dump_json(),
+                        },
+                    }
+                ]
+            )
+            ids = self.index.ids()
+            if len(ids) > self.max_size:
+                self.index.delete(ids[: len(ids) - self.max_size])
+        except Exception as e:
+            logger.warning(f"Storing a generated flow failed: {e}")
+
+    def _get_catalog_version(self) -> str:
+        """
+        Returns the current version of the task definition catalog, dropping the entries of other versions when it
+        changed since the last lookup.
+        """
+        with self.session_factory() as db:
+            catalog_version = task_definition.get_catalog_version(db)
+
+        if catalog_version != self._catalog_version:
+            stale_ids = [
+                id
+                for id, metadata in self.index.fetch_metadata(self.index.ids()).items()
+                if metadata.get("catalog_version") != catalog_version
+            ]
+            if stale_ids:
+                self.index.delete(stale_ids)
+                logger.info(f"Task definition catalog changed; dropped {len(stale_ids)} cached flows")
+            self._catalog_version = catalog_version
+        return catalog_version
+
+    def _embed(self, normalized_request: str) -> List[float]:
+        with self._lock:
+            embedding = self._embeddings.get(normalized_request)
+        if embedding is None:
+            embedding = self.embedder.get_embedding(normalized_request)
+            with self._lock:
+                self._embeddings[normalized_request] = embedding
+                while len(self._embeddings) > RECENT_EMBEDDINGS_SIZE:
+                    self._embeddings.popitem(last=False)
+        return embedding
+
+
+flow_generation_cache = services.register(
+    "flow_generation_cache",
+    lambda: FlowGenerationCache(
+        index=LocalVectorIndex(settings.FLOW_GENERATION_CACHE_PATH),
+        embedder=openai_embedder,
+        similarity_threshold=settings.FLOW_GENERATION_CACHE_SIMILARITY_THRESHOLD,
+        max_size=settings.FLOW_GENERATION_CACHE_MAX_SIZE,
+        enabled=settings.FLOW_GENERATION_CACHE_ENABLED,
+    ),
+)
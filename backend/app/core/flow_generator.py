@@ -1,3 +1,5 @@
+from typing import Callable, ContextManager, Optional
+
 import openai
 import instructor
 
@@ -6,7 +8,9 @@ from sqlalchemy.orm import Session
 from app.core.task_definition_retriever import task_definition_retrieval_manager, TaskDefinitionRetrievalManager
 from app.core.logging import logger
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.flow_generation_cache import FlowGenerationCache, flow_generation_cache
+from app.core.services import services
+from app.db.session import session_scope
 from app.crud.crud_task_definition import task_definition
 from app.schemas import (
     FlowBase,
@@ -122,21 +126,24 @@ class FlowGenerator:
         task_getter_client: TaskGetterPatchedOpenAIClient,
         patched_openai_client: PatchedOpenAIClient,
         task_definiton_retriever: TaskDefinitionRetrievalManager,
-        database_session: Session,
         model: str = "gpt-4",
         fake_rag: bool = True,
+        session_factory: Callable[[], ContextManager[Session]] = session_scope,
+        flow_cache: Optional[FlowGenerationCache] = None,
     ) -> None:
         self.model = model
         self.fake_rag = fake_rag
         self.task_getter_client = task_getter_client
         self.patched_openai_client = patched_openai_client
         self.task_definition_retriever = task_definition_retrieval_manager
-        self.database_session = database_session
+        self.session_factory = session_factory
+        self.flow_cache = flow_cache
 
     def generate_flow_from_request(self, request: str) -> FlowBase:
         """
         Main entry point of class.
         Generates and returns formatted flow for execution layer based on user requests.
+        Flows generated for the same or a similar request are reused from the flow cache, if any.
 
         Args:
             request (str): Natural language request from user describing flow to be generatored.
@@ -144,6 +151,11 @@ class FlowGenerator:
         Returns:
             flow (FlowBase): Flow DAG-form with task operations (nodes) and dependencies (edges, vertices).
         """
+        if self.flow_cache:
+            cached_flow = self.flow_cache.get(request)
+            if cached_flow:
+                return cached_flow
+
         request_task_definitions = (
             self._get_task_definitions_from_database(request)
             if self.fake_rag
@@ -152,7 +164,10 @@ class FlowGenerator:
         requested_task_operations = self._convert_task_definitions_to_task_operations(request_task_definitions)
         dependencies = self._generate_dependencies(request, requested_task_operations)
 
-        return self._construct_flow(requested_task_operations, dependencies)
+        flow = self._construct_flow(requested_task_operations, dependencies)
+        if self.flow_cache:
+            self.flow_cache.put(request, flow)
+        return flow
 
     def _retrieve_task_definitions_from_database(self, request: str) -> list[TaskDefinition]:
         return self.task_definition_retriever.retrieve_similar_task_definitions(request)
@@ -209,7 +224,11 @@ class FlowGenerator:
             {"role": "user", "content": f"{request}"},
         ]
         requested_task_definitions_names = self.task_getter_client.create_chat_completion(self.model, messages)
-        return task_definition.get_by_names(self.database_session, requested_task_definitions_names.task_definitions)
+        with self.session_factory() as db:
+            return [
+                TaskDefinition.model_validate(d, from_attributes=True)
+                for d in task_definition.get_by_names(db, requested_task_definitions_names.task_definitions)
+            ]
 
     def _convert_task_definitions_to_task_operations(
         self, task_definitions: list[TaskOperationBase]
@@ -314,12 +333,13 @@ class FlowGenerator:
         return flow
 
 
-_database_session = SessionLocal()  # TODO: is this best practice wrt data privacy?
-patched_openai_client = PatchedOpenAIClient(settings.OPENAI_API_KEY)
-task_getter_client = TaskGetterPatchedOpenAIClient(settings.OPENAI_API_KEY)
-flow_generator = FlowGenerator(
-    task_getter_client=task_getter_client,
-    patched_openai_client=patched_openai_client,
-    task_definiton_retriever=task_definition_retrieval_manager,
-    database_session=_database_session,
-)
+def _create_flow_generator() -> FlowGenerator:
+    return FlowGenerator(
+        task_getter_client=TaskGetterPatchedOpenAIClient(settings.OPENAI_API_KEY),
+        patched_openai_client=PatchedOpenAIClient(settings.OPENAI_API_KEY),
+        task_definiton_retriever=task_definition_retrieval_manager,
+        flow_cache=flow_generation_cache,
+    )
+
+
+flow_generator = services.register("flow_generator", _create_flow_generator)
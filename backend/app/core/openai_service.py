@@ -1,6 +1,7 @@
 import openai
 
 from app.core.config import settings
+from app.core.services import services
 from typing import Any, List
 from openai.types.chat.chat_completion import ChatCompletion
 
@@ -41,4 +42,4 @@ class OpenAIService:
         return chat_completion.choices[0].message.content
 
 
-openai_service = OpenAIService()
+openai_service = services.register("openai_service", OpenAIService)
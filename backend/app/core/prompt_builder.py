@@ -0,0 +1,206 @@
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.shared_models import TaskStatus
+from app.flow_execution.scheduler import DAGScheduler
+from app.schemas.flow import Flow
+from app.schemas.flow_run import FlowRun
+from app.schemas.task_definition import TaskDefinition
+from app.schemas.task_operation import TaskOperationBase
+
+SYSTEM_MESSAGE = """
+You are part of an application that enables its users to automate tasks in a flow of task operations.
+Each task operation calls a task definition, which is a method of an integration such as Trello or Slack.
+
+You will receive the user's request, the task operation that is about to be executed with the parameters of its
+task definition, and the outputs of the task operations it depends on. Outputs are reduced to the fields that are
+relevant for the parameters, and long lists may be truncated.
+
+Fill in the parameters of the task definition, usually by taking a value such as an id from an earlier output or by
+applying some logic based on the request. Do not fill in optional parameters unless you have a good reason to do so.
+
+Answer with a list of parameters, each with depth 0:
+[
+    {
+        "name": <name of the parameter of the task definition>,
+        "value": <the value for this parameter>,
+        "explanation": <optional, why this value was chosen, including any arithmetic or string operation applied>
+    },
+    ...
+]
+The list may be empty if the task definition has no mandatory parameters.
+""".strip()
+
+# Fields that identify an object and are kept in every projected output
+IDENTIFYING_FIELDS = {"id", "name"}
+
+
+class TaskPrepPromptBuilder:
+    """
+    Builds the messages of a task preparation prompt, keeping them small.
+
+    Instead of the full flow, the prompt only contains the upstream task operations of the current task operation
+    (its ancestors in the DAG), and their results are projected down to the fields the parameters of the task
+    definition may need. Outputs of the direct upstream task operations are added first; if the prompt exceeds
+    the token budget, the remaining outputs are truncated or left out.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = settings.TASK_PREP_PROMPT_TOKEN_BUDGET,
+        max_list_items: int = settings.TASK_PREP_PROMPT_MAX_LIST_ITEMS,
+    ) -> None:
+        self.token_budget = token_budget
+        self.max_list_items = max_list_items
+
+    def build(
+        self,
+        flow: Flow,
+        flow_run: FlowRun,
+        task_operation_index: int,
+        task_definition: TaskDefinition,
+        request_instructions: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Returns the messages of the prompt and their estimated number of tokens.
+        """
+        scheduler = DAGScheduler(flow)
+        task_operation = scheduler.task_operations[task_operation_index]
+        ancestors = scheduler.ancestors(task_operation_index)
+
+        sections = []
+        if request_instructions:
+            sections.append(f"Request: {request_instructions}")
+        sections.append(f"Task operation: {self._format_task_operation(task_operation)}")
+        sections.append(f"Task definition: {self._format_task_definition(task_definition)}")
+
+        dependencies = [
+            dependency.model_dump()
+            for dependency in flow.dependencies
+            if dependency.target_task_operation in ancestors | {task_operation_index}
+        ]
+        if dependencies:
+            sections.append(f"Dependencies: {self._dumps(dependencies)}")
+
+        messages = [{"role": "system", "content": SYSTEM_MESSAGE}, {"role": "user", "content": ""}]
+        remaining = self.token_budget - self.count_tokens(messages) - self.estimate_tokens("\n\n".join(sections))
+
+        outputs, omitted = self._format_outputs(scheduler, flow_run, task_operation_index, task_definition, remaining)
+        sections.append("Previous outputs:\n" + ("\n".join(outputs) if outputs else "None"))
+        if omitted:
+            sections.append(f"Outputs of {omitted} other upstream task operation(s) were left out to fit the prompt.")
+
+        messages[1]["content"] = "\n\n".join(sections)
+        return messages, self.count_tokens(messages)
+
+    def count_tokens(self, messages: List[Dict[str, str]]) -> int:
+        return sum(self.estimate_tokens(message["content"]) + 4 for message in messages)
+
+    def estimate_tokens(self, text: str) -> int:
+        """
+        Estimates the number of tokens of a text at roughly four characters per token, which is close enough
+        for budgeting English text and JSON without loading a tokenizer.
+        """
+        return (len(text) + 3) // 4
+
+    def _format_outputs(
+        self,
+        scheduler: DAGScheduler,
+        flow_run: FlowRun,
+        task_operation_index: int,
+        task_definition: TaskDefinition,
+        token_budget: int,
+    ) -> Tuple[List[str], int]:
+        """
+        Formats the projected outputs of the completed ancestors, direct upstream task operations first,
+        truncating the output that crosses the token budget and leaving out the ones after it.
+        """
+        parents = scheduler.upstream[task_operation_index]
+        ancestors = scheduler.ancestors(task_operation_index)
+        results = {
+            task_run.task_operation_index: task_run.result
+            for task_run in flow_run.task_runs
+            if task_run.status == TaskStatus.COMPLETED and task_run.task_operation_index in ancestors
+        }
+        fields = {self._normalize(param.name) for param in task_definition.parameters} | IDENTIFYING_FIELDS
+
+        outputs, omitted = [], 0
+        for index in sorted(results, key=lambda index: (index not in parents, index)):
+            task_op = scheduler.task_operations[index]
+            output = (
+                f"Task operation {index} ({task_op.name}): {self._dumps(self._project(results[index], fields))}"
+            )
+
+            tokens = self.estimate_tokens(output)
+            if tokens <= token_budget:
+                outputs.append(output)
+                token_budget -= tokens
+            elif token_budget > 50:
+                outputs.append(output[: token_budget * 4] + " ...(truncated)")
+                token_budget = 0
+            else:
+                omitted += 1
+
+        return outputs, omitted
+
+    def _project(self, data: Any, fields: Set[str], top_level: bool = True) -> Any:
+        """
+        Reduces a result to the given fields, keeping the structure of nested objects and lists that contain them.
+        Lists are capped at `max_list_items` items.
+        """
+        if isinstance(data, list):
+            projected = [self._project(item, fields, top_level) for item in data[: self.max_list_items]]
+            if not top_level:
+                projected = [item for item in projected if item]
+            if len(data) > self.max_list_items:
+                projected.append(f"... {len(data) - self.max_list_items} more items")
+            return projected
+
+        if isinstance(data, dict):
+            projected = {}
+            for key, value in data.items():
+                if self._normalize(key) in fields:
+                    projected[key] = value
+                elif isinstance(value, (dict, list)):
+                    nested = self._project(value, fields, top_level=False)
+                    if nested:
+                        projected[key] = nested
+            if projected or not top_level:
+                return projected
+            # Nothing relevant in a top-level object: keep its scalar fields, so it is not reduced to nothing
+            return {key: value for key, value in data.items() if not isinstance(value, (dict, list))}
+
+        return data
+
+    def _format_task_operation(self, task_operation: TaskOperationBase) -> str:
+        return self._dumps(
+            {"index": task_operation.index, "name": task_operation.name, "instruction": task_operation.instruction}
+        )
+
+    def _format_task_definition(self, task_definition: TaskDefinition) -> str:
+        return self._dumps(
+            {
+                "task_name": task_definition.task_name,
+                "description": task_definition.description,
+                "parameters": [
+                    {
+                        "name": param.name,
+                        "data_type": param.data_type,
+                        "optional": param.optional,
+                        "doc_string": param.doc_string,
+                    }
+                    for param in task_definition.parameters
+                ],
+            }
+        )
+
+    def _normalize(self, name: str) -> str:
+        # Matches parameter names to result fields across naming styles, e.g. "id_board" and "idBoard"
+        return name.replace("_", "").lower()
+
+    def _dumps(self, data: Any) -> str:
+        return json.dumps(data, separators=(",", ":"), default=str)
+
+
+task_prep_prompt_builder = TaskPrepPromptBuilder()
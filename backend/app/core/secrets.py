@@ -1,8 +1,9 @@
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
 from app.core.config import settings
+from app.core.services import services
 
-from app.db.session import SessionLocal
+from app.db.session import session_scope
 from app import crud
 from app.schemas.user import User
 
@@ -39,7 +40,7 @@ class AzureKeyVault:
         """
         self.client.begin_delete_secret(secret_name)
 
-key_vault = AzureKeyVault()
+key_vault = services.register("key_vault", AzureKeyVault)
 
 
 class IntegrationSecretsService:
@@ -48,7 +49,6 @@ class IntegrationSecretsService:
     """
     def __init__(self):
         self.key_vault = key_vault
-        self.db = SessionLocal()
         
     def get_secret(self, user: User, integration_short_name: str) -> str:
         """
@@ -60,9 +60,13 @@ class IntegrationSecretsService:
         :return: The value of the secret.
         """
         
-        integration_credential = crud.integration_credential.get_by_integration_short_name_and_user_email(self.db, integration_short_name, user.email)
-        
-        return key_vault.get_secret(integration_credential.id)
+        with session_scope() as db:
+            integration_credential = crud.integration_credential.get_by_integration_short_name_and_user_email(
+                db, integration_short_name, user.email
+            )
+            integration_credential_id = integration_credential.id
+
+        return key_vault.get_secret(integration_credential_id)
 
 
 secrets_service = IntegrationSecretsService()
\ No newline at end of file
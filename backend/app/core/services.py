@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, cast
+
+from app.core.logging import logger
+
+T = TypeVar("T")
+
+
+class LazyService(Generic[T]):
+    """
+    Stands in for a module-level service that is built on first use instead of at import.
+
+    Attribute access is forwarded to the service, so call sites use it like the service itself. Building it is
+    thread-safe and happens once; if it fails, the next use tries again.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]) -> None:
+        self._name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    self._instance = self._factory()
+                    logger.info(f"Initialized {self._name} in {time.perf_counter() - start:.2f}s")
+                instance = self._instance
+        return instance
+
+    def is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("_name", "_factory", "_instance", "_lock"):
+            # Not set yet, e.g. while the object is copied
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        return f"<LazyService {self._name} ({'initialized' if self.is_initialized() else 'not initialized'})>"
+
+
+class ServiceRegistry:
+    """
+    The services that talk to other systems (Auth0, Azure Key Vault, OpenAI, the vector index), which must not be
+    built or contacted while the app is imported: a slow upstream would hold up or fail the start of the process.
+
+    Services are built on first use. Once the server accepts traffic, `warm_up` builds them ahead of their first
+    use and runs their warm-up hooks (e.g. fetching signing keys), in the order they were registered. Failures
+    are logged and left for the first use to retry.
+    """
+
+    def __init__(self) -> None:
+        self._services: Dict[str, LazyService] = {}
+        self._warm_up_hooks: List[Tuple[str, Callable[[], Any]]] = []
+        self.warm_up_status: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, factory: Callable[[], T], warm_up: Optional[Callable[[T], Any]] = None) -> T:
+        """
+        Registers a service that is built by `factory` on first use or on warm-up, after which `warm_up` is called
+        with it. Returns the stand-in for the service.
+        """
+        service: LazyService[T] = LazyService(name, factory)
+        self._services[name] = service
+        self.add_warm_up(name, lambda: warm_up(service.get()) if warm_up else service.get())
+        return cast(T, service)
+
+    def add_warm_up(self, name: str, hook: Callable[[], Any]) -> None:
+        """
+        Registers a warm-up hook for a service that is cheap to build, but does I/O on first use.
+        """
+        self._warm_up_hooks.append((name, hook))
+
+    def warm_up(self) -> None:
+        for name, hook in self._warm_up_hooks:
+            start = time.perf_counter()
+            try:
+                hook()
+                self.warm_up_status[name] = {"ok": True, "seconds": time.perf_counter() - start}
+            except Exception as e:
+                logger.error(f"Warming up {name} failed: {e}")
+                self.warm_up_status[name] = {"ok": False, "seconds": time.perf_counter() - start, "error": str(e)}
+
+
+services = ServiceRegistry()
@@ -1,5 +1,6 @@
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Type, TYPE_CHECKING
+from typing import Any, Dict, Optional, Type, TYPE_CHECKING
 from pydantic import BaseModel
 
 class TaskStatus(str, Enum):
@@ -45,3 +46,15 @@ class Argument(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class TaskAttempt(BaseModel):
+    """
+    A single attempt at executing a task, as recorded on its task run.
+    """
+    attempt: int
+    start_time: datetime
+    end_time: datetime
+    error: Optional[str] = None
+    retryable: Optional[bool] = None
+    backoff_seconds: Optional[float] = None
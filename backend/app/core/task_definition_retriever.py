@@ -1,27 +1,35 @@
-import time
+import hashlib
 import json
+import threading
+from datetime import datetime, timezone
 
-from typing import Any
+from typing import Any, Callable, ContextManager, Optional
 from openai import OpenAI
 from sqlalchemy.orm import Session
-from pinecone import Pinecone, PodSpec, Index
 
 from app.core.logging import logger
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.services import services
+from app.core.vector_index import LocalVectorIndex, PineconeVectorIndex, VectorIndex
+from app.db.session import session_scope
 from app.crud.crud_task_definition import task_definition
-from app.schemas import TaskDefinition
+from app.schemas import TaskDefinition, TaskDefinitionIndexSync, TaskDefinitionIndexSyncStatus
 
 
 class PineconeService:
     """
     Service class for managing Pinecone vector database operations.
 
+    Pinecone is an optional dependency (pinecone-client), only needed when TASK_DEFINITION_INDEX_BACKEND is
+    "pinecone".
+
     Attributes:
         client (Pinecone): An instance of the Pinecone client configured with the provided API key.
     """
 
     def __init__(self, api_key: str) -> None:
+        from pinecone import Pinecone
+
         self.client = Pinecone(api_key=api_key)
 
     def initialize_index(
@@ -32,7 +40,7 @@ class PineconeService:
         environment: str = "gcp-starter",
         pod_type: str = "starter",
         timeout_threshold: int = 30,
-    ) -> Index:
+    ) -> Any:
         """
         Main entry point of PineconeService class.
         Initializes a vector index in Pinecone. If the index does not exist, it is created with the specified
@@ -54,6 +62,8 @@ class PineconeService:
         Raises:
             TimeoutError: If the index is not ready within the specified timeout threshold.
         """
+        from pinecone import PodSpec
+
         if self._index_does_not_exist(index_name):
             try:
                 self.client.create_index(
@@ -96,33 +106,40 @@ class OpenAIEmbeddingService:
         response = self.client.embeddings.create(input=[text], model=model)
         return response.data[0].embedding
 
+    def get_embeddings(self, texts: list[str], model="text-embedding-3-small") -> list[list[float]]:
+        """
+        Embeds several texts with one request; the embeddings are in the order of the texts.
+        """
+        response = self.client.embeddings.create(input=[text.replace("\n", " ") for text in texts], model=model)
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+
 
 class TaskDefinitionRetrievalManager:
     """
     Manages the retrieval of task definitions from a vector database based on semantic similarity to user queries. This class
-    integrates with Pinecone for vector storage and querying, and utilizes embeddings from OpenAI for semantic understanding.
+    stores embeddings from OpenAI in a VectorIndex: by default a local index in the process, or Pinecone.
 
     Attributes:
-        database_session (Session): SQLAlchemy database session for accessing task definitions.
-        pinecone_service (PineconeService): Service class for interacting with Pinecone vector databases.
+        session_factory (Callable): Opens a database session for one unit of work, for accessing task definitions.
+        index (VectorIndex): The vector index storing the task definition embeddings.
         openai_embedder (OpenAIEmbeddingService): Service class for generating embeddings using OpenAI models.
-        index_name (str): Name of the Pinecone vector index used for storing task definition embeddings.
+        batch_size (int): Number of task definitions embedded and upserted per request when syncing the index.
+        index_sync (TaskDefinitionIndexSync): Progress of the latest sync of the index with the catalog.
     """
 
     def __init__(
         self,
-        database_session: Session,
-        pinecone_service: PineconeService,
+        index: VectorIndex,
         openai_embedder: OpenAIEmbeddingService,
-        index_name: str = "task-definitions-te3-small-quickstart",
+        session_factory: Callable[[], ContextManager[Session]] = session_scope,
+        batch_size: int = 100,
     ) -> None:
-        self.database_session = database_session
-        self.pinecone_service = pinecone_service
+        self.session_factory = session_factory
+        self.index = index
         self.openai_embedder = openai_embedder
-        self.index_name = index_name
-        self.all_task_definitions_jsons = self._get_all_task_definition_jsons()
-        self.index = self._initialize_index()
-        self._populate_vector_database()
+        self.batch_size = batch_size
+        self.index_sync = TaskDefinitionIndexSync()
+        self._sync_lock = threading.Lock()
 
     def retrieve_similar_task_definitions(
         self, request: str, top_k: int = 5, include_metadata: bool = True
@@ -140,13 +157,101 @@ class TaskDefinitionRetrievalManager:
             list[TaskDefinition]: A list of TaskDefinition instances matching the query.
         """
         query_embedding = self.openai_embedder.get_embedding(request)
-        search_results = self.index.query(vector=query_embedding, top_k=top_k, include_metadata=include_metadata)
-        retrieved_task_names = [search_result["metadata"]["task_name"] for search_result in search_results["matches"]]
-        return task_definition.get_by_names(self.database_session, retrieved_task_names)
+        matches = self.index.query(vector=query_embedding, top_k=top_k)
+        retrieved_task_names = [match["metadata"]["task_name"] for match in matches]
+        with self.session_factory() as db:
+            return [
+                TaskDefinition.model_validate(d, from_attributes=True)
+                for d in task_definition.get_by_names(db, retrieved_task_names)
+            ]
+
+    def start_index_sync(self) -> TaskDefinitionIndexSync:
+        """
+        Syncs the index with the catalog on a background thread, unless a sync is already running, and returns its
+        progress. Retrieval keeps working on the current index in the meantime.
+        """
+        with self._sync_lock:
+            if self.index_sync.status != TaskDefinitionIndexSyncStatus.RUNNING:
+                self.index_sync = self._new_index_sync()
+                threading.Thread(
+                    target=self.sync_index, args=(self.index_sync,), name="task-definition-index-sync", daemon=True
+                ).start()
+            return self.index_sync
+
+    def sync_index(self, progress: Optional[TaskDefinitionIndexSync] = None) -> TaskDefinitionIndexSync:
+        """
+        Brings the index up to date with the catalog of task definitions.
+
+        Every vector stores the hash of the serialized task definition it was embedded from, so only definitions
+        that are new or changed are embedded, `batch_size` at a time with one embedding request and one upsert per
+        batch. Vectors of soft-deleted definitions are removed. Progress is reported in `index_sync`; a failed
+        sync is logged and reported there, and picks up where it left off when run again.
+
+        Processes sharing the index sync one at a time, under the sync lock of the index: each diffs the catalog
+        against the index as the previous one left it, so a definition is only embedded once.
+        """
+        if progress is None:
+            with self._sync_lock:
+                self.index_sync = progress = self._new_index_sync()
+        try:
+            with self.index.sync_lock():
+                self._sync_index(progress)
+            progress.status = TaskDefinitionIndexSyncStatus.COMPLETED
+            logger.info(
+                f"Synced the task definition index: {progress.embedded} of {progress.total} task definitions "
+                f"embedded, {progress.deleted} deleted ones removed"
+            )
+        except Exception as e:
+            logger.error(f"Syncing the task definition index failed: {e}")
+            progress.status = TaskDefinitionIndexSyncStatus.FAILED
+            progress.error = str(e)
+        progress.finished_at = datetime.now(tz=timezone.utc)
+        return progress
+
+    def _sync_index(self, progress: TaskDefinitionIndexSync) -> None:
+        with self.session_factory() as db:
+            serialized_task_definitions = {
+                str(d.id): self._get_model_dump_json_from_task_definition(d) for d in task_definition.get_multi(db=db)
+            }
+            deleted_ids = [str(d.id) for d in task_definition.get_deleted(db)]
+
+        changed = self._changed(serialized_task_definitions)
+        progress.total = len(serialized_task_definitions)
+        progress.unchanged = progress.total - len(changed)
+        progress.to_embed = len(changed)
 
-    def _get_all_task_definition_jsons(self) -> list[str]:
-        all_task_defintions = task_definition.get_multi(db=self.database_session)
-        return [self._get_model_dump_json_from_task_definition(d) for d in all_task_defintions]
+        changed_items = list(changed.items())
+        for start in range(0, len(changed_items), self.batch_size):
+            batch = changed_items[start : start + self.batch_size]
+            # Backends without a sync lock may be synced by several processes at once; skip what another one embedded
+            still_changed = self._changed(dict(batch))
+            progress.unchanged += len(batch) - len(still_changed)
+            progress.to_embed -= len(batch) - len(still_changed)
+            if still_changed:
+                self._populate_vector_database(list(still_changed.items()))
+                progress.embedded += len(still_changed)
+                logger.info(f"Embedded {progress.embedded} of {progress.to_embed} changed task definitions")
+
+        # Only the definitions that are still in the index, rather than every definition ever deleted
+        deleted_ids = list(self.index.fetch_metadata(deleted_ids))
+        self.index.delete(deleted_ids)
+        progress.deleted = len(deleted_ids)
+
+    def _changed(self, serialized_task_definitions: dict[str, str]) -> dict[str, str]:
+        """
+        Returns the serialized task definitions that are not in the index, or were embedded from another version.
+        """
+        stored_metadata = self.index.fetch_metadata(list(serialized_task_definitions))
+        return {
+            id: serialized
+            for id, serialized in serialized_task_definitions.items()
+            if stored_metadata.get(id, {}).get("content_hash") != _content_hash(serialized)
+        }
+
+    def _new_index_sync(self) -> TaskDefinitionIndexSync:
+        return TaskDefinitionIndexSync(
+            status=TaskDefinitionIndexSyncStatus.RUNNING, started_at=datetime.now(tz=timezone.utc)
+        )
 
     def _get_model_dump_json_from_task_definition(
         self, task_definition: TaskDefinition, json_indent_level: int = 2
@@ -155,28 +260,47 @@ class TaskDefinitionRetrievalManager:
             indent=json_indent_level
         )
 
-    def _initialize_index(self) -> Index:
-        return self.pinecone_service.initialize_index(index_name=self.index_name)
-
-    def _populate_vector_database(self):
-        for serialized_task_definition in self.all_task_definitions_jsons:
-            embedding = self.openai_embedder.get_embedding(serialized_task_definition)
+    def _populate_vector_database(self, serialized_task_definitions: list[tuple[str, str]]) -> None:
+        """
+        Embeds the given (id, serialized task definition) pairs with one request and upserts them with another.
+        """
+        embeddings = self.openai_embedder.get_embeddings(
+            [serialized for _, serialized in serialized_task_definitions]
+        )
+        vectors = []
+        for (id, serialized_task_definition), embedding in zip(serialized_task_definitions, embeddings):
             task_definition_map = json.loads(serialized_task_definition)
             embedding_metadata = {
                 "task_name": task_definition_map["task_name"],
                 "description": task_definition_map["description"],
-                "serialized_task_description": serialized_task_definition,
+                "content_hash": _content_hash(serialized_task_definition),
             }
-            self.index.upsert(
-                vectors=[{"id": task_definition_map["id"], "values": embedding, "metadata": embedding_metadata}]
-            )
+            vectors.append({"id": id, "values": embedding, "metadata": embedding_metadata})
+        self.index.upsert(vectors=vectors)
+
+
+def _content_hash(serialized_task_definition: str) -> str:
+    return hashlib.sha256(serialized_task_definition.encode("utf-8")).hexdigest()
+
+
+def create_task_definition_index() -> VectorIndex:
+    """
+    Creates the vector index selected by TASK_DEFINITION_INDEX_BACKEND.
+    """
+    if settings.TASK_DEFINITION_INDEX_BACKEND == "pinecone":
+        pinecone_service = PineconeService(settings.PINECONE_API_KEY)
+        return PineconeVectorIndex(pinecone_service.initialize_index(index_name=settings.PINECONE_INDEX_NAME))
+    return LocalVectorIndex(settings.TASK_DEFINITION_INDEX_PATH)
 
 
-_database_session = SessionLocal()
-pinecone_service = PineconeService(settings.PINECONE_API_KEY)
-openai_embedder = OpenAIEmbeddingService()
-task_definition_retrieval_manager = TaskDefinitionRetrievalManager(
-    database_session=_database_session,
-    pinecone_service=pinecone_service,
-    openai_embedder=openai_embedder,
+openai_embedder = services.register("openai_embedder", OpenAIEmbeddingService)
+# Warming up syncs the index with the catalog in the background, embedding new and changed task definitions
+task_definition_retrieval_manager = services.register(
+    "task_definition_retrieval_manager",
+    lambda: TaskDefinitionRetrievalManager(
+        index=create_task_definition_index(),
+        openai_embedder=openai_embedder,
+        batch_size=settings.TASK_DEFINITION_EMBEDDING_BATCH_SIZE,
+    ),
+    warm_up=lambda manager: manager.start_index_sync(),
 )
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from app import crud
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import SessionLocal
+from app.schemas.task_prep_answer import TaskPrepAnswerBase
+
+
+class TaskPrepCache:
+    """
+    Content-addressed cache of task preparation answers, keyed on a hash of the prompt messages and the model.
+
+    Lookups go to an in-process LRU first and fall back to the answers persisted with earlier task runs,
+    so identical prompts across processes and restarts do not need another round-trip to the LLM.
+    Only answers of completed task runs are served: the LRU is filled when a task run completes and an
+    entry is invalidated when a task run with that answer fails.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, enabled: bool = True) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: OrderedDict[str, Tuple[float, TaskPrepAnswerBase]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(messages: list[dict[str, str]], model: str) -> str:
+        """
+        Returns the cache key of a prompt, which is the SHA-256 of its messages and the model that answers it.
+        """
+        payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[TaskPrepAnswerBase]:
+        """
+        Returns the cached answer for the given key, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1].model_copy(deep=True)
+            if entry:
+                del self._entries[key]
+
+        task_prep_answer = self._get_from_db(key)
+
+        with self._lock:
+            if task_prep_answer is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+
+        self.put(key, task_prep_answer)
+        return task_prep_answer.model_copy(deep=True)
+
+    def put(self, key: str, task_prep_answer: TaskPrepAnswerBase) -> None:
+        """
+        Stores the answer of a completed task run, evicting the least recently used entries beyond `max_size`.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, task_prep_answer.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """
+        Removes the answer for the given key from the in-process cache.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit and miss counters of the cache.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.memory_hits + self.db_hits) / lookups if lookups else 0.0,
+            }
+
+    def _get_from_db(self, key: str) -> Optional[TaskPrepAnswerBase]:
+        """
+        Looks up the answer persisted with the most recent task run with the same prompt.
+        Uses its own session, as lookups happen on the worker threads of the ExecutionContext.
+        """
+        created_after = datetime.now(tz=timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        db = SessionLocal()
+        try:
+            task_prep_answer = crud.task_prep_answer.get_latest_by_prompt_hash(
+                db, prompt_hash=key, created_after=created_after
+            )
+            return TaskPrepAnswerBase.from_orm(task_prep_answer) if task_prep_answer else None
+        except Exception as e:
+            logger.warning(f"Task preparation cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+
+task_prep_cache = TaskPrepCache(
+    max_size=settings.TASK_PREP_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TASK_PREP_CACHE_TTL_SECONDS,
+    enabled=settings.TASK_PREP_CACHE_ENABLED,
+)
@@ -2,6 +2,7 @@ from typing import Generator, Optional
 from app import crud, schemas
 from app.api import deps
 from app.core.utils.graph import flow_to_graph
+from app.flow_execution.binding import parse_task_reference
 from app.models import (
     ValidationMessageBase,
     FlowValidationFailureMessage,
@@ -160,16 +161,17 @@ def check_edge_validity(
     for arg in task_op.arguments:
         if arg.source == "@tasks()":
             # Check if the argument value is correctly formatted
-            if "." not in arg.value or arg.value.split(".")[-1] != "output":
+            reference = parse_task_reference(arg.value)
+            if reference is None:
                 validation_messages.append(
                     TaskValidationFailureMessage(
-                        f"Invalid value format for argument {arg.name} in task {task_op.name}. When the source is '@tasks()', value should be in the format of 'task_name.output'.",
+                        f"Invalid value format for argument {arg.name} in task {task_op.name}. When the source is '@tasks()', value should be in the format of 'task_name.output', optionally followed by a path such as 'task_name.output.id' or 'task_name.output[0].id'.",
                         task_name=task_op.name,
                     )
                 )
                 continue
 
-            task_output_source = arg.value.split(".")[-2]  # The task's output that is being used as an argument source
+            task_output_source, output_path = reference  # The task's output that is being used as an argument source
             source_task_op = [task for task in flow.task_operations if task.name == task_output_source]
 
             if not source_task_op:
@@ -192,8 +194,9 @@ def check_edge_validity(
                     )
                 )
                 continue
-            # The data type of argument should match the data type of output of source task operation
-            if arg.data_type != source_task_definition.output_type:
+            # The data type of argument should match the data type of output of source task operation,
+            # unless the argument only uses a part of that output
+            if not output_path and arg.data_type != source_task_definition.output_type:
                 validation_messages.append(
                     TaskValidationFailureMessage(
                         f"The data type of argument {arg.name} does not match the output type of the source task operation {task_output_source} for task {task_op.name}.",
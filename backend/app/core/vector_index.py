@@ -0,0 +1,247 @@
+import fcntl
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging import logger
+
+# A vector as stored in an index: {"id": str, "values": List[float], "metadata": Dict[str, Any]}
+Vector = Dict[str, Any]
+# A result of a query: {"id": str, "score": float, "metadata": Dict[str, Any]}, most similar first
+VectorMatch = Dict[str, Any]
+
+
+class VectorIndex(ABC):
+    """
+    An index of vectors with metadata, queried by cosine similarity. Vectors and matches use the dictionary format of
+    Pinecone, so either backend can be used by the TaskDefinitionRetrievalManager.
+    """
+
+    @abstractmethod
+    def upsert(self, vectors: List[Vector]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        ...
+
+    @abstractmethod
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the metadata of the vectors with the given ids that are in the index.
+        """
+
+    @abstractmethod
+    def query(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        ...
+
+    def sync_lock(self) -> ContextManager[None]:
+        """
+        Held while bringing the index up to date, so processes sharing the index do not embed the same vectors. Does
+        nothing unless the backend can serialize processes.
+        """
+        return nullcontext()
+
+
+class LocalVectorIndex(VectorIndex):
+    """
+    Vector index held in the process: the normalized vectors are the rows of a NumPy matrix, so a query is a single
+    matrix-vector product followed by a partial sort, without a network round trip.
+
+    The matrix is persisted to `<path>.npy` and memory-mapped when loaded, with the ids and metadata in
+    `<path>.json`, so a restarted process finds the vectors it already has and only needs to embed what changed.
+    Writes replace both files atomically under an exclusive file lock, so processes sharing the path do not see
+    a matrix that does not match its metadata. Reads check whether another process replaced the files since they
+    were loaded, and if so reload them under a shared lock; otherwise they read an immutable snapshot without locking.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # The ids, the metadata and the matrix with a row per id, replaced together on every write
+        self._state: Tuple[List[str], List[Dict[str, Any]], np.ndarray] = ([], [], np.empty((0, 0), np.float32))
+        # Identifies the metadata file the state was loaded from, which every write replaces last
+        self._loaded_version: Optional[Tuple[int, int]] = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._file_lock(fcntl.LOCK_SH):
+            self._load()
+
+    def upsert(self, vectors: List[Vector]) -> None:
+        if not vectors:
+            return
+
+        rows = _normalize(np.asarray([vector["values"] for vector in vectors], dtype=np.float32))
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            self._load()
+            ids, metadata, matrix = self._state
+            ids, metadata, dimension = list(ids), list(metadata), rows.shape[1]
+            if ids and matrix.shape[1] != dimension:
+                raise ValueError(f"Vectors of dimension {dimension} do not fit an index of dimension {matrix.shape[1]}")
+
+            positions = {id: position for position, id in enumerate(ids)}
+            new = [vector for vector in vectors if vector["id"] not in positions]
+            matrix = np.concatenate(
+                [matrix.reshape(len(ids), dimension), np.empty((len(new), dimension), dtype=np.float32)]
+            )
+            for vector in new:
+                positions[vector["id"]] = len(ids)
+                ids.append(vector["id"])
+                metadata.append({})
+            for vector, row in zip(vectors, rows):
+                matrix[positions[vector["id"]]] = row
+                metadata[positions[vector["id"]]] = vector.get("metadata", {})
+
+            self._save(ids, metadata, matrix)
+
+    def delete(self, ids: List[str]) -> None:
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            self._load()
+            stored_ids, stored_metadata, matrix = self._state
+            removed = set(ids)
+            keep = [position for position, id in enumerate(stored_ids) if id not in removed]
+            if len(keep) == len(stored_ids):
+                return
+            self._save(
+                [stored_ids[position] for position in keep],
+                [stored_metadata[position] for position in keep],
+                np.asarray(matrix[keep]),
+            )
+
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self._reload_if_changed()
+        stored_ids, stored_metadata, _ = self._state
+        stored = dict(zip(stored_ids, stored_metadata))
+        return {id: stored[id] for id in ids if id in stored}
+
+    def query(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        self._reload_if_changed()
+        ids, metadata, matrix = self._state
+        top_k = min(top_k, len(ids))
+        if top_k <= 0:
+            return []
+
+        scores = matrix @ _normalize(np.asarray(vector, dtype=np.float32))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"id": ids[position], "score": float(scores[position]), "metadata": metadata[position]} for position in top
+        ]
+
+    def ids(self) -> List[str]:
+        """
+        Returns the ids of the vectors in the index, in the order they were first upserted.
+        """
+        self._reload_if_changed()
+        return list(self._state[0])
+
+    def __len__(self) -> int:
+        self._reload_if_changed()
+        return len(self._state[0])
+
+    @contextmanager
+    def sync_lock(self) -> Iterator[None]:
+        """
+        Exclusive lock of the processes sharing the path while they sync it, on a lock file of its own so writes
+        can still take theirs. Reloads the index once acquired, as another process may have synced it meanwhile.
+        """
+        with self._file_lock(fcntl.LOCK_EX, suffix=".sync.lock"):
+            with self._lock, self._file_lock(fcntl.LOCK_SH):
+                self._load()
+            yield
+
+    @contextmanager
+    def _file_lock(self, operation: int, suffix: str = ".lock") -> Iterator[None]:
+        with open(f"{self.path}{suffix}", "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(f"{self.path}.json")
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _reload_if_changed(self) -> None:
+        """
+        Reloads the index if another process wrote it since it was loaded, at the cost of a stat when it did not.
+        """
+        if self._file_version() != self._loaded_version:
+            with self._lock, self._file_lock(fcntl.LOCK_SH):
+                self._load()
+
+    def _load(self) -> None:
+        """
+        Loads the persisted index, if any. The matrix is memory-mapped read-only rather than read into memory.
+        Must be called under the file lock.
+        """
+        self._loaded_version = self._file_version()
+        if not (os.path.exists(f"{self.path}.npy") and os.path.exists(f"{self.path}.json")):
+            return
+        try:
+            with open(f"{self.path}.json") as file:
+                stored = json.load(file)
+            matrix = np.load(f"{self.path}.npy", mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Vector index at {self.path} could not be loaded, starting empty: {e}")
+            return
+        if matrix.shape[0] != len(stored["ids"]):
+            logger.warning(f"Vector index at {self.path} does not match its metadata, starting empty")
+            return
+        self._state = (stored["ids"], stored["metadata"], matrix)
+
+    def _save(self, ids: List[str], metadata: List[Dict[str, Any]], matrix: np.ndarray) -> None:
+        for suffix, write in (
+            (".npy", lambda file: np.save(file, matrix)),
+            (".json", lambda file: file.write(json.dumps({"ids": ids, "metadata": metadata}).encode("utf-8"))),
+        ):
+            with open(f"{self.path}{suffix}.tmp", "wb") as file:
+                write(file)
+            os.replace(f"{self.path}{suffix}.tmp", f"{self.path}{suffix}")
+        self._state = (ids, metadata, np.load(f"{self.path}.npy", mmap_mode="r"))
+        self._loaded_version = self._file_version()
+
+
+class PineconeVectorIndex(VectorIndex):
+    """
+    VectorIndex backed by a Pinecone index.
+    """
+
+    def __init__(self, index: Any) -> None:
+        self.index = index
+
+    def upsert(self, vectors: List[Vector]) -> None:
+        if vectors:
+            self.index.upsert(vectors=vectors)
+
+    def delete(self, ids: List[str]) -> None:
+        if ids:
+            self.index.delete(ids=ids)
+
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        vectors = self.index.fetch(ids=ids)["vectors"]
+        return {id: vector["metadata"] or {} for id, vector in vectors.items()}
+
+    def query(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        results = self.index.query(vector=vector, top_k=top_k, include_metadata=True)
+        return [
+            {"id": match["id"], "score": match["score"], "metadata": match["metadata"]} for match in results["matches"]
+        ]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scales vectors (the last axis) to unit length, so their dot product is their cosine similarity.
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
@@ -2,12 +2,13 @@
 from .crud_user import user
 from .crud_flow_request import flow_request
 from .crud_task_definition import task_definition
-from .crud_flow import flow
+from .crud_flow import flow, async_flow
 from .crud_task_operation import task_operation
-from .crud_flow_run import flow_run
+from .crud_flow_run import flow_run, async_flow_run
 from .crud_integration_credential import integration_credential
 from .crud_integration import integration
 
 from .crud_dependency import dependency
 from .crud_task_prep_answer import task_prep_answer
-from .crud_task_run import task_run
+from .crud_task_prep_prompt import task_prep_prompt
+from .crud_task_run import task_run, async_task_run
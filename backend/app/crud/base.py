@@ -2,8 +2,9 @@ from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, insert, select, update
 
 from app.db.base_class import Base
 from app.models import User
@@ -72,8 +73,90 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         return db_obj
 
+    def insert_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Inserts the rows in a single statement and returns their ids, in the order of the rows.
+        Does not commit, so several writes can share one transaction.
+        """
+        if not rows:
+            return []
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        return list(db.scalars(stmt, rows))
+
+    def update_many(self, db: Session, *, rows: List[Dict[str, Any]]) -> None:
+        """
+        Updates rows by their "id" in one batch; every row only sets the columns it contains.
+        Does not commit, so several writes can share one transaction.
+        """
+        if rows:
+            db.execute(update(self.model), rows)
+
     def remove(self, db: Session, *, id: str) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
         return obj
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        Asynchronous variant of CRUDBase, for endpoints that use an AsyncSession.
+
+        Relationships cannot be loaded lazily with an AsyncSession, so reads that are turned into schemas with
+        nested objects must load those relationships eagerly.
+
+        **Parameters**
+
+        * `model`: A SQLAlchemy model class
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.scalar(select(self.model).where(self.model.id == id))
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        stmt = select(self.model).order_by(desc(self.model.created_date)).offset(skip).limit(limit)
+        return list(await db.scalars(stmt))
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType, current_user: User = None) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)  # type: ignore
+
+        if current_user:
+            db_obj.created_by_email = current_user.email
+            db_obj.modified_by_email = current_user.email
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        current_user: User = None
+    ) -> ModelType:
+        if not isinstance(obj_in, dict):
+            obj_in = obj_in.dict(exclude_unset=True)
+
+        for key, value in obj_in.items():
+            if hasattr(db_obj, key):
+                setattr(db_obj, key, value)
+
+        if current_user:
+            db_obj.modified_by_email = current_user.email
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: str) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
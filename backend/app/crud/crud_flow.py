@@ -1,16 +1,64 @@
 import datetime
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from app.crud.base import CRUDBase
-from sqlalchemy.orm import Session
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.crud_dependency import dependency
+from app.crud.crud_task_operation import task_operation
+from app.crud.pagination import apaginate, filter_time_range, paginate
+from sqlalchemy import Select, desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.flow import Flow
 from app.schemas.flow import FlowCreate, FlowUpdate
 from app.models import Flow, TaskOperation, User, Dependency
 
 
+def _select_with_graph() -> Select:
+    """
+    Selects flows and loads their task operations and dependencies up front, with one extra query per collection for
+    all flows together, instead of one lazy query per flow when the schemas read them.
+    """
+    return select(Flow).options(selectinload(Flow.task_operations), selectinload(Flow.dependencies))
+
+
+def _select_page(
+    created_by_email: Optional[str], since: Optional[datetime.datetime], until: Optional[datetime.datetime]
+) -> Select:
+    stmt = _select_with_graph()
+    if created_by_email is not None:
+        stmt = stmt.where(Flow.created_by_email == created_by_email)
+    return filter_time_range(stmt, Flow.created_date, since, until)
+
+
 class CRUDFlow(CRUDBase[Flow, FlowCreate, FlowUpdate]):
+    def get(self, db: Session, id: Any) -> Optional[Flow]:
+        return db.scalar(_select_with_graph().where(Flow.id == id))
+
+    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[Flow]:
+        return list(db.scalars(_select_with_graph().order_by(desc(Flow.created_date)).offset(skip).limit(limit)))
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        created_by_email: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Tuple[List[Flow], Optional[str]]:
+        """
+        Returns a page of flows, most recently created first, and the cursor of the next page.
+        """
+        stmt = _select_page(created_by_email, since, until)
+        return paginate(db, stmt, timestamp_column=Flow.created_date, id_column=Flow.id, cursor=cursor, limit=limit)
+
     def create(self, db: Session, *, flow: FlowCreate, current_user: User) -> Flow:
+        """
+        Creates the flow with its task operations and dependencies in one transaction: the flow is inserted first,
+        then all task operations and all dependencies with one bulk insert each.
+        """
 
         # split information in family and members
         flow_data = flow.model_dump()
@@ -24,33 +72,24 @@ class CRUDFlow(CRUDBase[Flow, FlowCreate, FlowUpdate]):
         db_flow.created_by_human = True
         db_flow.modified_by_human = True
 
-        db.add(db_flow)
-        db.commit()
-        db.refresh(db_flow)
+        try:
+            db.add(db_flow)
+            db.flush()
 
-        # get flow_id
-        flow_id = db_flow.id
+            for m in task_operations_data:
+                m["flow"] = db_flow.id
+                m["created_by_email"] = current_user.email
+                m["modified_by_email"] = current_user.email
+            task_operation.insert_many(db, rows=task_operations_data)
 
-        # loop through task operations
-        for m in task_operations_data:
-            m["flow"] = flow_id
-            db_task_operation = TaskOperation(**m)
-            db_task_operation.created_by_email = current_user.email
-            db_task_operation.modified_by_email = current_user.email
+            for m in dependency_data:
+                m["flow"] = db_flow.id
+            dependency.insert_many(db, rows=dependency_data)
 
-            db.add(db_task_operation)
             db.commit()
-            db.refresh(db_task_operation)
-
-        for m in dependency_data:
-            m["flow"] = flow_id
-            db_dependency = Dependency(**m)
-            db_dependency.created_by_email = current_user.email
-            db_dependency.modified_by_email = current_user.email
-
-            db.add(db_dependency)
-            db.commit()
-            db.refresh(db_dependency)
+        except Exception:
+            db.rollback()
+            raise
 
         return db_flow
 
@@ -80,10 +119,15 @@ class CRUDFlow(CRUDBase[Flow, FlowCreate, FlowUpdate]):
         # Handle TaskOperations
         new_task_operations_data = [t for t in obj_in_data['task_operations'] if t.get('id') is None]
         existing_task_operations_data = [t for t in obj_in_data['task_operations'] if t.get('id') is not None]
-        
+
+        # Existing task operations and dependencies are looked up in the collections of the flow, which are
+        # loaded with one query each, instead of one query per row
+        task_operations_by_id = {task_op.id: task_op for task_op in db_obj.task_operations}
+        dependencies_by_id = {dep.id: dep for dep in db_obj.dependencies}
+
         # Update existing task operations
         for task_op_data in existing_task_operations_data:
-            task_op = db.query(TaskOperation).get(task_op_data.get('id'))
+            task_op = task_operations_by_id.get(task_op_data.get('id'))
             if task_op:
                 for key, value in task_op_data.items():
                     setattr(task_op, key, value)
@@ -107,7 +151,7 @@ class CRUDFlow(CRUDBase[Flow, FlowCreate, FlowUpdate]):
 
         # Update existing dependencies
         for dep_data in existing_dependencies_data:
-            dep = db.query(Dependency).get(dep_data.get('id'))
+            dep = dependencies_by_id.get(dep_data.get('id'))
             if dep:
                 for key, value in dep_data.items():
                     setattr(dep, key, value)
@@ -135,4 +179,30 @@ class CRUDFlow(CRUDBase[Flow, FlowCreate, FlowUpdate]):
 
         return db_obj
 
+
+class AsyncCRUDFlow(AsyncCRUDBase[Flow, FlowCreate, FlowUpdate]):
+    async def get(self, db: AsyncSession, id: Any) -> Optional[Flow]:
+        return await db.scalar(_select_with_graph().where(Flow.id == id))
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[Flow]:
+        stmt = _select_with_graph().order_by(desc(Flow.created_date)).offset(skip).limit(limit)
+        return list(await db.scalars(stmt))
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        created_by_email: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Tuple[List[Flow], Optional[str]]:
+        stmt = _select_page(created_by_email, since, until)
+        return await apaginate(
+            db, stmt, timestamp_column=Flow.created_date, id_column=Flow.id, cursor=cursor, limit=limit
+        )
+
+
 flow = CRUDFlow(Flow)
+async_flow = AsyncCRUDFlow(Flow)
@@ -1,11 +1,50 @@
-from typing import Any, Dict, Optional, Union
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.crud.pagination import filter_time_range, paginate
 from app.models.flow_request import FlowRequest
 from app.schemas.flow_request import FlowRequestCreate, FlowRequestUpdate
 
 
 class CRUDFlowRequest(CRUDBase[FlowRequest, FlowRequestCreate, FlowRequestUpdate]):
-    pass
+    def get_by_flow_id(self, db: Session, flow_id: Any) -> Optional[FlowRequest]:
+        """
+        Returns the most recent flow request for the given flow.
+        """
+        return (
+            db.query(self.model)
+            .filter(self.model.flow == flow_id)
+            .order_by(self.model.created_date.desc())
+            .first()
+        )
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        flow_id: Optional[Any] = None,
+        created_by_email: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[FlowRequest], Optional[str]]:
+        """
+        Returns a page of flow requests, most recently created first, and the cursor of the next page.
+        """
+        stmt = select(self.model)
+        if flow_id is not None:
+            stmt = stmt.where(self.model.flow == flow_id)
+        if created_by_email is not None:
+            stmt = stmt.where(self.model.created_by_email == created_by_email)
+        stmt = filter_time_range(stmt, self.model.created_date, since, until)
+        return paginate(
+            db, stmt, timestamp_column=self.model.created_date, id_column=self.model.id, cursor=cursor, limit=limit
+        )
+
 
-flow_request = CRUDFlowRequest(FlowRequest)
\ No newline at end of file
+flow_request = CRUDFlowRequest(FlowRequest)
@@ -1,8 +1,14 @@
-from typing import Any, Union
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional, Tuple, Union
 
-from app.crud.base import CRUDBase
+from sqlalchemy import Select, and_, desc, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.shared_models import FlowStatus
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import apaginate, filter_time_range, paginate
 from app.models.flow_run import FlowRun
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, selectinload
 from app.schemas import FlowRunCreate, TaskRunUpdate, FlowRunUpdate, FlowRunBase
 from app.models import FlowRun, TaskRun
 
@@ -11,7 +17,75 @@ from app.schemas.task_run import TaskRunCreate
 from app.models.user import User
 
 
+def _select_with_task_runs() -> Select:
+    """
+    Selects flow runs and loads their task runs, with their task preparation prompts and answers, up front: one extra
+    query per relationship for all flow runs together, instead of lazy queries per row.
+    """
+    return select(FlowRun).options(
+        selectinload(FlowRun.task_runs).options(
+            selectinload(TaskRun.task_prep_prompt), selectinload(TaskRun.task_prep_answer)
+        )
+    )
+
+
+def _select_summary(id: Any) -> Select:
+    """
+    Selects a flow run with only the state of its task runs, leaving out their results and preparation.
+    """
+    return (
+        select(FlowRun)
+        .options(
+            load_only(
+                FlowRun.id,
+                FlowRun.flow,
+                FlowRun.status,
+                FlowRun.triggered_time,
+                FlowRun.end_time,
+                FlowRun.triggered_by,
+                FlowRun.version,
+            ),
+            selectinload(FlowRun.task_runs).load_only(
+                TaskRun.id, TaskRun.task_operation_index, TaskRun.status, TaskRun.start_time, TaskRun.end_time
+            ),
+        )
+        .where(FlowRun.id == id)
+    )
+
+
+def _select_version(id: Any) -> Select:
+    return select(FlowRun.version).where(FlowRun.id == id)
+
+
+def _select_latest(skip: int, limit: int) -> Select:
+    return _select_with_task_runs().order_by(desc(FlowRun.triggered_time)).offset(skip).limit(limit)
+
+
+def _select_page(
+    flow_id: Optional[Any],
+    status: Optional[FlowStatus],
+    triggered_by: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> Select:
+    stmt = _select_with_task_runs()
+    if flow_id is not None:
+        stmt = stmt.where(FlowRun.flow == flow_id)
+    if status is not None:
+        stmt = stmt.where(FlowRun.status == status)
+    if triggered_by is not None:
+        stmt = stmt.where(FlowRun.triggered_by == triggered_by)
+    return filter_time_range(stmt, FlowRun.triggered_time, since, until)
+
+
 class CRUDFlowRun(CRUDBase[FlowRun, FlowRunCreate, FlowRunUpdate]):
+    def get(self, db: Session, id: Any) -> Optional[FlowRun]:
+        return db.scalar(_select_with_task_runs().where(FlowRun.id == id))
+
+    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[FlowRun]:
+        # Flow runs have no created_date; they are listed by the time they were triggered
+        return list(db.scalars(_select_latest(skip, limit)))
+
     def update(self, db: Session, *, db_obj: FlowRun, obj_in: FlowRunUpdate, current_user: User) -> FlowRun:
         # Convert FlowRunUpdate Pydantic model to a dictionary, excluding unset fields
         update_data = obj_in.dict(exclude_unset=True, exclude={"task_runs"})
@@ -24,6 +98,7 @@ class CRUDFlowRun(CRUDBase[FlowRun, FlowRunCreate, FlowRunUpdate]):
         # Update the 'modified_by_email' field to the current user's email
         if current_user:
             db_obj.modified_by_email = current_user.email
+        db_obj.version = FlowRun.version + 1
 
         # Persist changes to the database
         db.add(db_obj)
@@ -32,8 +107,192 @@ class CRUDFlowRun(CRUDBase[FlowRun, FlowRunCreate, FlowRunUpdate]):
 
         return db_obj
     
+    def claim(self, db: Session, *, id: Any, worker_id: str, claim_timeout_seconds: int) -> Optional[FlowRun]:
+        """
+        Atomically claims a flow run for execution by a worker and marks it as in progress.
+
+        A flow run can be claimed when it is pending, or when it is in progress but its claim has expired
+        because the worker executing it stopped. Returns None if the flow run cannot be claimed, so a
+        redelivered or duplicated request to run it is a no-op.
+        """
+        now = datetime.now(tz=timezone.utc)
+        claim_expired_before = now - timedelta(seconds=claim_timeout_seconds)
+
+        claimed_id = db.execute(
+            update(FlowRun)
+            .where(
+                FlowRun.id == id,
+                or_(
+                    FlowRun.status == FlowStatus.PENDING,
+                    and_(FlowRun.status == FlowStatus.IN_PROGRESS, FlowRun.claimed_at < claim_expired_before),
+                ),
+            )
+            .values(status=FlowStatus.IN_PROGRESS, claimed_by=worker_id, claimed_at=now, version=FlowRun.version + 1)
+            .returning(FlowRun.id)
+        ).scalar_one_or_none()
+        db.commit()
+
+        return self.get(db, claimed_id) if claimed_id else None
+
+    def refresh_claim(self, db: Session, *, id: Any, worker_id: str) -> bool:
+        """
+        Extends the claim of a worker on the flow run it is executing, so the flow run is not claimed by another
+        worker while it runs longer than the claim timeout. Returns False if the worker no longer holds the claim.
+        """
+        refreshed_id = db.execute(
+            update(FlowRun)
+            .where(FlowRun.id == id, FlowRun.status == FlowStatus.IN_PROGRESS, FlowRun.claimed_by == worker_id)
+            .values(claimed_at=datetime.now(tz=timezone.utc))
+            .returning(FlowRun.id)
+        ).scalar_one_or_none()
+        db.commit()
+        return refreshed_id is not None
+
+    def set_status(
+        self, db: Session, *, id: Any, status: FlowStatus, end_time: Optional[datetime]
+    ) -> Tuple[FlowStatus, Optional[datetime]]:
+        """
+        Sets the status and end time of a flow run and returns them as stored.
+        Does not commit, so it can share a transaction with the writes of its task runs; the version is left to
+        `increment_version`, which is called once for all writes of the transaction.
+        """
+        stmt = (
+            update(FlowRun)
+            .where(FlowRun.id == id)
+            .values(status=status, end_time=end_time)
+            .returning(FlowRun.status, FlowRun.end_time)
+            .execution_options(synchronize_session=False)
+        )
+        return tuple(db.execute(stmt).one())
+
+    def increment_version(self, db: Session, *, ids: Iterable[Any]) -> None:
+        """
+        Increments the version of the given flow runs, after a change to them or their task runs.
+        Does not commit, so it can share a transaction with the change.
+        """
+        ids = list(ids)
+        if ids:
+            db.execute(
+                update(FlowRun)
+                .where(FlowRun.id.in_(ids))
+                .values(version=FlowRun.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+    def get_summary(self, db: Session, id: Any) -> Optional[FlowRun]:
+        """
+        Returns the flow run with only its status, timings and version and those of its task runs loaded.
+        """
+        return db.scalar(_select_summary(id))
+
+    def get_version(self, db: Session, id: Any) -> Optional[int]:
+        return db.scalar(_select_version(id))
+
+    def take_claim(self, db: Session, *, id: Any, worker_id: str) -> bool:
+        """
+        Claims a flow run in progress that no worker claimed, i.e. one executed in the process that created or
+        reopened it. Returns False if the flow run is not in progress or already claimed.
+        """
+        claimed_id = db.execute(
+            update(FlowRun)
+            .where(FlowRun.id == id, FlowRun.status == FlowStatus.IN_PROGRESS, FlowRun.claimed_by == None)
+            .values(claimed_by=worker_id, claimed_at=datetime.now(tz=timezone.utc))
+            .returning(FlowRun.id)
+        ).scalar_one_or_none()
+        db.commit()
+        return claimed_id is not None
+
+    def reopen(self, db: Session, *, id: Any, status: FlowStatus, claim_timeout_seconds: int) -> Optional[FlowRun]:
+        """
+        Atomically reopens a flow run so that it can be resumed, keeping its task runs. A flow run can be reopened
+        when it failed or was cancelled, or when it is in progress but its claim has expired because the process
+        executing it died. Runs that were never claimed count as claimed when they were triggered.
+
+        Returns None if the flow run cannot be reopened, so concurrent requests to resume it reopen it only once.
+        The reopened flow run is not claimed by anyone, but counts as claimed now, so it is not taken for orphaned
+        before the process resuming it claims it.
+        """
+        now = datetime.now(tz=timezone.utc)
+        claim_expired_before = now - timedelta(seconds=claim_timeout_seconds)
+
+        reopened_id = db.execute(
+            update(FlowRun)
+            .where(
+                FlowRun.id == id,
+                or_(
+                    FlowRun.status.in_((FlowStatus.FAILED, FlowStatus.CANCELLED)),
+                    and_(
+                        FlowRun.status == FlowStatus.IN_PROGRESS,
+                        func.coalesce(FlowRun.claimed_at, FlowRun.triggered_time) < claim_expired_before,
+                    ),
+                ),
+            )
+            .values(status=status, end_time=None, claimed_by=None, claimed_at=now, version=FlowRun.version + 1)
+            .returning(FlowRun.id)
+        ).scalar_one_or_none()
+        db.commit()
+
+        return self.get(db, reopened_id) if reopened_id else None
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        flow_id: Optional[Any] = None,
+        status: Optional[FlowStatus] = None,
+        triggered_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[FlowRun], Optional[str]]:
+        """
+        Returns a page of flow runs, most recently triggered first, and the cursor of the next page.
+        """
+        stmt = _select_page(flow_id, status, triggered_by, since, until)
+        return paginate(
+            db, stmt, timestamp_column=FlowRun.triggered_time, id_column=FlowRun.id, cursor=cursor, limit=limit
+        )
+
     def get_multi_by_flow_id(self, db: Session, flow_id: str, skip: int = 0, limit: int = 100) -> List[FlowRun]:
-        return db.query(self.model).filter(self.model.flow == flow_id).order_by(self.model.modified_date.desc()).offset(skip).limit(limit).all()
+        return list(db.scalars(_select_latest(skip, limit).where(FlowRun.flow == flow_id)))
+
+
+class AsyncCRUDFlowRun(AsyncCRUDBase[FlowRun, FlowRunCreate, FlowRunUpdate]):
+    async def get(self, db: AsyncSession, id: Any) -> Optional[FlowRun]:
+        return await db.scalar(_select_with_task_runs().where(FlowRun.id == id))
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[FlowRun]:
+        return list(await db.scalars(_select_latest(skip, limit)))
+
+    async def get_summary(self, db: AsyncSession, id: Any) -> Optional[FlowRun]:
+        return await db.scalar(_select_summary(id))
+
+    async def get_version(self, db: AsyncSession, id: Any) -> Optional[int]:
+        return await db.scalar(_select_version(id))
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        flow_id: Optional[Any] = None,
+        status: Optional[FlowStatus] = None,
+        triggered_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[FlowRun], Optional[str]]:
+        stmt = _select_page(flow_id, status, triggered_by, since, until)
+        return await apaginate(
+            db, stmt, timestamp_column=FlowRun.triggered_time, id_column=FlowRun.id, cursor=cursor, limit=limit
+        )
+
+    async def get_multi_by_flow_id(
+        self, db: AsyncSession, flow_id: str, skip: int = 0, limit: int = 100
+    ) -> List[FlowRun]:
+        return list(await db.scalars(_select_latest(skip, limit).where(FlowRun.flow == flow_id)))
 
 
 flow_run = CRUDFlowRun(FlowRun)
+async_flow_run = AsyncCRUDFlowRun(FlowRun)
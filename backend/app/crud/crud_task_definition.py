@@ -3,7 +3,7 @@ from typing import Any, List, Optional
 
 from app.crud.base import CRUDBase
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from app.models.task_definition import TaskDefinition
 from app.schemas.task_definition import TaskDefinitionCreate, TaskDefinitionUpdate
 
@@ -34,7 +34,24 @@ class CRUDTaskDefinition(CRUDBase[TaskDefinition, TaskDefinitionCreate, TaskDefi
             .all()
         )
 
-    def sync(self, task_definitions: List[TaskDefinitionCreate], db: Session) -> None:
+    def get_deleted(self, db: Session) -> List[TaskDefinition]:
+        return db.query(self.model).filter(self.model.deleted_at != None).all()
+
+    def get_catalog_version(self, db: Session) -> str:
+        """
+        Returns a value that changes whenever a task definition is added, changed or deleted, in a single aggregate
+        query, so caches derived from the catalog can tell whether they are still valid.
+        """
+        active_count, last_modified = db.query(
+            func.count(self.model.id).filter(self.model.deleted_at == None), func.max(self.model.modified_date)
+        ).one()
+        return f"{active_count}:{last_modified.isoformat() if last_modified else ''}"
+
+    def sync(self, task_definitions: List[TaskDefinitionCreate], db: Session) -> bool:
+        """
+        Makes the active task definitions match the given ones, and returns whether any of them changed.
+        """
+        changed = False
         task_definitions_dict = {td.task_name: td for td in task_definitions if td.task_name is not None}
 
         existing_task_definitions = db.query(TaskDefinition).filter(TaskDefinition.deleted_at.is_(None)).all()
@@ -57,6 +74,7 @@ class CRUDTaskDefinition(CRUDBase[TaskDefinition, TaskDefinitionCreate, TaskDefi
                 needs_update = any(getattr(td, attr) != value for attr, value in changes.items())
 
                 if needs_update:
+                    changed = True
                     # If updates are needed, apply changes
                     for attr, value in changes.items():
                         setattr(td, attr, value)
@@ -65,6 +83,7 @@ class CRUDTaskDefinition(CRUDBase[TaskDefinition, TaskDefinitionCreate, TaskDefi
 
             # If the task definition no longer exists, mark it as deleted
             td.deleted_at = datetime.now()
+            changed = True
 
         # For new task definitions that weren't in the existing set, create new entries
         for task_def in task_definitions_dict.values():
@@ -81,8 +100,10 @@ class CRUDTaskDefinition(CRUDBase[TaskDefinition, TaskDefinitionCreate, TaskDefi
                     python_method_name=task_def.python_method_name,
                 )
                 db.add(new_td)
+                changed = True
 
         db.commit()
+        return changed
 
 
 task_definition = CRUDTaskDefinition(TaskDefinition)
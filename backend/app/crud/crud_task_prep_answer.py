@@ -1,8 +1,37 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.shared_models import TaskStatus
 from app.models.task_prep_answer import TaskPrepAnswer
+from app.models.task_prep_prompt import TaskPrepPrompt
+from app.models.task_run import TaskRun
 from app.schemas import TaskPrepAnswerCreate, TaskPrepAnswerUpdate
 from app.crud.base import CRUDBase
 
 class CRUDTaskPrepAnswer(CRUDBase[TaskPrepAnswer, TaskPrepAnswerCreate, TaskPrepAnswerUpdate]):
-    pass
+
+    def get_latest_by_prompt_hash(
+        self, db: Session, *, prompt_hash: str, created_after: datetime
+    ) -> Optional[TaskPrepAnswer]:
+        """
+        Returns the answer given to the most recent finished task run with the same prompt, if that task run completed.
+        An answer that led to a failed task run hides older answers to the same prompt.
+        """
+        task_prep_answer, status = (
+            db.query(TaskPrepAnswer, TaskRun.status)
+            .join(TaskPrepPrompt, TaskPrepAnswer.task_prep_prompt == TaskPrepPrompt.id)
+            .join(TaskRun, TaskPrepAnswer.task_run == TaskRun.id)
+            .filter(
+                TaskPrepPrompt.prompt_hash == prompt_hash,
+                TaskPrepPrompt.created_date >= created_after,
+                TaskRun.status.in_([TaskStatus.COMPLETED, TaskStatus.FAILED]),
+            )
+            .order_by(TaskPrepPrompt.created_date.desc())
+            .first()
+        ) or (None, None)
+
+        return task_prep_answer if status == TaskStatus.COMPLETED else None
 
 task_prep_answer = CRUDTaskPrepAnswer(TaskPrepAnswer)
@@ -1,17 +1,71 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional, Tuple
+from app.core.shared_models import TaskStatus
+from app.models.flow_run import FlowRun
 from app.models.task_run import TaskRun
 from app.schemas import TaskRunCreate, TaskRunUpdate
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import apaginate, filter_time_range, paginate
 from app.models.task_prep_prompt import TaskPrepPrompt
 from app.models.task_prep_answer import TaskPrepAnswer
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from app.schemas.user import User
 
 
+def _select_with_prep() -> Select:
+    return select(TaskRun).options(selectinload(TaskRun.task_prep_prompt), selectinload(TaskRun.task_prep_answer))
+
+
+def _select_latest(skip: int, limit: int) -> Select:
+    # Task runs have no created_date; they are listed by the time they started
+    return _select_with_prep().order_by(desc(TaskRun.start_time)).offset(skip).limit(limit)
+
+
+def _select_page(
+    flow_run_id: Optional[Any],
+    status: Optional[TaskStatus],
+    triggered_by: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> Select:
+    stmt = _select_with_prep()
+    if flow_run_id is not None:
+        stmt = stmt.where(TaskRun.flow_run == flow_run_id)
+    if status is not None:
+        stmt = stmt.where(TaskRun.status == status)
+    if triggered_by is not None:
+        stmt = stmt.join(FlowRun, TaskRun.flow_run == FlowRun.id).where(FlowRun.triggered_by == triggered_by)
+    return filter_time_range(stmt, TaskRun.start_time, since, until)
+
+
 class CRUDTaskRun(CRUDBase[TaskRun, TaskRunCreate, TaskRunUpdate]):
+    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[TaskRun]:
+        return list(db.scalars(_select_latest(skip, limit)))
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        flow_run_id: Optional[Any] = None,
+        status: Optional[TaskStatus] = None,
+        triggered_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[TaskRun], Optional[str]]:
+        """
+        Returns a page of task runs, most recently started first, and the cursor of the next page.
+        `triggered_by` filters on the user who triggered the flow run.
+        """
+        stmt = _select_page(flow_run_id, status, triggered_by, since, until)
+        return paginate(
+            db, stmt, timestamp_column=TaskRun.start_time, id_column=TaskRun.id, cursor=cursor, limit=limit
+        )
 
     def update_with_prep(self, db: Session, *, db_obj: TaskRun, obj_in: TaskRunUpdate, current_user: User) -> TaskRun:
         obj_data = obj_in.dict(exclude_unset=True)  # Assuming obj_in is a Pydantic model.
@@ -20,17 +74,22 @@ class CRUDTaskRun(CRUDBase[TaskRun, TaskRunCreate, TaskRunUpdate]):
         for field, value in obj_data.items():
             if field in ["task_prep_prompt", "task_prep_answer"]:
                 continue
-            if field == "result":
+            if field in ["result", "attempts"]:
                 value = self._convert_datetime_to_iso(value)
             setattr(db_obj, field, value)
 
         if current_user:
             db_obj.modified_by_email = current_user.email
 
+        # A task that failed during preparation has no (complete) prompt and answer to persist
+        if obj_in.task_prep_prompt is None:
+            db.add(db_obj)
+            db.commit()
+            db.refresh(db_obj)
+            return db_obj
+
         db_prep_prompt = TaskPrepPrompt(**obj_in.task_prep_prompt.dict())
         db_prep_prompt.task_run = db_obj.id
-        db_prep_answer = TaskPrepAnswer(**obj_in.task_prep_answer.dict())
-        db_prep_answer.task_run = db_obj.id
 
         # Optionally, directly add the objects to the session if not done through relationships.
         db.add(db_prep_prompt)
@@ -38,6 +97,11 @@ class CRUDTaskRun(CRUDBase[TaskRun, TaskRunCreate, TaskRunUpdate]):
         db.refresh(db_prep_prompt)
         db.refresh(db_obj)
 
+        if obj_in.task_prep_answer is None:
+            return db_obj
+
+        db_prep_answer = TaskPrepAnswer(**obj_in.task_prep_answer.dict())
+        db_prep_answer.task_run = db_obj.id
         db_prep_answer.task_prep_prompt = db_prep_prompt.id
         db.add(db_prep_answer)
         db.commit()
@@ -59,4 +123,30 @@ class CRUDTaskRun(CRUDBase[TaskRun, TaskRunCreate, TaskRunUpdate]):
             return obj
 
 
+class AsyncCRUDTaskRun(AsyncCRUDBase[TaskRun, TaskRunCreate, TaskRunUpdate]):
+    async def get(self, db: AsyncSession, id: Any) -> Optional[TaskRun]:
+        return await db.scalar(_select_with_prep().where(TaskRun.id == id))
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[TaskRun]:
+        return list(await db.scalars(_select_latest(skip, limit)))
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        flow_run_id: Optional[Any] = None,
+        status: Optional[TaskStatus] = None,
+        triggered_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[TaskRun], Optional[str]]:
+        stmt = _select_page(flow_run_id, status, triggered_by, since, until)
+        return await apaginate(
+            db, stmt, timestamp_column=TaskRun.start_time, id_column=TaskRun.id, cursor=cursor, limit=limit
+        )
+
+
 task_run = CRUDTaskRun(TaskRun)
+async_task_run = AsyncCRUDTaskRun(TaskRun)
@@ -1,14 +1,81 @@
-from typing import Any, Dict, Optional, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.crud.base import CRUDBase
 from app.models.user import User
+from app.schemas.user import User as UserSchema
 from app.schemas.user import UserCreate, UserInDB, UserUpdate
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    def __init__(self, model: type[User], cache_max_size: int, cache_ttl_seconds: float) -> None:
+        super().__init__(model)
+        self.cache_max_size = cache_max_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # Users looked up by email, with the monotonic time their entry expires
+        self._cache: OrderedDict[str, Tuple[float, UserSchema]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
-user = CRUDUser(User)
+    def get_cached_by_email(self, db: Session, *, email: str) -> Optional[UserSchema]:
+        """
+        Returns the user with the given email like `get_by_email`, as a schema that is cached for
+        `cache_ttl_seconds`, so the endpoints that look up the current user on every request do not query it.
+
+        Entries are dropped when the user is changed through this process; a change made by another process is
+        seen once the entry expires.
+        """
+        with self._cache_lock:
+            entry = self._cache.get(email)
+            if entry and entry[0] > time.monotonic():
+                self._cache.move_to_end(email)
+                return entry[1]
+
+        user = self.get_by_email(db, email=email)
+        if user is None:
+            return None
+
+        user_schema = UserSchema.from_orm(user)
+        with self._cache_lock:
+            self._cache[email] = (time.monotonic() + self.cache_ttl_seconds, user_schema)
+            self._cache.move_to_end(email)
+            while len(self._cache) > self.cache_max_size:
+                self._cache.popitem(last=False)
+        return user_schema
+
+    def invalidate(self, email: str) -> None:
+        with self._cache_lock:
+            self._cache.pop(email, None)
+
+    def create(self, db: Session, *, obj_in: UserCreate, current_user: User = None) -> User:
+        self.invalidate(obj_in.email)
+        return super().create(db, obj_in=obj_in, current_user=current_user)
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]],
+        current_user: User = None
+    ) -> User:
+        email = db_obj.email
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in, current_user=current_user)
+        self.invalidate(email)
+        self.invalidate(db_obj.email)
+        return db_obj
+
+    def remove(self, db: Session, *, id: str) -> User:
+        db_obj = super().remove(db, id=id)
+        self.invalidate(db_obj.email)
+        return db_obj
+
+
+user = CRUDUser(User, cache_max_size=settings.USER_CACHE_MAX_SIZE, cache_ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
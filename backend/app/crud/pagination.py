@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Upper bound of the page size accepted by the listing endpoints
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded, e.g. because it was not issued by us.
+    """
+
+
+def encode_cursor(timestamp: datetime, id: Any) -> str:
+    """
+    Encodes the position after a row as an opaque cursor: its timestamp and id, the columns the listing is ordered by.
+    """
+    position = json.dumps([timestamp.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        timestamp, id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(timestamp), UUID(id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def filter_time_range(stmt: Select, column: Any, since: Optional[datetime], until: Optional[datetime]) -> Select:
+    """
+    Restricts the statement to rows with `column` in [since, until).
+    """
+    if since is not None:
+        stmt = stmt.where(column >= since)
+    if until is not None:
+        stmt = stmt.where(column < until)
+    return stmt
+
+
+def keyset_query(stmt: Select, *, timestamp_column: Any, id_column: Any, cursor: Optional[str], limit: int) -> Select:
+    """
+    Restricts the statement to the page after `cursor`, newest first. One row more than asked for is selected,
+    which tells `keyset_page` whether there is a next page.
+
+    Pages are addressed by the (timestamp, id) of the last row of the previous page instead of an offset, so with an
+    index on (timestamp, id) every page is an index range scan of `limit` rows, however deep it is, and rows inserted
+    in the meantime do not shift the pages. Rows without a timestamp cannot be positioned and are left out.
+    """
+    stmt = stmt.where(timestamp_column.isnot(None))
+    if cursor is not None:
+        timestamp, id = decode_cursor(cursor)
+        position = tuple_(literal(timestamp, timestamp_column.type), literal(id, id_column.type))
+        stmt = stmt.where(tuple_(timestamp_column, id_column) < position)
+    return stmt.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def keyset_page(
+    rows: List[Any], *, timestamp_column: Any, id_column: Any, limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Returns the rows selected by `keyset_query` that make up the page, and the cursor of the next page (None on the
+    last page).
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+
+def paginate(
+    db: Session, stmt: Select, *, timestamp_column: Any, id_column: Any, cursor: Optional[str], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Returns a page of the rows selected by `stmt`, newest first, and the cursor of the next page (None on the last
+    page).
+    """
+    stmt = keyset_query(stmt, timestamp_column=timestamp_column, id_column=id_column, cursor=cursor, limit=limit)
+    rows = list(db.scalars(stmt))
+    return keyset_page(rows, timestamp_column=timestamp_column, id_column=id_column, limit=limit)
+
+
+async def apaginate(
+    db: AsyncSession, stmt: Select, *, timestamp_column: Any, id_column: Any, cursor: Optional[str], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Asynchronous variant of `paginate`.
+    """
+    stmt = keyset_query(stmt, timestamp_column=timestamp_column, id_column=id_column, cursor=cursor, limit=limit)
+    rows = list(await db.scalars(stmt))
+    return keyset_page(rows, timestamp_column=timestamp_column, id_column=id_column, limit=limit)
@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.logging import logger
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how often connections are checked out and how long callers wait for them.
+
+    The wait includes opening a new connection when the pool grows into its overflow, so a high average wait means
+    either that the pool is too small for the concurrency or that connecting to the database is slow. Checkouts that
+    give up after the pool timeout are counted separately.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._metrics_lock = threading.Lock()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            logger.warning(f"Timed out waiting for a database connection: {self.status()}")
+            raise
+
+        wait = time.perf_counter() - start
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "average_wait_ms": self.total_wait_seconds * 1000 / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """
+    InstrumentedQueuePool for the async engine.
+    """
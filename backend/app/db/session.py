@@ -1,7 +1,56 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), pool_pre_ping=True)
+# "values_plus_batch" sends bulk UPDATEs (e.g. of task runs) as batches instead of one statement per row
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    executemany_mode="values_plus_batch",
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Engine with the asyncpg driver for async endpoints, which wait for the database on the event loop instead of
+# holding a thread of FastAPI's threadpool. It has a pool of its own, with the same settings: the connection budget of
+# the process is split between the two engines.
+async_engine = create_async_engine(
+    make_url(str(settings.SQLALCHEMY_DATABASE_URI)).set(drivername="postgresql+asyncpg"),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+# Objects stay readable after a commit, as they cannot be refreshed lazily in async code
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Session for one unit of work outside of a request, e.g. in a service or on a worker thread.
+
+    Sessions are not thread-safe and hold on to their connection while a transaction is open, so services open one
+    per call instead of sharing a long-lived session. Work that was not committed when the block exits is rolled back,
+    and the connection goes back to the pool.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
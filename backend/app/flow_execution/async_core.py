@@ -0,0 +1,206 @@
+import asyncio
+import importlib
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.core.logging import logger
+from app.core.shared_models import TaskStatus
+from app.core.task_preparation_generator import task_preparation_generator
+from app.flow_execution.core import ExecutionContext
+from app.flow_execution.decorators import TaskResult
+from app.flow_execution.integration_pool import integration_pool
+from app.flow_execution.integrations.base import BaseIntegration
+from app.flow_execution.scheduler import DAGScheduler
+from app.schemas.flow import Flow
+from app.schemas.flow_run import FlowRun
+from app.schemas.task_definition import TaskDefinition
+from app.schemas.task_operation import TaskOperationBase
+from app.schemas.task_prep_answer import TaskPrepAnswerBase
+from app.schemas.task_prep_prompt import TaskPrepPromptBase
+from app.schemas.task_run import TaskRun
+
+
+class AsyncExecutionContext(ExecutionContext):
+    """
+    Asynchronous variant of the ExecutionContext. Runs a flow on the event loop instead of on a thread:
+    task preparation uses the async OpenAI client and tasks are executed on the async integrations
+    in `app.flow_execution.integrations.aio`, so a single process can drive many flow runs at once.
+
+    State is persisted through the same CRUD layer as the ExecutionContext. Those calls are offloaded
+    to a worker thread one at a time, as the session is not safe for concurrent use.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user: schemas.User,
+        flow: Flow,
+        flow_run: FlowRun = None,
+        max_concurrency: Optional[int] = None,
+        resume: bool = False,
+    ):
+        super().__init__(
+            db=db, user=user, flow=flow, flow_run=flow_run, max_concurrency=max_concurrency, resume=resume
+        )
+        self.owns_db = not db
+        self.path_to_integrations = "app.flow_execution.integrations.aio"
+        self.db_lock = asyncio.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run_flow(self) -> FlowRun:
+        """
+        Executes all tasks in a flow. This is the main entry point for running a flow asynchronously.
+        Every task whose upstream dependencies have completed is started right away, up to `max_concurrency`.
+        """
+
+        self.loop = asyncio.get_running_loop()
+        flow_run = await self._run_db(self._instantiate_flow_run, self.flow)
+        scheduler = DAGScheduler(self.flow)
+        failed = False
+        in_flight: Dict[asyncio.Task, Tuple[TaskOperationBase, TaskRun]] = {}
+        stop_heartbeat = None
+
+        try:
+            stop_heartbeat = await self._run_db(self._hold_claim, flow_run)
+            self.flow_request = await self._run_db(self._get_flow_request)
+            if self.resume:
+                await self._run_db(self._restore_checkpoint, scheduler)
+
+            while True:
+                if not failed:
+                    ready = scheduler.ready()[: self.max_concurrency - len(in_flight)]
+                    task_runs = [self._instantiate_task_run(task_op) for task_op in ready]
+                    # The task runs are stored as in progress before any of their tasks starts
+                    await self._run_db(self.state_writer.flush)
+                    for task_op, task_run in zip(ready, task_runs):
+                        scheduler.mark_dispatched(task_op.index)
+                        in_flight[await self._dispatch_task(task_op, task_run)] = (task_op, task_run)
+
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task_op, task_run = in_flight.pop(task)
+                    task_run = self._close_task_run(task_run, *task.result())
+                    if task_run.status == TaskStatus.FAILED:
+                        failed = True
+                    else:
+                        scheduler.mark_completed(task_op.index)
+
+                # Completed task runs are stored before the task operations that depend on them are dispatched
+                await self._run_db(self.state_writer.flush)
+
+            if failed or not scheduler.is_finished():
+                return await self._run_db(self._close_flow_run_failure, flow_run)
+
+            return await self._run_db(self._close_flow_run_success, flow_run)
+        except Exception as e:
+            logger.error(f"Flow run {flow_run.id} failed: {e}")
+            for task in in_flight:
+                task.cancel()
+            return await self._run_db(self._close_flow_run_failure, flow_run)
+        finally:
+            if stop_heartbeat is not None:
+                stop_heartbeat.set()
+            if self.owns_db:
+                self.db.close()
+
+    async def _run_db(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs a blocking database operation on a worker thread, one at a time.
+        """
+        async with self.db_lock:
+            return await asyncio.to_thread(func, *args)
+
+    async def _dispatch_task(self, task_op: TaskOperationBase, task_run: TaskRun) -> asyncio.Task:
+        """
+        Schedules the preparation and execution of a task operation on the event loop.
+        """
+
+        task_definition = await self._run_db(self._get_task_definition, task_op.task_definition)
+        integration_instance = await self._run_db(self._get_integration_instance, task_definition.integration)
+
+        # Only the outputs that are final at dispatch time are visible to the task preparation.
+        flow_run_snapshot = self.flow_run.model_copy(
+            update={"task_runs": [tr for tr in self.flow_run.task_runs if tr.status == TaskStatus.COMPLETED]}
+        )
+
+        return asyncio.create_task(self._run_task(task_op, task_definition, integration_instance, flow_run_snapshot))
+
+    async def _run_task(
+        self,
+        task_op: TaskOperationBase,
+        task_definition: TaskDefinition,
+        integration_instance: BaseIntegration,
+        flow_run: FlowRun,
+    ) -> tuple[TaskResult, Optional[TaskPrepPromptBase], Optional[TaskPrepAnswerBase]]:
+        """
+        Prepares and executes a task operation and returns the result.
+        """
+        task_prep_prompt, task_prep_answer = None, None
+        try:
+            task_prep_prompt, task_prep_answer = await self._prepare_task(task_definition, task_op.index, flow_run)
+            task_result = await self._execute_task(integration_instance, task_definition, task_prep_answer)
+        except Exception as e:
+            logger.error(f"Task operation {task_op.index} failed: {e}")
+            task_result = TaskResult.failure(error=str(e))
+
+        return task_result, task_prep_prompt, task_prep_answer
+
+    async def _prepare_task(
+        self, task_definition: TaskDefinition, task_operation_index: int, flow_run: FlowRun
+    ) -> tuple[TaskPrepPromptBase, TaskPrepAnswerBase]:
+        """
+        Prepares a task for execution, binding the arguments that can be resolved without the LLM and
+        asking the TaskPreparationGenerator for the remaining mandatory parameters, if any.
+        """
+        bound_parameters, complete = self._bind_parameters(task_definition, task_operation_index, flow_run)
+        if complete:
+            return TaskPrepPromptBase(messages=[]), TaskPrepAnswerBase(parameters=bound_parameters)
+
+        task_prep_prompt, task_prep_answer = await task_preparation_generator.agenerate(
+            self.flow, flow_run, task_operation_index, task_definition, self._get_request_instructions()
+        )
+        return task_prep_prompt, self._merge_parameters(task_prep_answer, bound_parameters)
+
+    async def _execute_task(
+        self,
+        integration_instance: BaseIntegration,
+        task_definition: TaskDefinition,
+        task_prep_answer: TaskPrepAnswerBase,
+    ) -> TaskResult:
+        """
+        Executes a task of an async integration based on its definition and provided parameters.
+        """
+        actual_python_name = task_definition.python_method_name.split(".")[-1]
+
+        method = getattr(integration_instance, actual_python_name)
+
+        input_type = self._get_method_input_type(integration_instance, actual_python_name)
+
+        if input_type is None:
+            return await method()
+        else:
+            task_input_params = self._parse_parameters(task_prep_answer)
+            task_input = input_type(**task_input_params)
+            return await method(task_input)
+
+    def _get_integration_class(self, integration: schemas.Integration) -> Type[BaseIntegration]:
+        """
+        Imports the async variant of the given integration, which is named after the synchronous class
+        prefixed with "Async".
+        """
+        path_to_integration = f"{self.path_to_integrations}.{integration.short_name}"
+
+        module = importlib.import_module(path_to_integration)
+        return getattr(module, f"Async{integration.class_name}")
+
+    def _get_integration_pool_scope(self) -> Optional[Hashable]:
+        """
+        The HTTP clients of async integrations are bound to the event loop they are used on, so their instances
+        are only shared by flow runs on the same loop.
+        """
+        return integration_pool.loop_scope(self.loop)
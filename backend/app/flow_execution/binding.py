@@ -0,0 +1,156 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.core.logging import logger
+from app.core.shared_models import Argument, TaskStatus
+from app.schemas.flow import FlowBase
+from app.schemas.flow_run import FlowRunBase
+from app.schemas.task_definition import TaskDefinition
+from app.schemas.task_operation import TaskOperationBase
+from app.schemas.task_prep_answer import TaskPrepParameterBase
+
+# "<task_name>.output", optionally followed by a path into the output such as ".id", ".cards[0].name" or "[2]".
+# Task operation names may contain spaces, as generated flows name them after their task definition ("Get Boards").
+TASK_REFERENCE_PATTERN = re.compile(r"^(?P<task_name>[^.]+)\.output(?P<path>(?:\.[^.\[\]]+|\[\d+\])*)$")
+PATH_SEGMENT_PATTERN = re.compile(r"\.([^.\[\]]+)|\[(\d+)\]")
+
+
+class UnresolvedArgumentError(Exception):
+    """
+    Raised when an argument cannot be resolved from the state of the flow run.
+    """
+
+
+def parse_task_reference(value: str) -> Optional[Tuple[str, List[Union[str, int]]]]:
+    """
+    Parses the value of a "@tasks()" argument into the name of the source task operation and the path into its output.
+    Returns None if the value is not a valid reference.
+    """
+    match = TASK_REFERENCE_PATTERN.match(value)
+    if not match:
+        return None
+
+    path = [int(index) if index else key for key, index in PATH_SEGMENT_PATTERN.findall(match.group("path"))]
+    return match.group("task_name"), path
+
+
+def extract_path(data: Any, path: List[Union[str, int]]) -> Any:
+    """
+    Follows a path of dictionary keys and list indices into the given data.
+    """
+    for segment in path:
+        try:
+            data = data[segment]
+        except (KeyError, IndexError, TypeError):
+            raise UnresolvedArgumentError(f"Path segment {segment!r} does not exist in the output")
+    return data
+
+
+class ParameterBinder:
+    """
+    Resolves the arguments of a TaskOperation to parameter values without involving the LLM.
+
+    Supported argument sources:
+    - "@tasks()": a value from the output of an upstream task operation, e.g. "get_board.output.id".
+    - "@context()": the argument value itself, as a literal.
+    - "@metadata()": a value from the metadata of the flow request.
+
+    Parameters that cannot be resolved are left to the TaskPreparationGenerator.
+    """
+
+    def bind(
+        self,
+        flow: FlowBase,
+        flow_run: FlowRunBase,
+        task_operation: TaskOperationBase,
+        request_metadata: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[TaskPrepParameterBase]:
+        """
+        Returns the parameters that could be resolved from the arguments of the task operation.
+        """
+        parameters = []
+        for argument in task_operation.arguments:
+            try:
+                value = self._resolve(argument, flow, flow_run, request_metadata)
+            except UnresolvedArgumentError as e:
+                logger.warning(f"Could not bind argument {argument.name} of task operation {task_operation.name}: {e}")
+                continue
+
+            parameters.append(
+                TaskPrepParameterBase(
+                    name=argument.name,
+                    value=value,
+                    explanation=f"Bound from {argument.source} {argument.value}",
+                )
+            )
+        return parameters
+
+    def unresolved_parameters(
+        self, task_definition: TaskDefinition, parameters: List[TaskPrepParameterBase]
+    ) -> List[str]:
+        """
+        Returns the names of the mandatory parameters of the task definition that are not in the given parameters.
+        """
+        bound = {parameter.name for parameter in parameters}
+        return [param.name for param in task_definition.parameters if not param.optional and param.name not in bound]
+
+    def _resolve(
+        self,
+        argument: Argument,
+        flow: FlowBase,
+        flow_run: FlowRunBase,
+        request_metadata: Optional[List[Dict[str, Any]]],
+    ) -> Any:
+        if argument.source == "@tasks()":
+            return self._resolve_task_output(argument, flow, flow_run)
+        if argument.source == "@context()":
+            return self._resolve_literal(argument)
+        if argument.source == "@metadata()":
+            return self._resolve_metadata(argument, request_metadata)
+
+        raise UnresolvedArgumentError(f"Unknown source {argument.source}")
+
+    def _resolve_task_output(self, argument: Argument, flow: FlowBase, flow_run: FlowRunBase) -> Any:
+        reference = parse_task_reference(argument.value)
+        if reference is None:
+            raise UnresolvedArgumentError(f"Invalid task output reference {argument.value}")
+
+        task_name, path = reference
+        source_task_op = next((task_op for task_op in flow.task_operations if task_op.name == task_name), None)
+        if source_task_op is None:
+            raise UnresolvedArgumentError(f"Task operation {task_name} does not exist in the flow")
+
+        task_runs = [
+            task_run
+            for task_run in flow_run.task_runs
+            if task_run.task_operation_index == source_task_op.index and task_run.status == TaskStatus.COMPLETED
+        ]
+        if not task_runs:
+            raise UnresolvedArgumentError(f"Task operation {task_name} has not completed")
+
+        return extract_path(task_runs[-1].result, path)
+
+    def _resolve_literal(self, argument: Argument) -> Any:
+        # Literals are strings; the integration's input model coerces scalars, structured values are given as JSON
+        if any(container in argument.data_type.lower() for container in ("list", "dict")):
+            try:
+                return json.loads(argument.value)
+            except json.JSONDecodeError:
+                raise UnresolvedArgumentError(f"Value {argument.value} is not valid JSON")
+        return argument.value
+
+    def _resolve_metadata(self, argument: Argument, request_metadata: Optional[List[Dict[str, Any]]]) -> Any:
+        # Metadata entries are either plain mappings ({"board_id": "..."}) or name/value pairs
+        # ({"name": "board_id", "value": "..."}); the argument value refers to the key or the name.
+        for entry in request_metadata or []:
+            if "name" in entry and "value" in entry:
+                if entry["name"] == argument.value:
+                    return entry["value"]
+            elif argument.value in entry:
+                return entry[argument.value]
+
+        raise UnresolvedArgumentError(f"Value {argument.value} does not exist in the flow request metadata")
+
+
+parameter_binder = ParameterBinder()
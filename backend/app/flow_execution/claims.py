@@ -0,0 +1,40 @@
+import os
+import socket
+import threading
+from typing import Any
+
+from app import crud
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import session_scope
+
+
+def in_process_worker_id() -> str:
+    """
+    Identifies the process as the holder of the claims on the flow runs it executes itself.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def start_claim_heartbeat(flow_run_id: Any, worker_id: str) -> threading.Event:
+    """
+    Refreshes the claim of the worker on the flow run every FLOW_RUN_CLAIM_HEARTBEAT_SECONDS on a background thread,
+    with a session of its own, until the returned event is set. A flow run whose claim is not refreshed for
+    FLOW_RUN_CLAIM_TIMEOUT_SECONDS counts as orphaned: it may be claimed by another worker or resumed.
+    """
+    stop = threading.Event()
+    threading.Thread(
+        target=_refresh_claim, args=(flow_run_id, worker_id, stop), name="claim-heartbeat", daemon=True
+    ).start()
+    return stop
+
+
+def _refresh_claim(flow_run_id: Any, worker_id: str, stop: threading.Event) -> None:
+    while not stop.wait(settings.FLOW_RUN_CLAIM_HEARTBEAT_SECONDS):
+        try:
+            with session_scope() as db:
+                if not crud.flow_run.refresh_claim(db, id=flow_run_id, worker_id=worker_id):
+                    logger.warning(f"Flow run {flow_run_id} is no longer claimed by {worker_id}")
+                    return
+        except Exception as e:
+            logger.error(f"Refreshing the claim on flow run {flow_run_id} failed: {e}")
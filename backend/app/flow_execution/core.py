@@ -1,36 +1,59 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 import importlib
 import inspect
-from pprint import pprint
+import threading
+import time
 from fastapi import Depends
 from pydantic import BaseModel
-from typing import Any, Dict, List, Type
-from uuid import UUID
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Type
+from uuid import UUID, uuid4
 
 from app import crud, schemas
+from app.core.config import settings
+from app.core.logging import logger
 from app.db.session import SessionLocal
+from app.flow_execution.binding import parameter_binder
+from app.flow_execution.claims import in_process_worker_id, start_claim_heartbeat
+from app.flow_execution.events import event_broker
+from app.flow_execution.integration_pool import integration_pool
 from app.flow_execution.integrations.base import BaseIntegration
+from app.flow_execution.scheduler import DAGScheduler
+from app.flow_execution.state_writer import ExecutionStateWriter
 from app.schemas.task_definition import TaskDefinition
 from app.schemas.flow import Flow, FlowBase
 from app.schemas.flow_run import FlowRun, FlowRunBase
+from app.schemas.flow_run_event import FlowRunEvent, FlowRunEventType
 from app.flow_execution.decorators import TaskResult
-from app.schemas.task_prep_answer import TaskPrepAnswerBase
+from app.schemas.task_prep_answer import TaskPrepAnswerBase, TaskPrepParameterBase
 from app.schemas.task_prep_prompt import TaskPrepPromptBase, TaskPrepPromptCreate
 from app.core.task_preparation_generator import task_preparation_generator
-from app.core.shared_models import FlowStatus, TaskStatus
+from app.core.task_prep_cache import task_prep_cache
+from app.core.shared_models import FlowStatus, TaskAttempt, TaskStatus
 from app.schemas.task_operation import TaskOperationBase
-from app.schemas.task_run import TaskRun, TaskRunBase
+from app.schemas.task_run import TaskRun
 from sqlalchemy.orm import Session
 
 from app.api import deps
 
+# Result of running a task on a worker thread: the task result and the prompt and answer of its preparation
+TaskOutcome = Tuple[TaskResult, Optional[TaskPrepPromptBase], Optional[TaskPrepAnswerBase]]
+
 class ExecutionContext:
     """
     The ExecutionContext class is responsible for running a flow and executing its tasks,
     as well as managing the state of the flow run.
     """
 
-    def __init__(self, db: Session, user: schemas.User, flow: Flow, flow_run: FlowRun = None):
+    def __init__(
+        self,
+        db: Session,
+        user: schemas.User,
+        flow: Flow,
+        flow_run: FlowRun = None,
+        max_concurrency: Optional[int] = None,
+        resume: bool = False,
+    ):
         self.user = user
         self.flow = flow
         flow.topological_sort()
@@ -38,6 +61,10 @@ class ExecutionContext:
         self.db = SessionLocal() if not db else db
         self.path_to_integrations = "app.flow_execution.integrations"
         self.flow_run = flow_run
+        self.max_concurrency = max_concurrency or settings.FLOW_RUN_MAX_CONCURRENCY
+        self.resume = resume
+        self.flow_request: Optional[schemas.FlowRequest] = None
+        self.state_writer = ExecutionStateWriter(self.db)
 
     def run_flow(self) -> FlowRun:
         """
@@ -45,22 +72,142 @@ class ExecutionContext:
 
         This method does the following:
         1. Instantiates the flow run if not given.
-        2. Iterates over and executes all tasks in the flow, interfacing with the integrations and
-           TaskPreparationGenerator and updating the task run states as needed.
+        2. Dispatches every task whose upstream dependencies have completed, running up to `max_concurrency`
+           tasks at the same time, interfacing with the integrations and TaskPreparationGenerator and
+           updating the task run states as needed.
         3. Updates the flow run status to "completed" when all tasks have been executed successfully, or "failed" if any task fails.
+
+        When resuming an existing flow run, the task operations that already completed are not executed again;
+        see `_restore_checkpoint`.
+
+        Only the preparation and execution of a task happen on the worker threads; all database access
+        stays on the calling thread, as the session is not thread-safe. State changes are batched by the
+        ExecutionStateWriter: those of each round of dispatched or finished tasks are written in one transaction.
+        Tasks do not wait for retries on the worker threads either: a failed attempt that should be retried is
+        handed back with its backoff, recorded on the task run, and dispatched again once the backoff has passed.
         """
 
         flow_run = self._instantiate_flow_run(self.flow)
-        
+        scheduler = DAGScheduler(self.flow)
+        failed = False
+        stop_heartbeat = None
+
         try:
-            for task_op in self.flow.task_operations:
-                task_run = self._run_task(task_op)
-                if task_run.status == TaskStatus.FAILED:
-                    return self._close_flow_run_failure(flow_run)
+            stop_heartbeat = self._hold_claim(flow_run)
+            self.flow_request = self._get_flow_request()
+            if self.resume:
+                self._restore_checkpoint(scheduler)
+
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                in_flight: Dict[Future, Tuple[TaskOperationBase, TaskRun]] = {}
+                # Tasks waiting for their next attempt, by the monotonic time it is due; they hold no worker thread
+                backing_off: List[Tuple[float, TaskOperationBase, TaskRun, TaskOutcome]] = []
+
+                while True:
+                    if not failed:
+                        ready = scheduler.ready()[: self.max_concurrency - len(in_flight)]
+                        task_runs = [self._instantiate_task_run(task_op) for task_op in ready]
+                        # The task runs are stored as in progress before any of their tasks starts
+                        self.state_writer.flush()
+                        for task_op, task_run in zip(ready, task_runs):
+                            scheduler.mark_dispatched(task_op.index)
+                            in_flight[self._dispatch_task(executor, task_op, task_run)] = (task_op, task_run)
+
+                    now = time.monotonic()
+                    for entry in [entry for entry in backing_off if failed or entry[0] <= now]:
+                        backing_off.remove(entry)
+                        _, task_op, task_run, outcome = entry
+                        if failed:
+                            # Another task failed, so the flow run fails anyway: give up instead of retrying
+                            outcome[0].retry_in_seconds = None
+                            self._close_task_run(task_run, *outcome)
+                        else:
+                            in_flight[self._dispatch_retry(executor, task_op, *outcome)] = (task_op, task_run)
+
+                    if not in_flight and not backing_off:
+                        break
+
+                    timeout = max(0.0, min(entry[0] for entry in backing_off) - now) if backing_off else None
+                    if not in_flight:
+                        time.sleep(timeout)
+                        continue
+
+                    done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task_op, task_run = in_flight.pop(future)
+                        outcome = future.result()
+                        if outcome[0].retry_in_seconds is not None and not failed:
+                            task_run = self._record_attempts(task_run, outcome[0])
+                            due = time.monotonic() + outcome[0].retry_in_seconds
+                            backing_off.append((due, task_op, task_run, outcome))
+                            continue
+
+                        outcome[0].retry_in_seconds = None
+                        task_run = self._close_task_run(task_run, *outcome)
+                        if task_run.status == TaskStatus.FAILED:
+                            failed = True
+                        else:
+                            scheduler.mark_completed(task_op.index)
+
+                    # Completed task runs are stored before the task operations that depend on them are dispatched
+                    self.state_writer.flush()
+
+            if failed or not scheduler.is_finished():
+                return self._close_flow_run_failure(flow_run)
 
             return self._close_flow_run_success(flow_run)
         except Exception as e:
+            logger.error(f"Flow run {flow_run.id} failed: {e}")
             return self._close_flow_run_failure(flow_run)
+        finally:
+            if stop_heartbeat is not None:
+                stop_heartbeat.set()
+
+    def _hold_claim(self, flow_run: FlowRun) -> Optional[threading.Event]:
+        """
+        Claims a flow run executed in process, which no worker claimed, and keeps the claim alive while it executes,
+        so it is not mistaken for a run orphaned by a process that died (see `crud.flow_run.reopen`). Returns the
+        event stopping the heartbeat, or None if the flow run is claimed by a worker, which keeps it alive itself.
+        """
+        if flow_run.claimed_by is not None:
+            return None
+        worker_id = in_process_worker_id()
+        if not crud.flow_run.take_claim(self.db, id=flow_run.id, worker_id=worker_id):
+            return None
+        flow_run.claimed_by = worker_id
+        return start_claim_heartbeat(flow_run.id, worker_id)
+
+    def _restore_checkpoint(self, scheduler: DAGScheduler) -> None:
+        """
+        Restores the progress of a previous attempt of the flow run. Task operations with a completed task run
+        are marked as completed in the scheduler, so only the failed, interrupted and downstream task operations
+        are executed again. The persisted results of the completed task runs stay on the flow run and are used
+        as-is when preparing the remaining tasks.
+
+        Task runs that were left in progress by an interrupted attempt are closed as cancelled.
+        """
+        for task_run in self.flow_run.task_runs:
+            if task_run.status == TaskStatus.COMPLETED:
+                if task_run.task_operation_index in scheduler.task_operations:
+                    scheduler.mark_completed(task_run.task_operation_index)
+            elif task_run.status in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+                self._cancel_task_run(task_run)
+        self.state_writer.flush()
+
+        logger.info(
+            f"Resuming flow run {self.flow_run.id} with {len(scheduler.completed)} of "
+            f"{len(scheduler.task_operations)} task operations already completed"
+        )
+
+    def _cancel_task_run(self, task_run: TaskRun) -> TaskRun:
+        """
+        Updates the status of a task run to "cancelled" and sets its end time.
+        """
+        task_run.status = TaskStatus.CANCELLED
+        task_run.end_time = datetime.now(tz=timezone.utc)
+        self.state_writer.update_task_run(task_run, ["status", "end_time"])
+        self._publish_task_run(task_run)
+        return task_run
 
     def _close_flow_run_failure(self, flow_run: FlowRun) -> FlowRun:
         """
@@ -68,8 +215,16 @@ class ExecutionContext:
         """
         flow_run.status = FlowStatus.FAILED
         flow_run.end_time = datetime.now()
-        flow_run_db = crud.flow_run.get(db=self.db, id=flow_run.id)
-        return crud.flow_run.update(db=self.db, db_obj=flow_run_db, obj_in=flow_run, current_user=self.user)
+        self.state_writer.close_flow_run(flow_run)
+        try:
+            self.state_writer.flush()
+        except Exception:
+            # The buffered task run changes may be what failed; the flow run must not stay in progress regardless
+            self.state_writer.discard()
+            self.state_writer.close_flow_run(flow_run)
+            self.state_writer.flush()
+        self._publish_flow_run(flow_run)
+        return flow_run
 
     def _close_flow_run_success(self, flow_run: FlowRun) -> FlowRun:
         """
@@ -77,36 +232,116 @@ class ExecutionContext:
         """
         flow_run.status = FlowStatus.COMPLETED
         flow_run.end_time = datetime.now()
-        flow_run_db = crud.flow_run.get(db=self.db, id=flow_run.id)
-        return crud.flow_run.update(db=self.db, db_obj=flow_run_db, obj_in=flow_run, current_user=self.user)
+        self.state_writer.close_flow_run(flow_run)
+        self.state_writer.flush()
+        self._publish_flow_run(flow_run)
+        return flow_run
+
+    def _dispatch_task(self, executor: ThreadPoolExecutor, task_op: TaskOperationBase, task_run: TaskRun) -> Future:
+        """
+        Submits the preparation and execution of a task operation to the executor.
+        Everything that touches the database is resolved here, before handing the task to a worker thread.
+        """
+
+        task_definition = self._get_task_definition(task_op.task_definition)
+        integration_instance = self._get_integration_instance(task_definition.integration)
+
+        # Only the outputs that are final at dispatch time are visible to the task preparation.
+        flow_run_snapshot = self.flow_run.model_copy(
+            update={"task_runs": [tr for tr in self.flow_run.task_runs if tr.status == TaskStatus.COMPLETED]}
+        )
 
-    def _run_task(self, task_op: TaskOperationBase) -> TaskRun:
+        return executor.submit(self._run_task, task_op, task_definition, integration_instance, flow_run_snapshot)
+
+    def _run_task(
+        self,
+        task_op: TaskOperationBase,
+        task_definition: TaskDefinition,
+        integration_instance: BaseIntegration,
+        flow_run: FlowRun,
+    ) -> TaskOutcome:
         """
-        Runs a task operation and returns the result.
+        Prepares and executes a task operation and returns the result. Runs on a worker thread.
         """
+        task_prep_prompt, task_prep_answer = None, None
+        try:
+            task_prep_prompt, task_prep_answer = self._prepare_task(task_definition, task_op.index, flow_run)
+            task_result = self._execute_task(integration_instance, task_definition, task_prep_answer)
+        except Exception as e:
+            logger.error(f"Task operation {task_op.index} failed: {e}")
+            task_result = TaskResult.failure(error=str(e))
 
-        task_run = self._instantiate_task_run(task_op)
+        return task_result, task_prep_prompt, task_prep_answer
 
+    def _dispatch_retry(
+        self,
+        executor: ThreadPoolExecutor,
+        task_op: TaskOperationBase,
+        task_result: TaskResult,
+        task_prep_prompt: Optional[TaskPrepPromptBase],
+        task_prep_answer: Optional[TaskPrepAnswerBase],
+    ) -> Future:
+        """
+        Submits the next attempt of a task whose backoff has passed to the executor, reusing its preparation.
+        """
         task_definition = self._get_task_definition(task_op.task_definition)
-        task_prep_prompt, task_prep_answer = self._prepare_task(task_definition, task_op.index)
+        integration_instance = self._get_integration_instance(task_definition.integration)
 
-        pprint(task_prep_prompt.messages[1])
+        return executor.submit(
+            self._retry_task,
+            task_op,
+            task_definition,
+            integration_instance,
+            task_result,
+            task_prep_prompt,
+            task_prep_answer,
+        )
 
-        task_result = self._execute_task(task_definition, task_prep_answer)
+    def _retry_task(
+        self,
+        task_op: TaskOperationBase,
+        task_definition: TaskDefinition,
+        integration_instance: BaseIntegration,
+        previous_result: TaskResult,
+        task_prep_prompt: Optional[TaskPrepPromptBase],
+        task_prep_answer: Optional[TaskPrepAnswerBase],
+    ) -> TaskOutcome:
+        """
+        Executes the next attempt of a task operation. Runs on a worker thread.
+        """
+        try:
+            task_result = self._execute_task(
+                integration_instance, task_definition, task_prep_answer, attempts=previous_result.attempts
+            )
+        except Exception as e:
+            logger.error(f"Task operation {task_op.index} failed: {e}")
+            task_result = TaskResult(status=TaskStatus.FAILED, error=str(e), attempts=previous_result.attempts)
 
-        task_run = self._close_task_run(task_run, task_result, task_prep_prompt, task_prep_answer)
+        return task_result, task_prep_prompt, task_prep_answer
 
+    def _record_attempts(self, task_run: TaskRun, task_result: TaskResult) -> TaskRun:
+        """
+        Records the attempts of a task run that will be retried after its backoff.
+        """
+        logger.info(
+            f"Task operation {task_run.task_operation_index} failed attempt {len(task_result.attempts)}, "
+            f"retrying in {task_result.retry_in_seconds:.1f}s: {task_result.error}"
+        )
+        task_run.attempts = task_result.attempts
+        self.state_writer.update_task_run(task_run, ["attempts"])
+        self._publish_task_run(task_run)
         return task_run
 
     def _close_task_run(
         self,
         task_run: TaskRun,
         task_result: TaskResult,
-        task_prep_prompt: TaskPrepPromptBase,
-        task_prep_answer: TaskPrepAnswerBase,
+        task_prep_prompt: Optional[TaskPrepPromptBase],
+        task_prep_answer: Optional[TaskPrepAnswerBase],
     ) -> TaskRun:
         """
         Closes a task run by updating its status and end time. Formats the task run from the task result.
+        The changes are buffered and written with the next flush of the state writer.
         """
 
         # task_run.task_prep_prompt = TaskPrepPrompt(**task_prep_prompt.dict())
@@ -124,18 +359,25 @@ class ExecutionContext:
 
         # task_run.result = task_result.data
         task_run.status = task_result.status
+        if task_result.attempts:
+            task_run.attempts = task_result.attempts
         task_run.end_time = datetime.now(tz=timezone.utc)
 
-        task_run_db = crud.task_run.get(db=self.db, id=task_run.id)
+        if task_prep_prompt and task_prep_prompt.prompt_hash:
+            if task_run.status == TaskStatus.COMPLETED and task_prep_answer:
+                task_prep_cache.put(task_prep_prompt.prompt_hash, task_prep_answer)
+            elif task_run.status == TaskStatus.FAILED:
+                task_prep_cache.invalidate(task_prep_prompt.prompt_hash)
 
-        return crud.task_run.update_with_prep(
-            db=self.db, db_obj=task_run_db, obj_in=task_run, current_user=self.user
-        )
+        self.state_writer.update_task_run(task_run, ["status", "end_time", "result", "attempts"])
+        self.state_writer.add_task_preparation(task_run, task_prep_prompt, task_prep_answer)
+        self._publish_task_run(task_run)
+        return task_run
 
     def _instantiate_task_run(self, task_op: TaskOperationBase) -> TaskRun:
         """
         Instantiates a task run for the given task operation.
-        Writes to DB, updates self, and returns the task run object.
+        Buffers its creation in the state writer, updates self, and returns the task run object.
 
         Args:
             task_op (TaskOperationBase): The task operation for which the task run is being instantiated.
@@ -143,32 +385,78 @@ class ExecutionContext:
         Returns:
             TaskRun: The instantiated task run.
         """
-        task_run = TaskRunBase(
+        task_run = TaskRun(
+            id=uuid4(),
             flow_run=self.flow_run.id,
             task_operation_index=task_op.index,
             status=TaskStatus.IN_PROGRESS,
             start_time=datetime.now(),
         )
-        task_run_db = crud.task_run.create(db=self.db, obj_in=task_run, current_user=self.user)
-
-        task_run = TaskRun.from_orm(task_run_db)
+        self.state_writer.add_task_run(task_run)
 
         self.flow_run.task_runs.append(task_run)
 
         self.current_task_run = task_run
+        self._publish_task_run(task_run)
 
         return task_run
 
     def _prepare_task(
-        self, task_definition: TaskDefinition, task_operation_index: int
+        self, task_definition: TaskDefinition, task_operation_index: int, flow_run: FlowRun
     ) -> tuple[TaskPrepPromptBase, TaskPrepAnswerBase]:
         """
-        Prepares a task for execution by generating a prompt and sending it to the TaskPreparationGenerator.
+        Prepares a task for execution. Arguments of the task operation that can be resolved from the flow run
+        are bound directly; only if mandatory parameters remain, a prompt is generated and sent to the
+        TaskPreparationGenerator.
         """
+        bound_parameters, complete = self._bind_parameters(task_definition, task_operation_index, flow_run)
+        if complete:
+            return TaskPrepPromptBase(messages=[]), TaskPrepAnswerBase(parameters=bound_parameters)
+
         task_prep_prompt, task_prep_answer = task_preparation_generator.generate(
-            self.flow, self.flow_run, task_operation_index, task_definition
+            self.flow, flow_run, task_operation_index, task_definition, self._get_request_instructions()
         )
-        return task_prep_prompt, task_prep_answer
+        return task_prep_prompt, self._merge_parameters(task_prep_answer, bound_parameters)
+
+    def _bind_parameters(
+        self, task_definition: TaskDefinition, task_operation_index: int, flow_run: FlowRun
+    ) -> tuple[List[TaskPrepParameterBase], bool]:
+        """
+        Binds the arguments of a task operation that can be resolved without the LLM.
+        Returns the bound parameters and whether they cover every mandatory parameter of the task definition.
+        """
+        task_op = next(task_op for task_op in self.flow.task_operations if task_op.index == task_operation_index)
+        request_metadata = self.flow_request.request_metadata if self.flow_request else None
+        bound_parameters = parameter_binder.bind(self.flow, flow_run, task_op, request_metadata)
+        unresolved = parameter_binder.unresolved_parameters(task_definition, bound_parameters)
+
+        # Without any arguments, optional parameters are still left to the LLM
+        complete = not unresolved and (bool(task_op.arguments) or not task_definition.parameters)
+        return bound_parameters, complete
+
+    def _merge_parameters(
+        self, task_prep_answer: Optional[TaskPrepAnswerBase], bound_parameters: List[TaskPrepParameterBase]
+    ) -> Optional[TaskPrepAnswerBase]:
+        """
+        Overrides the parameters in a task preparation answer with the parameters that were bound deterministically.
+        """
+        if task_prep_answer is None or not bound_parameters:
+            return task_prep_answer
+
+        bound_names = {parameter.name for parameter in bound_parameters}
+        parameters = [parameter for parameter in task_prep_answer.parameters if parameter.name not in bound_names]
+        return TaskPrepAnswerBase(parameters=parameters + bound_parameters)
+
+    def _get_request_instructions(self) -> Optional[str]:
+        return self.flow_request.request_instructions if self.flow_request else None
+
+    def _get_flow_request(self) -> Optional[schemas.FlowRequest]:
+        """
+        Retrieves the flow request the flow was generated from. Its instructions are given to the task preparation
+        and its metadata is used to bind "@metadata()" arguments.
+        """
+        flow_request = crud.flow_request.get_by_flow_id(self.db, self.flow.id)
+        return schemas.FlowRequest.from_orm(flow_request) if flow_request else None
 
     def _get_task_definition(self, task_definition_id: UUID) -> TaskDefinition:
         """
@@ -183,6 +471,7 @@ class ExecutionContext:
         """
         
         if self.flow_run:
+            self._publish_flow_run(self.flow_run)
             return self.flow_run
 
         flow_run = FlowRunBase(
@@ -192,17 +481,56 @@ class ExecutionContext:
         self.flow_run = schemas.FlowRun.from_orm(
             crud.flow_run.create(db=self.db, obj_in=flow_run, current_user=self.user)
         )
+        self._publish_flow_run(self.flow_run)
 
         return self.flow_run
 
-    def _execute_task(self, task_definition: TaskDefinition, task_prep_answer: TaskPrepAnswerBase) -> TaskResult:
+    def _publish_flow_run(self, flow_run: FlowRun) -> None:
         """
-        Executes a task based on its definition and provided parameters.
+        Publishes the current status of the flow run to the clients following it.
+        """
+        event_broker.publish(
+            FlowRunEvent(
+                type=FlowRunEventType.FLOW_RUN,
+                flow_run=flow_run.id,
+                status=flow_run.status,
+                time=datetime.now(tz=timezone.utc),
+            )
+        )
 
-        Returns the result of the task execution, which is a TaskResponse object.
+    def _publish_task_run(self, task_run: TaskRun) -> None:
         """
-        integration_instance = self._get_integration_instance(task_definition.integration)
+        Publishes the current state of a task run to the clients following its flow run.
+        """
+        event_broker.publish(
+            FlowRunEvent(
+                type=FlowRunEventType.TASK_RUN,
+                flow_run=task_run.flow_run,
+                status=task_run.status,
+                time=datetime.now(tz=timezone.utc),
+                task_run=task_run.id,
+                task_operation_index=task_run.task_operation_index,
+                task_prep_answer=task_run.task_prep_answer,
+                result=task_run.result,
+                attempts=task_run.attempts,
+            )
+        )
 
+    def _execute_task(
+        self,
+        integration_instance: BaseIntegration,
+        task_definition: TaskDefinition,
+        task_prep_answer: TaskPrepAnswerBase,
+        attempts: Optional[List[TaskAttempt]] = None,
+    ) -> TaskResult:
+        """
+        Executes a task based on its definition and provided parameters.
+        `attempts` are the earlier attempts of the task, when retrying it.
+
+        Returns the result of the task execution, which is a TaskResponse object. Backoff between attempts is
+        deferred to the caller: a failed attempt that should be retried is returned with `retry_in_seconds` set.
+        """
+        runtime_config = {"attempts": attempts or [], "defer_backoff": True}
         actual_python_name = task_definition.python_method_name.split(".")[-1]
 
         method = getattr(integration_instance, actual_python_name)
@@ -210,11 +538,11 @@ class ExecutionContext:
         input_type = self._get_method_input_type(integration_instance, actual_python_name)
 
         if input_type is None:
-            return method()
+            return method(runtime_config=runtime_config)
         else:
             task_input_params = self._parse_parameters(task_prep_answer)
             task_input = input_type(**task_input_params)
-            return method(task_input)
+            return method(task_input, runtime_config=runtime_config)
 
     def _parse_parameters(self, task_prep_answer: TaskPrepAnswerBase) -> Dict[str, Any]:
         """
@@ -236,18 +564,32 @@ class ExecutionContext:
 
     def _get_integration_instance(self, integration_id: UUID) -> BaseIntegration:
         """
-        Retrieves or creates an integration instance by its ID.
+        Retrieves an integration instance by its ID from the process-wide integration pool, so its credentials
+        and HTTP connections are reused across flow runs of the user.
         """
         if integration_id in self.integrations_cache:
             return self.integrations_cache[integration_id]
 
-        integration = schemas.Integration.from_orm(crud.integration.get(self.db, integration_id))
+        integration = integration_pool.get_integration(self.db, integration_id)
+        integration_class = self._get_integration_class(integration)
 
+        integration_instance = integration_pool.get_instance(
+            self.user, integration_id, integration_class, scope=self._get_integration_pool_scope()
+        )
+        self.integrations_cache[integration_id] = integration_instance
+        return integration_instance
+
+    def _get_integration_pool_scope(self) -> Optional[Hashable]:
+        """
+        Instances of synchronous integrations can be shared by all flow runs in the process.
+        """
+        return None
+
+    def _get_integration_class(self, integration: schemas.Integration) -> Type[BaseIntegration]:
+        """
+        Imports the integration class implementing the given integration.
+        """
         path_to_integration = f"{self.path_to_integrations}.{integration.short_name}"
 
         module = importlib.import_module(path_to_integration)
-        integration_class = getattr(module, integration.class_name)
-
-        integration_instance = integration_class(self.user)
-        self.integrations_cache[integration_id] = integration_instance
-        return integration_instance
+        return getattr(module, integration.class_name)
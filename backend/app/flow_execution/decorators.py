@@ -1,12 +1,15 @@
+import asyncio
+from datetime import datetime, timezone
 from enum import Enum
 from functools import wraps
 import inspect
 import time
-from typing import Callable, Generic, Optional, TypeVar
+from typing import Any, Callable, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
-from app.core.shared_models import TaskStatus
+from app.core.shared_models import TaskAttempt, TaskStatus
+from app.flow_execution.retry import ErrorClassifier, RetryPolicy
 
 T = TypeVar("T")
 
@@ -16,6 +19,9 @@ class TaskResult(BaseModel, Generic[T]):
     data: Optional[T] = None
     error: Optional[str] = None
     metadata: Optional[dict] = Field(default_factory=dict)
+    attempts: List[TaskAttempt] = Field(default_factory=list)
+    # Set when the task failed but should be attempted again after this many seconds, see `task`
+    retry_in_seconds: Optional[float] = None
 
     @classmethod
     def success(cls, data: T, **metadata) -> "TaskResult[T]":
@@ -34,29 +40,70 @@ def task(task_name: str, max_attempts: int = 3, delay_seconds: int = 2):
     Decorator to mark a method as a Neena task.
     Allows for automatic retrying of the task in case of failure.
 
+    Failed attempts are retried according to a RetryPolicy: with exponential backoff and jitter starting at
+    `delay_seconds`, within a deadline, and only if the error is retryable (see `app.flow_execution.retry`;
+    integrations can classify their own errors with `is_retryable_error`). Every attempt is recorded in the
+    `attempts` of the returned TaskResult.
+
+    Both regular and `async def` methods are supported; for the latter, waiting between retries does not block
+    the event loop. Regular methods wait on the calling thread, unless the runtime configuration sets
+    `defer_backoff`: then the failed result is returned right away with `retry_in_seconds` set, and the caller
+    calls the task again later, passing the previous `attempts` in the runtime configuration.
+
     :param task_name: The name of the task as
-    :param max_attempts: The maximum number of attempts to retry the task.
-    :param delay_seconds: The delay between retries in seconds.
+    :param max_attempts: The maximum number of attempts, including the first one.
+    :param delay_seconds: The base delay between retries in seconds.
     """
 
     def decorator(func: R) -> R:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> TaskResult:
-            runtime_config = kwargs.get("runtime_config", {})
-            max_retries = runtime_config.get("max_attempts", max_attempts)
-            delay = runtime_config.get("delay_seconds", delay_seconds)
-
-            for attempt in range(max_retries + 1):
-                try:
-                    result = func(*args, **kwargs)
-                    # Automatically pack raw return into TaskResponse if necessary
-                    if not isinstance(result, TaskResult):
-                        return TaskResult.success(data=result)
-                    return result
-                except Exception as e:
-                    if attempt == max_retries:
-                        return TaskResult.failure(error=str(e))
-                    time.sleep(delay)
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs) -> TaskResult:
+                runtime_config = kwargs.pop("runtime_config", {})
+                policy = RetryPolicy.from_runtime_config(runtime_config, max_attempts, delay_seconds)
+                attempts = list(runtime_config.get("attempts", []))
+                classifier = _get_error_classifier(args)
+
+                while True:
+                    start_time = datetime.now(tz=timezone.utc)
+                    try:
+                        result = await func(*args, **kwargs)
+                        attempts = policy.record_success(attempts, start_time)
+                        return _pack_result(result, attempts)
+                    except Exception as e:
+                        attempts = policy.record_failure(attempts, start_time, e, classifier)
+                        backoff_seconds = attempts[-1].backoff_seconds
+                        if backoff_seconds is None:
+                            return TaskResult(status=TaskStatus.FAILED, error=str(e), attempts=attempts)
+                        await asyncio.sleep(backoff_seconds)
+
+        else:
+
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> TaskResult:
+                runtime_config = kwargs.pop("runtime_config", {})
+                policy = RetryPolicy.from_runtime_config(runtime_config, max_attempts, delay_seconds)
+                attempts = list(runtime_config.get("attempts", []))
+                classifier = _get_error_classifier(args)
+
+                while True:
+                    start_time = datetime.now(tz=timezone.utc)
+                    try:
+                        result = func(*args, **kwargs)
+                        attempts = policy.record_success(attempts, start_time)
+                        return _pack_result(result, attempts)
+                    except Exception as e:
+                        attempts = policy.record_failure(attempts, start_time, e, classifier)
+                        backoff_seconds = attempts[-1].backoff_seconds
+                        if backoff_seconds is None or runtime_config.get("defer_backoff"):
+                            return TaskResult(
+                                status=TaskStatus.FAILED,
+                                error=str(e),
+                                attempts=attempts,
+                                retry_in_seconds=backoff_seconds,
+                            )
+                        time.sleep(backoff_seconds)
 
         wrapper._is_task = True
         wrapper._task_name = task_name
@@ -75,6 +122,23 @@ def task(task_name: str, max_attempts: int = 3, delay_seconds: int = 2):
     return decorator
 
 
+def _pack_result(result: Any, attempts: List[TaskAttempt]) -> TaskResult:
+    """
+    Packs the raw return value of a task into a TaskResult if necessary, and adds the attempts to it.
+    """
+    if not isinstance(result, TaskResult):
+        result = TaskResult.success(data=result)
+    result.attempts = attempts
+    return result
+
+
+def _get_error_classifier(args: tuple) -> Optional[ErrorClassifier]:
+    """
+    Returns the error classifier of the integration instance the task is called on, if any.
+    """
+    return getattr(args[0], "is_retryable_error", None) if args else None
+
+
 def integration(name: str, short_name: str):
     """
     Class decorator to mark a class as representing a Neena integration.
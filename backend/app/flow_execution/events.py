@@ -0,0 +1,303 @@
+import asyncio
+import importlib
+import json
+import queue
+import select
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from app import crud, schemas
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import session_scope
+from app.schemas.flow_run_event import FlowRunEvent
+
+# Channel of the Postgres notifications carrying flow run events
+EVENT_CHANNEL = "flow_run_events"
+# Postgres rejects notification payloads of 8000 bytes or more
+MAX_NOTIFICATION_BYTES = 7999
+
+
+class SubscriptionLaggedError(Exception):
+    """
+    Raised when a subscriber fell so far behind that events had to be dropped. The events it still gets would not add
+    up to the state of the flow run, so it should reload the flow run and subscribe again.
+    """
+
+
+class Subscription:
+    """
+    The events of one flow run, as received by one subscriber on its event loop.
+
+    Events can be delivered from any thread: they are handed to the event loop of the subscriber, which reads them with
+    `get`. The queue is bounded, so a subscriber that does not keep up cannot hold on to an unbounded number of events.
+    """
+
+    def __init__(self, broker: "EventBroker", flow_run_id: UUID, max_size: int) -> None:
+        self.broker = broker
+        self.flow_run_id = flow_run_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[FlowRunEvent]" = asyncio.Queue(maxsize=max_size)
+        self.lagged = False
+
+    def deliver(self, event: FlowRunEvent) -> None:
+        """
+        Hands an event to the subscriber. Thread-safe.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The event loop of the subscriber was closed without unsubscribing
+            self.close()
+
+    def _put(self, event: FlowRunEvent) -> None:
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(f"Subscriber of flow run {self.flow_run_id} is lagging behind; dropping its events")
+            self.lagged = True
+
+    async def get(self) -> FlowRunEvent:
+        """
+        Waits for the next event.
+        """
+        if self.lagged:
+            raise SubscriptionLaggedError(f"Events of flow run {self.flow_run_id} were dropped")
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+    def mark_lagged(self) -> None:
+        """
+        Marks the subscriber as lagging behind, e.g. because events may have been missed. Thread-safe.
+        """
+        try:
+            self.loop.call_soon_threadsafe(setattr, self, "lagged", True)
+        except RuntimeError:
+            self.close()
+
+
+class EventBroker(ABC):
+    """
+    Publish/subscribe of the events of flow runs, which are streamed to clients instead of having them poll the flow
+    run. The ExecutionContext publishes the transitions of the flow run and its task runs as they happen.
+
+    Publishing must be cheap and must not fail the flow run: events of flow runs without subscribers are dropped, and
+    errors are logged instead of raised.
+    """
+
+    @abstractmethod
+    def publish(self, event: FlowRunEvent) -> None:
+        ...
+
+    @abstractmethod
+    async def subscribe(self, flow_run_id: UUID) -> Subscription:
+        """
+        Subscribes to the events of a flow run that are published from now on. Must be awaited on the event loop the
+        events are read on; the subscription must be closed when done.
+        """
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        ...
+
+
+class InProcessEventBroker(EventBroker):
+    """
+    Delivers events to the subscribers in the same process. Only reaches clients connected to the process that
+    executes the flow run, so it needs a single API process (one uvicorn worker) and FLOW_RUN_EXECUTOR "in_process".
+    """
+
+    def __init__(self, max_queue_size: int) -> None:
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[UUID, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: FlowRunEvent) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.flow_run, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(event)
+            except Exception as e:
+                logger.error(f"Delivering an event of flow run {event.flow_run} failed: {e}")
+
+    async def subscribe(self, flow_run_id: UUID) -> Subscription:
+        subscription = Subscription(self, flow_run_id, self.max_queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(flow_run_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.flow_run_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.flow_run_id]
+
+
+class PostgresEventBroker(InProcessEventBroker):
+    """
+    Delivers events to the subscribers in every process connected to the database, with Postgres LISTEN/NOTIFY. Flow
+    runs may be executed by any API process or Celery worker, and followed from any API process.
+
+    Publishing only queues the event, so it never waits for the database, not even on the event loop of the
+    AsyncExecutionContext. A publisher thread sends the queued events as notifications on EVENT_CHANNEL, all events
+    queued meanwhile with one statement. Events beyond `max_queue_size` waiting to be sent are dropped. Each process
+    following flow runs starts one listener thread on its first subscription and hands the notifications to its
+    subscribers like the in-process broker. Both threads have a connection of their own outside of the pool.
+    Notifications are capped in size, so events of task runs with a large result are sent without their preparation
+    and result, which the listener reloads from the database.
+
+    Notifications sent while the listener is reconnecting are lost, so its subscribers are marked as lagging and
+    reload the flow run.
+    """
+
+    # Time the first subscription waits for the listener, so it does not miss events published right after
+    LISTEN_TIMEOUT_SECONDS = 5.0
+    # Interval at which the listener checks for notifications, and waits before reconnecting after an error
+    POLL_SECONDS = 5.0
+
+    # Maximum number of events sent with one statement
+    PUBLISH_BATCH_SIZE = 100
+
+    def __init__(self, max_queue_size: int) -> None:
+        super().__init__(max_queue_size)
+        self._listener: Optional[threading.Thread] = None
+        self._listening = threading.Event()
+        self._publisher: Optional[threading.Thread] = None
+        self._outbox: "queue.Queue[FlowRunEvent]" = queue.Queue(maxsize=max_queue_size)
+        self._threads_lock = threading.Lock()
+
+    def publish(self, event: FlowRunEvent) -> None:
+        with self._threads_lock:
+            if self._publisher is None:
+                self._publisher = threading.Thread(target=self._send, name="flow-run-event-publisher", daemon=True)
+                self._publisher.start()
+        try:
+            self._outbox.put_nowait(event)
+        except queue.Full:
+            logger.warning(f"Too many flow run events waiting to be published; dropping an event of {event.flow_run}")
+
+    async def subscribe(self, flow_run_id: UUID) -> Subscription:
+        subscription = await super().subscribe(flow_run_id)
+        with self._threads_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="flow-run-events", daemon=True)
+                self._listener.start()
+        # Waited for on a thread, so the event loop keeps serving while the listener connects
+        if not self._listening.is_set() and not await asyncio.to_thread(
+            self._listening.wait, self.LISTEN_TIMEOUT_SECONDS
+        ):
+            logger.warning(f"Not listening to flow run events yet; subscriber of flow run {flow_run_id} may miss some")
+        return subscription
+
+    def _send(self) -> None:
+        connection = None
+        while True:
+            events = [self._outbox.get()]
+            while len(events) < self.PUBLISH_BATCH_SIZE:
+                try:
+                    events.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if connection is None or connection.closed:
+                    connection = psycopg2.connect(str(settings.SQLALCHEMY_DATABASE_URI))
+                    connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    # One transaction, so the notifications are delivered in order
+                    cursor.execute(
+                        "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                        (EVENT_CHANNEL, [_notification_payload(event) for event in events]),
+                    )
+            except Exception as e:
+                logger.error(f"Publishing {len(events)} flow run events failed: {e}")
+                if connection is not None:
+                    connection.close()
+                    connection = None
+
+    def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = psycopg2.connect(str(settings.SQLALCHEMY_DATABASE_URI))
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {EVENT_CHANNEL}")
+                self._listening.set()
+
+                while True:
+                    if select.select([connection], [], [], self.POLL_SECONDS) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._receive(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.error(f"Listening to flow run events failed, reconnecting: {e}")
+            finally:
+                if connection is not None:
+                    connection.close()
+
+            if self._listening.is_set():
+                self._listening.clear()
+                with self._lock:
+                    lagging = [subscription for group in self._subscriptions.values() for subscription in group]
+                for subscription in lagging:
+                    subscription.mark_lagged()
+            time.sleep(self.POLL_SECONDS)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            event = FlowRunEvent.model_validate(message["event"])
+            with self._lock:
+                if event.flow_run not in self._subscriptions:
+                    return
+            if message["truncated"] and event.task_run is not None:
+                event = self._reload_task_run(event)
+        except Exception as e:
+            logger.error(f"Receiving a flow run event failed: {e}")
+            return
+        super().publish(event)
+
+    def _reload_task_run(self, event: FlowRunEvent) -> FlowRunEvent:
+        with session_scope() as db:
+            task_run = schemas.TaskRun.from_orm(crud.task_run.get(db, event.task_run))
+        return event.model_copy(
+            update={
+                "task_prep_answer": task_run.task_prep_answer,
+                "result": task_run.result,
+                "attempts": task_run.attempts,
+            }
+        )
+
+
+def _notification_payload(event: FlowRunEvent) -> str:
+    payload = json.dumps({"event": event.model_dump(mode="json"), "truncated": False})
+    if len(payload.encode("utf-8")) > MAX_NOTIFICATION_BYTES:
+        truncated_event = event.model_copy(update={"task_prep_answer": None, "result": None, "attempts": None})
+        payload = json.dumps({"event": truncated_event.model_dump(mode="json"), "truncated": True})
+    return payload
+
+
+def _create_event_broker(path: str) -> EventBroker:
+    """
+    Instantiates the broker class at the given dotted path, e.g. "app.flow_execution.events.PostgresEventBroker".
+    """
+    module_path, _, class_name = path.rpartition(".")
+    broker_class = getattr(importlib.import_module(module_path), class_name)
+    return broker_class(max_queue_size=settings.FLOW_RUN_EVENT_QUEUE_SIZE)
+
+
+event_broker = _create_event_broker(settings.FLOW_RUN_EVENT_BROKER)
@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Dict
+
+import httpx
+
+from app.core.config import settings
+
+_clients: Dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def http_client_options() -> Dict[str, Any]:
+    """
+    Returns the timeouts, connection pool limits and protocol options shared by the HTTP clients of the integrations.
+    """
+    return {
+        "timeout": httpx.Timeout(settings.HTTP_READ_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "http2": settings.HTTP2_ENABLED,
+    }
+
+
+def get_http_client(base_url: str) -> httpx.Client:
+    """
+    Returns the process-wide HTTP client for the given base URL.
+
+    The client keeps its connections alive and is shared by all integration instances and users calling the same
+    API, so consecutive tasks reuse an open connection instead of paying a TCP and TLS handshake on every call.
+    Credentials must therefore be passed per request, not set on the client.
+    """
+    with _lock:
+        client = _clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.Client(base_url=base_url, **http_client_options())
+            _clients[base_url] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """
+    Closes all shared HTTP clients and their connections.
+    """
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Dict, Hashable, List, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.core.config import settings
+from app.core.logging import logger
+from app.flow_execution.integrations.base import BaseIntegration
+
+PoolKey = Tuple[str, UUID, Type[BaseIntegration], Optional[Hashable]]
+
+
+class IntegrationPool:
+    """
+    Process-wide pool of integration instances, shared by all flow runs of a user.
+
+    Creating an integration instance fetches the user's credentials from the key vault and sets up its HTTP client,
+    so instances are kept for `ttl_seconds` and reused by later flow runs, together with their connection pools.
+    After the TTL the instance is created again, which picks up rotated credentials. Updating or deleting an
+    integration credential invalidates the instances of that user right away (in this process; other processes
+    pick up the change when their TTL expires).
+
+    Integration rows, which only change when the integrations are synced, are cached as well.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._instances: Dict[PoolKey, Tuple[float, BaseIntegration]] = {}
+        self._integrations: Dict[UUID, schemas.Integration] = {}
+        self._loop_scopes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, weakref.ref]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get_integration(self, db: Session, integration_id: UUID) -> schemas.Integration:
+        """
+        Returns the integration with the given ID, reading it from the database only once.
+        """
+        with self._lock:
+            integration = self._integrations.get(integration_id)
+        if integration is None:
+            integration = schemas.Integration.from_orm(crud.integration.get(db, integration_id))
+            with self._lock:
+                self._integrations[integration_id] = integration
+        return integration
+
+    def get_instance(
+        self,
+        user: schemas.User,
+        integration_id: UUID,
+        integration_class: Type[BaseIntegration],
+        scope: Optional[Hashable] = None,
+    ) -> BaseIntegration:
+        """
+        Returns a pooled instance of the integration class for the user, creating it if there is none or it expired.
+
+        `scope` separates instances that cannot be shared, such as async integrations, whose HTTP clients are bound
+        to the event loop they were created on.
+        """
+        key = (user.email, integration_id, integration_class, scope)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._instances.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+        # Created outside of the lock, so a slow key vault call does not block other users
+        integration_instance = integration_class(user)
+        logger.info(f"Created {integration_class.__name__} instance for {user.email}")
+
+        with self._lock:
+            entry = self._instances.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            self._instances[key] = (now + self.ttl_seconds, integration_instance)
+        return integration_instance
+
+    def loop_scope(self, loop: asyncio.AbstractEventLoop) -> Hashable:
+        """
+        Returns the scope of the instances bound to the event loop: a weak reference to it, so unlike the id of the
+        loop it cannot be mistaken for a later loop. Once the loop is garbage collected, its instances are dropped
+        and closed.
+        """
+        with self._lock:
+            scope = self._loop_scopes.get(loop)
+            if scope is None:
+                scope = self._loop_scopes[loop] = weakref.ref(loop)
+                # Finalizers run wherever garbage is collected, possibly while this thread holds the lock
+                weakref.finalize(
+                    loop, lambda: threading.Thread(target=self._close_scope, args=(scope,), daemon=True).start()
+                )
+        return scope
+
+    def _close_scope(self, scope: Hashable) -> None:
+        with self._lock:
+            instances = [self._instances.pop(key)[1] for key in list(self._instances) if key[3] is scope]
+        if instances:
+            # The loop their HTTP clients were bound to is gone, so they are closed on a loop of their own
+            asyncio.run(_aclose(instances))
+
+    def invalidate(self, user_email: str, integration_id: Optional[UUID] = None) -> None:
+        """
+        Removes the pooled instances of a user, for one integration or for all of them.
+        """
+        with self._lock:
+            for key in list(self._instances):
+                if key[0] == user_email and (integration_id is None or key[1] == integration_id):
+                    del self._instances[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
+            self._integrations.clear()
+
+
+async def _aclose(instances: List[BaseIntegration]) -> None:
+    for instance in instances:
+        try:
+            await instance.aclose()
+        except Exception as e:
+            logger.warning(f"Closing {type(instance).__name__} instance failed: {e}")
+
+
+integration_pool = IntegrationPool(ttl_seconds=settings.INTEGRATION_POOL_TTL_SECONDS)
@@ -0,0 +1,2 @@
+from .trello import AsyncTrelloIntegration
+from .slack import AsyncSlackIntegration
@@ -0,0 +1,74 @@
+from typing import Awaitable, Callable
+
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from app import schemas
+from app.flow_execution.decorators import task
+from app.flow_execution.integrations.slack import SlackIntegration
+from app.flow_execution.rate_limit import rate_limiter
+from app.flow_execution.models.slack import (
+    BaseSlackResponse,
+    SlackChatMessageSend,
+    SlackChatMessageDelete,
+    SlackChatMessageSendResponse,
+    SlackChatMessageUpdate,
+)
+
+
+class AsyncSlackIntegration(SlackIntegration):
+    """
+    Asynchronous variant of the Slack integration, used by the AsyncExecutionContext.
+    Exposes the same tasks as SlackIntegration on top of the non-blocking AsyncWebClient.
+    """
+
+    def __init__(self, user: schemas.User) -> None:
+        super().__init__(user)
+        self.client = AsyncWebClient(token=self.token)
+
+    async def aclose(self) -> None:
+        """
+        Closes the underlying HTTP session, if the client opened one.
+        """
+        if self.client.session is not None:
+            await self.client.session.close()
+
+    async def _acall(self, api_method: Callable[..., Awaitable[AsyncSlackResponse]], **params) -> AsyncSlackResponse:
+        """
+        Calls a method of the Slack client, waiting for the rate limit of the user's token without blocking the loop.
+        Raises RateLimitedError if Slack answers with 429.
+        """
+        await self.rate_limit.aacquire()
+        try:
+            response = await api_method(**params)
+        except SlackApiError as e:
+            rate_limiter.observe(self.rate_limit, e.response.status_code, e.response.headers)
+            raise
+        rate_limiter.observe(self.rate_limit, response.status_code, response.headers)
+        return response
+
+    @task(task_name="Send Message")
+    async def send_message(self, message_to_send: SlackChatMessageSend) -> SlackChatMessageSendResponse:
+        """
+        Sends a message to a Slack channel.
+        """
+        params = self._model_to_query_params(message_to_send)
+        response = await self._acall(self.client.chat_postMessage, **params)
+        return SlackChatMessageSendResponse(**response.data)
+
+    @task(task_name="Update Message")
+    async def update_message(self, message_to_update: SlackChatMessageUpdate) -> BaseSlackResponse:
+        """
+        Updates a message in a Slack channel.
+        """
+        params = self._model_to_query_params(message_to_update)
+        return await self._acall(self.client.chat_update, **params)
+
+    @task(task_name="Delete Message")
+    async def delete_message(self, message_to_delete: SlackChatMessageDelete) -> BaseSlackResponse:
+        """
+        Deletes a message in a Slack channel.
+        """
+        params = self._model_to_query_params(message_to_delete)
+        return await self._acall(self.client.chat_delete, **params)
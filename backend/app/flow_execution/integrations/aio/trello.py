@@ -0,0 +1,183 @@
+from typing import Any, Dict, List
+
+import httpx
+
+from app import schemas
+from app.flow_execution.decorators import task
+from app.flow_execution.http_client import http_client_options
+from app.flow_execution.integrations.trello import TrelloIntegration
+from app.flow_execution.rate_limit import rate_limiter
+from app.flow_execution.models.trello import (
+    TrelloCard,
+    TrelloCardCreate,
+    TrelloCardGet,
+    TrelloCardUpdate,
+    TrelloCardDelete,
+    TrelloList,
+    TrelloListCreate,
+    TrelloListGet,
+    TrelloListUpdate,
+    TrelloCardsInListGet,
+    TrelloBoard,
+    TrelloBoardCreate,
+    TrelloBoardGet,
+    TrelloBoardUpdate,
+    TrelloBoardDelete,
+    TrelloListsInBoardGet,
+)
+
+
+class AsyncTrelloIntegration(TrelloIntegration):
+    """
+    Asynchronous variant of the Trello integration, used by the AsyncExecutionContext.
+    Exposes the same tasks as TrelloIntegration on top of a non-blocking httpx.AsyncClient.
+    """
+
+    def __init__(self, user: schemas.User) -> None:
+        super().__init__(user)
+        self.client = httpx.AsyncClient(base_url=self.base_url, headers=self.headers, **http_client_options())
+
+    async def aclose(self) -> None:
+        """
+        Closes the underlying HTTP client and its connections.
+        """
+        await self.client.aclose()
+
+    async def _request(self, method: str, path: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        Sends a request to the Trello API, waiting for the rate limit of the user's token without blocking the loop.
+        Raises RateLimitedError if Trello answers with 429, and httpx.HTTPStatusError on other errors.
+        """
+        await self.rate_limit.aacquire()
+        response = await self.client.request(method, path, params=params)
+        rate_limiter.observe(self.rate_limit, response.status_code, response.headers)
+        response.raise_for_status()
+        return response
+
+    async def check_connectivity(self) -> bool:
+        """
+        Checks if the Trello API is accessible.
+        """
+        try:
+            await self._request("GET", "members/me/boards", params=self.base_params)
+        except httpx.HTTPError:
+            return False
+        return True
+
+    @task("Get Boards")
+    async def get_boards(self) -> List[TrelloBoard]:
+        """
+        Fetches the boards for the user.
+        """
+        response = await self._request("GET", "members/me/boards", params=self.base_params)
+        return response.json()
+
+    @task("Create Board")
+    async def create_board(self, board: TrelloBoardCreate) -> TrelloBoard:
+        """
+        Creates a new board.
+        """
+        response = await self._request("POST", "boards", params=self._model_to_query_params(board))
+        return response.json()
+
+    @task("Get Board")
+    async def get_board(self, board_get: TrelloBoardGet) -> TrelloBoard:
+        """
+        Fetches details of a specific board.
+        """
+        response = await self._request("GET", f"boards/{board_get.id}", params=self.base_params)
+        return TrelloBoard(**response.json())
+
+    @task("Update Board")
+    async def update_board(self, board_update: TrelloBoardUpdate) -> TrelloBoard:
+        """
+        Updates an existing board.
+        """
+        response = await self._request(
+            "PUT", f"boards/{board_update.id}", params=self._model_to_query_params(board_update)
+        )
+        return TrelloBoard(**response.json())
+
+    @task("Delete Board")
+    async def delete_board(self, board_delete: TrelloBoardDelete) -> Any:
+        """
+        Deletes (or archives) an existing board.
+        """
+        response = await self._request("PUT", f"boards/{board_delete.id}", params=self.base_params)
+        return response.json()
+
+    @task("Create Card")
+    async def create_card(self, card_create: TrelloCardCreate) -> TrelloCard:
+        """
+        Creates a new card.
+        """
+        response = await self._request("POST", "cards", params=self._model_to_query_params(card_create))
+        return TrelloCard(**response.json())
+
+    @task("Get Card")
+    async def get_card(self, card_get: TrelloCardGet) -> TrelloCard:
+        """
+        Fetches details of a specific card.
+        """
+        response = await self._request("GET", f"cards/{card_get.id}", params=self.base_params)
+        return TrelloCard(**response.json())
+
+    @task("Update Card")
+    async def update_card(self, card_update: TrelloCardUpdate) -> TrelloCard:
+        """
+        Updates an existing card.
+        """
+        response = await self._request(
+            "PUT", f"cards/{card_update.id}", params=self._model_to_query_params(card_update)
+        )
+        return TrelloCard(**response.json())
+
+    @task("Delete Card")
+    async def delete_card(self, card_delete: TrelloCardDelete) -> Any:
+        """
+        Deletes an existing card.
+        """
+        response = await self._request("DELETE", f"cards/{card_delete.id}", params=self.base_params)
+        return response.json()
+
+    @task("Create List")
+    async def create_list(self, list_create: TrelloListCreate) -> TrelloList:
+        """
+        Creates a new list.
+        """
+        response = await self._request("POST", "lists", params=self._model_to_query_params(list_create))
+        return TrelloList(**response.json())
+
+    @task("Get List")
+    async def get_list(self, list_get: TrelloListGet) -> TrelloList:
+        """
+        Fetches details of a specific list.
+        """
+        response = await self._request("GET", f"lists/{list_get.id}", params=self.base_params)
+        return TrelloList(**response.json())
+
+    @task("Update List")
+    async def update_list(self, list_update: TrelloListUpdate) -> TrelloList:
+        """
+        Updates an existing list.
+        """
+        response = await self._request(
+            "PUT", f"lists/{list_update.id}", params=self._model_to_query_params(list_update)
+        )
+        return TrelloList(**response.json())
+
+    @task("Get Cards in List")
+    async def get_cards_in_list(self, cards_in_list_get: TrelloCardsInListGet) -> List[TrelloCard]:
+        """
+        Fetches all cards in a specific list.
+        """
+        response = await self._request("GET", f"lists/{cards_in_list_get.id}/cards", params=self.base_params)
+        return [TrelloCard(**card) for card in response.json()]
+
+    @task("Get Lists in Board")
+    async def get_lists_in_board(self, lists_in_board_get: TrelloListsInBoardGet) -> List[TrelloList]:
+        """
+        Fetches all lists in a specific board.
+        """
+        response = await self._request("GET", f"boards/{lists_in_board_get.id}/lists", params=self.base_params)
+        return [TrelloList(**list) for list in response.json()]
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 
 from app import schemas
 
@@ -23,4 +23,10 @@ class BaseIntegration(ABC):
         Fetch the credentials for the integration.
         """
         raise NotImplementedError
-    
+
+    def is_retryable_error(self, error: Exception) -> Optional[bool]:
+        """
+        Classifies an error raised by a task of the integration as retryable (True) or fatal (False).
+        Returns None to fall back to the default classification in `app.flow_execution.retry`.
+        """
+        return None
@@ -1,17 +1,19 @@
 import os
 import requests
 
-from typing import Any
+from typing import Any, Callable, Optional
 
 from app.flow_execution.decorators import integration, task
 from app.flow_execution.integrations.base import BaseIntegration
 from app.flow_execution.models.base import BaseIntegrationActionModel
 from app import schemas
 from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
 from slack_sdk.web.base_client import SlackResponse
 from app.core.secrets import secrets_service
 from app.core.config import settings
 from app.flow_execution.decorators import task
+from app.flow_execution.rate_limit import rate_limiter
 from app.flow_execution.models.slack import (
     BaseSlackResponse,
     SlackChatMessage,
@@ -36,6 +38,9 @@ class SlackIntegration(BaseIntegration):
         self.token = self._fetch_credentials()
         self.base_params = self._construct_base_params()
         self.client = WebClient(token=self.token)
+        self.rate_limit = rate_limiter.bucket(
+            self._short_name, self.token, settings.SLACK_RATE_LIMIT_PER_SECOND, settings.SLACK_RATE_LIMIT_BURST
+        )
 
     def _fetch_credentials(self) -> str:
         """
@@ -57,6 +62,29 @@ class SlackIntegration(BaseIntegration):
         model_dict = model.model_dump(by_alias=True, exclude_none=True)
         return {**self.base_params, **model_dict}
 
+    def _call(self, api_method: Callable[..., SlackResponse], **params) -> SlackResponse:
+        """
+        Calls a method of the Slack client, paced by the rate limit of the user's token.
+        Raises RateLimitedError if Slack answers with 429.
+        """
+        self.rate_limit.acquire()
+        try:
+            response = api_method(**params)
+        except SlackApiError as e:
+            rate_limiter.observe(self.rate_limit, e.response.status_code, e.response.headers)
+            raise
+        rate_limiter.observe(self.rate_limit, response.status_code, response.headers)
+        return response
+
+    def is_retryable_error(self, error: Exception) -> Optional[bool]:
+        """
+        Slack answers most errors with 200 and `"ok": false` (e.g. channel_not_found), which are not retried;
+        only rate limits and server errors are.
+        """
+        if isinstance(error, SlackApiError):
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return None
+
     def check_connectivity(self) -> bool:
         """
         Checks if the Slack API is accessible and the SDK is working.
@@ -70,7 +98,7 @@ class SlackIntegration(BaseIntegration):
         Sends a message to a Slack channel.
         """
         params = self._model_to_query_params(message_to_send)
-        response = self.client.chat_postMessage(**params)
+        response = self._call(self.client.chat_postMessage, **params)
         return SlackChatMessageSendResponse(**response.data)
     
     @task(task_name="Update Message")
@@ -79,7 +107,7 @@ class SlackIntegration(BaseIntegration):
         Updates a message in a Slack channel.
         """
         params = self._model_to_query_params(message_to_update)
-        return self.client.chat_update(**params)
+        return self._call(self.client.chat_update, **params)
 
     @task(task_name="Delete Message")
     def delete_message(self, message_to_delete: SlackChatMessageDelete) -> BaseSlackResponse:
@@ -87,4 +115,4 @@ class SlackIntegration(BaseIntegration):
         Deletes a message in a Slack channel.
         """
         params = self._model_to_query_params(message_to_delete)
-        return self.client.chat_delete(**params)
+        return self._call(self.client.chat_delete, **params)
@@ -1,5 +1,9 @@
 from typing import Any, Dict, List
-import requests
+
+import httpx
+
+from app.flow_execution.http_client import get_http_client
+from app.flow_execution.rate_limit import rate_limiter
 from app.flow_execution.integrations.base import BaseIntegration
 from app.flow_execution.decorators import integration, task
 
@@ -46,6 +50,10 @@ class TrelloIntegration(BaseIntegration):
         self.base_url = self._construct_base_url()
         self.headers = self._construct_headers()
         self.base_params = self._construct_base_params()
+        self.client = get_http_client(self.base_url)
+        self.rate_limit = rate_limiter.bucket(
+            self._short_name, self.token, settings.TRELLO_RATE_LIMIT_PER_SECOND, settings.TRELLO_RATE_LIMIT_BURST
+        )
 
     def _fetch_credentials(self) -> str:
         """
@@ -79,25 +87,33 @@ class TrelloIntegration(BaseIntegration):
         model_dict = model.model_dump(by_alias=True, exclude_none=True)
         return {**self.base_params, **model_dict}
 
+    def _request(self, method: str, path: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        Sends a request to the Trello API, paced by the rate limit of the user's token.
+        Raises RateLimitedError if Trello answers with 429, and httpx.HTTPStatusError on other errors.
+        """
+        self.rate_limit.acquire()
+        response = self.client.request(method, path, headers=self.headers, params=params)
+        rate_limiter.observe(self.rate_limit, response.status_code, response.headers)
+        response.raise_for_status()
+        return response
+
     def check_connectivity(self) -> bool:
         """
         Checks if the Trello API is accessible.
         """
-
-        url = f"{self.base_url}members/me/boards"
-
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
-        return response.status_code == 200
+        try:
+            self._request("GET", "members/me/boards", params=self.base_params)
+        except httpx.HTTPError:
+            return False
+        return True
 
     @task("Get Boards")
     def get_boards(self) -> List[TrelloBoard]:
         """
         Fetches the boards for the user.
         """
-
-        url = f"{self.base_url}members/me/boards"
-
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("GET", "members/me/boards", params=self.base_params)
         return response.json()
 
     @task("Create Board")
@@ -105,10 +121,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Creates a new board.
         """
-
-        url = f"{self.base_url}boards"
-
-        response = requests.post(url=url, headers=self.headers, params=self._model_to_query_params(board))
+        response = self._request("POST", "boards", params=self._model_to_query_params(board))
         return response.json()
 
     @task("Get Board")
@@ -116,8 +129,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Fetches details of a specific board.
         """
-        url = f"{self.base_url}boards/{board_get.id}"
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("GET", f"boards/{board_get.id}", params=self.base_params)
         return TrelloBoard(**response.json())
 
     @task("Update Board")
@@ -125,8 +137,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Updates an existing board.
         """
-        url = f"{self.base_url}boards/{board_update.id}"
-        response = requests.put(url=url, headers=self.headers, params=self._model_to_query_params(board_update))
+        response = self._request("PUT", f"boards/{board_update.id}", params=self._model_to_query_params(board_update))
         return TrelloBoard(**response.json())
 
     @task("Delete Board")
@@ -134,8 +145,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Deletes (or archives) an existing board.
         """
-        url = f"{self.base_url}boards/{board_delete.id}"
-        response = requests.put(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("PUT", f"boards/{board_delete.id}", params=self.base_params)
         return response.json()
 
     @task("Create Card")
@@ -143,8 +153,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Creates a new card.
         """
-        url = f"{self.base_url}cards"
-        response = requests.post(url=url, headers=self.headers, params=self._model_to_query_params(card_create))
+        response = self._request("POST", "cards", params=self._model_to_query_params(card_create))
         return TrelloCard(**response.json())
 
     @task("Get Card")
@@ -152,8 +161,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Fetches details of a specific card.
         """
-        url = f"{self.base_url}cards/{card_get.id}"
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("GET", f"cards/{card_get.id}", params=self.base_params)
         return TrelloCard(**response.json())
 
     @task("Update Card")
@@ -161,8 +169,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Updates an existing card.
         """
-        url = f"{self.base_url}cards/{card_update.id}"
-        response = requests.put(url=url, headers=self.headers, params=self._model_to_query_params(card_update))
+        response = self._request("PUT", f"cards/{card_update.id}", params=self._model_to_query_params(card_update))
         return TrelloCard(**response.json())
 
     @task("Delete Card")
@@ -170,8 +177,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Deletes an existing card.
         """
-        url = f"{self.base_url}cards/{card_delete.id}"
-        response = requests.delete(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("DELETE", f"cards/{card_delete.id}", params=self.base_params)
         return response.json()
 
     @task("Create List")
@@ -179,10 +185,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Creates a new list.
         """
-        url = f"{self.base_url}lists"
-        response = response = requests.post(
-            url=url, headers=self.headers, params=self._model_to_query_params(list_create)
-        )
+        response = self._request("POST", "lists", params=self._model_to_query_params(list_create))
         return TrelloList(**response.json())
 
     @task("Get List")
@@ -190,8 +193,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Fetches details of a specific list.
         """
-        url = f"{self.base_url}lists/{list_get.id}"
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("GET", f"lists/{list_get.id}", params=self.base_params)
         return TrelloList(**response.json())
 
     @task("Update List")
@@ -199,8 +201,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Updates an existing list.
         """
-        url = f"{self.base_url}lists/{list_update.id}"
-        response = requests.put(url=url, headers=self.headers, params=self._model_to_query_params(list_update))
+        response = self._request("PUT", f"lists/{list_update.id}", params=self._model_to_query_params(list_update))
         return TrelloList(**response.json())
 
     @task("Get Cards in List")
@@ -208,8 +209,7 @@ class TrelloIntegration(BaseIntegration):
         """
         Fetches all cards in a specific list.
         """
-        url = f"{self.base_url}lists/{cards_in_list_get.id}/cards"
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("GET", f"lists/{cards_in_list_get.id}/cards", params=self.base_params)
         return [TrelloCard(**card) for card in response.json()]
 
     # TODO: Fix typing on list return values
@@ -218,6 +218,5 @@ class TrelloIntegration(BaseIntegration):
         """
         Fetches all lists in a specific board.
         """
-        url = f"{self.base_url}boards/{lists_in_board_get.id}/lists"
-        response = requests.get(url=url, headers=self.headers, params=self.base_params)
+        response = self._request("GET", f"boards/{lists_in_board_get.id}/lists", params=self.base_params)
         return [TrelloList(**list) for list in response.json()]
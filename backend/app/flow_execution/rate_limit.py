@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# Header names are matched case-insensitively; Trello sends the "x-rate-limit-api-token-*" variants
+REMAINING_HEADERS = ("x-ratelimit-remaining", "x-rate-limit-remaining", "x-rate-limit-api-token-remaining")
+RESET_HEADERS = ("x-ratelimit-reset", "x-rate-limit-reset")
+INTERVAL_HEADERS = ("x-rate-limit-api-token-interval-ms",)
+
+
+class RateLimitedError(Exception):
+    """
+    Raised when a call to an integration is rate limited, either by the API or because the local budget
+    would not allow it within the maximum wait. `retry_after` is the number of seconds to wait before retrying.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket that paces calls to `rate` per second, with bursts of up to `capacity` calls.
+
+    Calls reserve a token and wait until it is available, so concurrent callers are spaced out instead of all
+    retrying at once. The bucket can be blocked until a point in time, when the API asks us to back off.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_wait_seconds: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait_seconds = max_wait_seconds
+        self.tokens = capacity
+        # Point in time up to which the tokens are accounted for; lies in the future while the bucket is blocked
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserves a token and returns the number of seconds to wait before using it.
+        Raises RateLimitedError, without reserving, if the wait would exceed `max_wait_seconds`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+            wait = (self.updated - now) + max(0.0, (1 - self.tokens) / self.rate)
+            if wait > self.max_wait_seconds:
+                raise RateLimitedError(f"Rate limit budget exhausted for {wait:.1f}s", retry_after=wait)
+            self.tokens -= 1
+            return wait
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def block(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for the given number of seconds. Tokens already reserved stay reserved and are
+        handed out after the block, at the normal rate.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = max(self.updated, now + seconds)
+
+    def sync(self, remaining: int) -> None:
+        """
+        Lowers the local budget to the number of calls the API reports as remaining, e.g. when other processes
+        use the same credential.
+        """
+        with self._lock:
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter:
+    """
+    Process-wide registry of token buckets, one per integration and credential.
+
+    All flow runs and integration instances calling an API with the same credential share one bucket, so their
+    calls are paced together and stay within the API's per-token limit. After each response, the bucket is adjusted
+    to the rate limit headers of the API: a 429 with Retry-After blocks the bucket, and X-RateLimit-Remaining
+    lowers the local budget to what the API has left.
+
+    Budgets are kept per process. With several worker processes, configure the rates as a share of the API quota.
+    """
+
+    def __init__(self, max_wait_seconds: float) -> None:
+        self.max_wait_seconds = max_wait_seconds
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, integration: str, credential: str, rate: float, capacity: float) -> TokenBucket:
+        """
+        Returns the bucket of the given integration and credential, creating it on first use.
+        The credential is only kept as a hash.
+        """
+        key = (integration, hashlib.sha256(credential.encode("utf-8")).hexdigest())
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(rate=rate, capacity=capacity, max_wait_seconds=self.max_wait_seconds)
+                self._buckets[key] = bucket
+            return bucket
+
+    def observe(self, bucket: TokenBucket, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Adjusts the bucket to a response of the API.
+        Raises RateLimitedError if the response is a 429, after blocking the bucket for the Retry-After period.
+        """
+        headers = {name.lower(): value for name, value in headers.items()}
+        retry_after = self.parse_retry_after(headers)
+        remaining = self._first_int(headers, REMAINING_HEADERS)
+
+        if status_code == 429:
+            retry_after = retry_after if retry_after is not None else self._reset_after(headers) or 1.0
+            logger.warning(f"Rate limited by the API, backing off for {retry_after:.1f}s")
+            bucket.block(retry_after)
+            raise RateLimitedError(f"Rate limited by the API, retry after {retry_after:.1f}s", retry_after=retry_after)
+
+        if remaining is not None:
+            if remaining <= 0:
+                bucket.block(self._reset_after(headers) or 1.0 / bucket.rate)
+            else:
+                bucket.sync(remaining)
+
+    def parse_retry_after(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Parses a Retry-After header, given either in seconds or as an HTTP date.
+        """
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(tz=timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _reset_after(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Returns the number of seconds until the rate limit window resets, from X-RateLimit-Reset (an epoch
+        timestamp or a number of seconds) or Trello's interval header.
+        """
+        reset = self._first_int(headers, RESET_HEADERS)
+        if reset is not None:
+            # Values beyond a day cannot be a delay and are taken as epoch timestamps
+            return max(0.0, reset - time.time()) if reset > 86400 else float(reset)
+        interval_ms = self._first_int(headers, INTERVAL_HEADERS)
+        return interval_ms / 1000 if interval_ms is not None else None
+
+    def _first_int(self, headers: Mapping[str, str], names: Tuple[str, ...]) -> Optional[int]:
+        for name in names:
+            if name in headers:
+                try:
+                    return int(float(headers[name]))
+                except ValueError:
+                    continue
+        return None
+
+
+rate_limiter = RateLimiter(max_wait_seconds=settings.RATE_LIMIT_MAX_WAIT_SECONDS)
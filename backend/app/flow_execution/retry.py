@@ -0,0 +1,121 @@
+import random
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.core.shared_models import TaskAttempt
+from app.flow_execution.rate_limit import RateLimitedError
+
+ErrorClassifier = Callable[[Exception], Optional[bool]]
+
+# Status codes of responses that may succeed when the request is sent again
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Errors in the task input or in the handling of a response, which another attempt does not fix
+FATAL_ERRORS = (ValidationError, ValueError, TypeError, KeyError, AttributeError, NotImplementedError)
+
+
+def is_retryable(error: Exception, classifier: Optional[ErrorClassifier] = None) -> bool:
+    """
+    Decides whether a failed attempt is worth retrying.
+
+    The integration's classifier is asked first; if it has no opinion (returns None), transient errors such as
+    rate limits, timeouts, connection errors and 5xx responses are retried, while other 4xx responses and
+    programming or validation errors are not. Errors that are not recognized are retried.
+    """
+    if classifier is not None:
+        verdict = classifier(error)
+        if verdict is not None:
+            return verdict
+
+    if isinstance(error, RateLimitedError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, FATAL_ERRORS):
+        return False
+    return True
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry policy of a task: up to `max_attempts` attempts, with exponential backoff and full jitter between them,
+    and no new attempt once `deadline_seconds` have passed since the first one.
+    """
+
+    max_attempts: int
+    base_delay_seconds: float
+    max_delay_seconds: float = settings.TASK_RETRY_MAX_DELAY_SECONDS
+    deadline_seconds: float = settings.TASK_RETRY_DEADLINE_SECONDS
+
+    @classmethod
+    def from_runtime_config(
+        cls, runtime_config: Dict[str, Any], max_attempts: int, delay_seconds: float
+    ) -> "RetryPolicy":
+        """
+        Creates the policy of a task from the defaults of its decorator, overridden by the runtime configuration.
+        """
+        policy = {
+            "max_attempts": runtime_config.get("max_attempts", max_attempts),
+            "base_delay_seconds": runtime_config.get("delay_seconds", delay_seconds),
+        }
+        if "max_delay_seconds" in runtime_config:
+            policy["max_delay_seconds"] = runtime_config["max_delay_seconds"]
+        if "deadline_seconds" in runtime_config:
+            policy["deadline_seconds"] = runtime_config["deadline_seconds"]
+        return cls(**policy)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the delay after the given (1-based) attempt: a random duration between zero and the exponential
+        backoff, so that tasks failing at the same time do not retry in lockstep.
+        """
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def record_success(self, attempts: List[TaskAttempt], start_time: datetime) -> List[TaskAttempt]:
+        """
+        Returns the attempts with a successful attempt started at `start_time` added.
+        """
+        return attempts + [
+            TaskAttempt(attempt=len(attempts) + 1, start_time=start_time, end_time=datetime.now(tz=timezone.utc))
+        ]
+
+    def record_failure(
+        self,
+        attempts: List[TaskAttempt],
+        start_time: datetime,
+        error: Exception,
+        classifier: Optional[ErrorClassifier] = None,
+    ) -> List[TaskAttempt]:
+        """
+        Returns the attempts with a failed attempt started at `start_time` added. If the task should be retried,
+        `backoff_seconds` of the new attempt holds the delay before the next attempt; otherwise it is None.
+        """
+        now = datetime.now(tz=timezone.utc)
+        attempt = len(attempts) + 1
+        retryable = is_retryable(error, classifier)
+
+        backoff_seconds = None
+        if retryable and attempt < self.max_attempts:
+            # Retrying earlier than the API asked for would only be throttled again
+            delay = error.retry_after if isinstance(error, RateLimitedError) else self.backoff(attempt)
+            first_start = attempts[0].start_time if attempts else start_time
+            if (now - first_start).total_seconds() + delay <= self.deadline_seconds:
+                backoff_seconds = delay
+
+        return attempts + [
+            TaskAttempt(
+                attempt=attempt,
+                start_time=start_time,
+                end_time=now,
+                error=str(error),
+                retryable=retryable,
+                backoff_seconds=backoff_seconds,
+            )
+        ]
@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, List, Set
+
+from app.schemas.flow import FlowBase
+from app.schemas.task_operation import TaskOperationBase
+
+
+class DAGScheduler:
+    """
+    Keeps track of which TaskOperations of a Flow are ready to run, based on the Dependency edges
+    between them. A TaskOperation is ready as soon as all of its upstream TaskOperations have completed.
+
+    The scheduler does not execute anything itself; the ExecutionContext asks it for ready task operations,
+    dispatches them, and reports back when they complete.
+    """
+
+    def __init__(self, flow: FlowBase) -> None:
+        self.task_operations: Dict[int, TaskOperationBase] = {task_op.index: task_op for task_op in flow.task_operations}
+        self.upstream: Dict[int, Set[int]] = {index: set() for index in self.task_operations}
+        self.downstream: Dict[int, Set[int]] = {index: set() for index in self.task_operations}
+
+        for dependency in flow.dependencies:
+            self.upstream[dependency.target_task_operation].add(dependency.source_task_operation)
+            self.downstream[dependency.source_task_operation].add(dependency.target_task_operation)
+
+        self.completed: Set[int] = set()
+        self.dispatched: Set[int] = set()
+
+    def ready(self) -> List[TaskOperationBase]:
+        """
+        Returns all task operations that have not been dispatched yet and whose upstream task operations
+        have all completed, in the sorted order of the flow.
+        """
+        ready = [
+            task_op
+            for index, task_op in self.task_operations.items()
+            if index not in self.dispatched and self.upstream[index] <= self.completed
+        ]
+        return sorted(ready, key=lambda task_op: (task_op.sorted_index is None, task_op.sorted_index, task_op.index))
+
+    def mark_dispatched(self, task_operation_index: int) -> None:
+        self.dispatched.add(task_operation_index)
+
+    def mark_completed(self, task_operation_index: int) -> None:
+        self.dispatched.add(task_operation_index)
+        self.completed.add(task_operation_index)
+
+    def ancestors(self, task_operation_index: int) -> Set[int]:
+        """
+        Returns the indices of all task operations that the given task operation transitively depends on.
+        """
+        ancestors: Set[int] = set()
+        stack = list(self.upstream[task_operation_index])
+        while stack:
+            index = stack.pop()
+            if index not in ancestors:
+                ancestors.add(index)
+                stack.extend(self.upstream[index])
+        return ancestors
+
+    def descendants(self, task_operation_indices: Iterable[int]) -> Set[int]:
+        """
+        Returns the indices of all task operations that transitively depend on any of the given task operations.
+        """
+        descendants: Set[int] = set()
+        stack = [adj for index in task_operation_indices for adj in self.downstream[index]]
+        while stack:
+            index = stack.pop()
+            if index not in descendants:
+                descendants.add(index)
+                stack.extend(self.downstream[index])
+        return descendants
+
+    def is_finished(self) -> bool:
+        return len(self.completed) == len(self.task_operations)
@@ -0,0 +1,145 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID, uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.logging import logger
+from app.schemas.flow_run import FlowRun
+from app.schemas.task_prep_answer import TaskPrepAnswerBase
+from app.schemas.task_prep_prompt import TaskPrepPromptBase
+from app.schemas.task_run import TaskRun
+
+# Columns of a task run that hold JSON and need dates and UUIDs converted first
+JSON_FIELDS = {"result", "attempts"}
+
+
+class ExecutionStateWriter:
+    """
+    Buffers the state changes of the task runs of a flow run and writes them in bulk.
+
+    The ExecutionContext records transitions (new task runs, closed task runs with their preparation, retries,
+    the end of the flow run) as they happen and calls `flush` once per batch: all buffered changes are written
+    with one statement per table, in a single transaction, instead of a commit and refresh for every row.
+    Ids are generated here, so nothing has to be read back. Every flush increments the version of the flow runs it
+    changed, which clients use to tell whether a flow run changed since they last read it.
+
+    Crash safety depends on when the ExecutionContext flushes: task runs are flushed as in progress before
+    their tasks start, and completed task runs before the task operations that depend on them are dispatched,
+    so a resumed flow run never skips work whose result was not stored. A failed flush rolls back and keeps
+    the buffer, so the changes can be written with the next flush.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self._task_run_inserts: Dict[UUID, Dict[str, Any]] = {}
+        self._task_run_updates: Dict[UUID, Dict[str, Any]] = {}
+        self._prompt_inserts: List[Dict[str, Any]] = []
+        self._answer_inserts: List[Dict[str, Any]] = []
+        self._flow_run: Optional[FlowRun] = None
+        self._flow_run_ids: Set[UUID] = set()
+
+    def add_task_run(self, task_run: TaskRun) -> None:
+        self._task_run_inserts[task_run.id] = {
+            "id": task_run.id,
+            "flow_run": task_run.flow_run,
+            "task_operation_index": task_run.task_operation_index,
+            "status": task_run.status,
+            "start_time": task_run.start_time,
+        }
+        self._flow_run_ids.add(task_run.flow_run)
+
+    def update_task_run(self, task_run: TaskRun, fields: Iterable[str]) -> None:
+        """
+        Records the given fields of the task run. Changes to a task run that was not written yet are merged into
+        its insert.
+        """
+        values = {}
+        for field in fields:
+            value = getattr(task_run, field)
+            values[field] = jsonable_encoder(value) if field in JSON_FIELDS else value
+
+        if task_run.id in self._task_run_inserts:
+            self._task_run_inserts[task_run.id].update(values)
+        else:
+            self._task_run_updates.setdefault(task_run.id, {"id": task_run.id}).update(values)
+        self._flow_run_ids.add(task_run.flow_run)
+
+    def add_task_preparation(
+        self,
+        task_run: TaskRun,
+        task_prep_prompt: Optional[TaskPrepPromptBase],
+        task_prep_answer: Optional[TaskPrepAnswerBase],
+    ) -> None:
+        """
+        Records the prompt and answer of the preparation of a task run. A task that failed during preparation
+        has no (complete) prompt and answer to persist.
+        """
+        if task_prep_prompt is None:
+            return
+
+        self._flow_run_ids.add(task_run.flow_run)
+        prompt_id = uuid4()
+        self._prompt_inserts.append({"id": prompt_id, "task_run": task_run.id, **task_prep_prompt.model_dump()})
+        if task_prep_answer is not None:
+            self._answer_inserts.append(
+                {
+                    "id": uuid4(),
+                    "task_prep_prompt": prompt_id,
+                    "task_run": task_run.id,
+                    "parameters": jsonable_encoder(task_prep_answer.parameters),
+                }
+            )
+
+    def close_flow_run(self, flow_run: FlowRun) -> None:
+        """
+        Records the status and end time of the flow run, written after its task runs.
+        """
+        self._flow_run = flow_run
+        self._flow_run_ids.add(flow_run.id)
+
+    def has_pending(self) -> bool:
+        return bool(
+            self._task_run_inserts
+            or self._task_run_updates
+            or self._prompt_inserts
+            or self._answer_inserts
+            or self._flow_run
+        )
+
+    def flush(self) -> None:
+        """
+        Writes all buffered changes in one transaction.
+        """
+        if not self.has_pending():
+            return
+
+        try:
+            crud.task_run.insert_many(self.db, rows=list(self._task_run_inserts.values()))
+            crud.task_run.update_many(self.db, rows=list(self._task_run_updates.values()))
+            crud.task_prep_prompt.insert_many(self.db, rows=self._prompt_inserts)
+            crud.task_prep_answer.insert_many(self.db, rows=self._answer_inserts)
+            if self._flow_run is not None:
+                self._flow_run.status, self._flow_run.end_time = crud.flow_run.set_status(
+                    self.db, id=self._flow_run.id, status=self._flow_run.status, end_time=self._flow_run.end_time
+                )
+            crud.flow_run.increment_version(self.db, ids=self._flow_run_ids)
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Writing the state of the flow run failed: {e}")
+            self.db.rollback()
+            raise
+
+        self.discard()
+
+    def discard(self) -> None:
+        """
+        Drops all buffered changes.
+        """
+        self._task_run_inserts.clear()
+        self._task_run_updates.clear()
+        self._prompt_inserts.clear()
+        self._answer_inserts.clear()
+        self._flow_run = None
+        self._flow_run_ids.clear()
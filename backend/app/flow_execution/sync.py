@@ -109,7 +109,7 @@ def generate_example_yaml_for_list(model: Type[List[BaseNeenaModel]]) -> str:
 
     return example_list_yaml
 
-def sync_integrations_and_tasks(directory: str, db: Session):
+def sync_integrations_and_tasks(directory: str, db: Session) -> bool:
     """
     Syncs integration tasks with the database.
 
@@ -118,7 +118,7 @@ def sync_integrations_and_tasks(directory: str, db: Session):
         db (Session): The database session.
 
     Returns:
-        None
+        bool: Whether the catalog of task definitions changed.
     """
     
     integrations = get_integration_tasks(directory)
@@ -177,4 +177,4 @@ def sync_integrations_and_tasks(directory: str, db: Session):
                 
                 task_definitions.append(task_definition) 
         
-    crud.task_definition.sync(task_definitions, db)
+    return crud.task_definition.sync(task_definitions, db)
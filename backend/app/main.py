@@ -1,4 +1,5 @@
 from app.core.logging import logger
+import threading
 import time
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
@@ -12,8 +13,10 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.core.services import services
 from app.db.init_db import init_db
-from app.db.session import SessionLocal
+from app.db.session import session_scope
+from app.flow_execution.http_client import close_http_clients
 from app.flow_execution.sync import sync_integrations_and_tasks
 
 app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json")
@@ -83,11 +86,30 @@ async def exception_logging_middleware(request: Request, call_next):
         return JSONResponse(status_code=500, content={"detail": "Internal Server Error"})
 
 
+def warm_up() -> None:
+    """
+    Syncs the catalog of integrations and task definitions, then builds the services and runs their warm-up hooks.
+    """
+    start = time.perf_counter()
+    try:
+        with session_scope() as db:
+            sync_integrations_and_tasks("app/flow_execution/integrations", db)
+            init_db(db)
+    except Exception as e:
+        logger.error(f"Syncing the catalog failed: {e}")
+    services.warm_up()
+    logger.info(f"Warmed up in {time.perf_counter() - start:.2f}s: {services.warm_up_status}")
+
+
 @app.on_event("startup")
 async def startup_event():
-    db = SessionLocal()
-    sync_integrations_and_tasks("app/flow_execution/integrations", db)
-    try:
-        init_db(db)
-    finally:
-        db.close()
+    if settings.WARM_UP_IN_BACKGROUND:
+        # Nothing holds up accepting traffic; requests arriving earlier build the services they need themselves
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    else:
+        warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    close_http_clients()
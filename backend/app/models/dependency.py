@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING, Optional
-from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint, ForeignKeyConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint, ForeignKeyConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import uuid4
@@ -33,4 +33,5 @@ class Dependency(Base):
         UniqueConstraint("source_task_operation", "target_task_operation", "flow", name="_source_target_flow_uc"),
         ForeignKeyConstraint(["source_task_operation", "flow"], ["task_operation.index", "task_operation.flow"]),
         ForeignKeyConstraint(["target_task_operation", "flow"], ["task_operation.index", "task_operation.flow"]),
+        Index("ix_dependency_flow", "flow"),
     )
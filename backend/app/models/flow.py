@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Boolean
+from sqlalchemy import DateTime, ForeignKey, Index, String, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -20,6 +20,11 @@ if TYPE_CHECKING:
 
 
 class Flow(Base):
+    # Keyset pagination of the flow listings, newest first, optionally per user
+    __table_args__ = (
+        Index("ix_flow_created_date_id", "created_date", "id"),
+        Index("ix_flow_created_by_email_created_date_id", "created_by_email", "created_date", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     name: Mapped[str] = mapped_column(String, index=True, default=uuid4, nullable=True)
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -20,6 +20,12 @@ if TYPE_CHECKING:
 class FlowRequest(Base):
     
     __tablename__ = 'flow_request'
+    # Keyset pagination of the flow request listings, newest first, optionally per user
+    __table_args__ = (
+        Index("ix_flow_request_created_date_id", "created_date", "id"),
+        Index("ix_flow_request_created_by_email_created_date_id", "created_by_email", "created_date", "id"),
+        Index("ix_flow_request_flow_created_date", "flow", "created_date"),
+    )
     
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     
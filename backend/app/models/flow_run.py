@@ -1,6 +1,6 @@
 from uuid import uuid4
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SqlAlchemyEnum
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey, Enum as SqlAlchemyEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -11,6 +11,13 @@ from app.core.shared_models import FlowStatus
 
 class FlowRun(Base):
     __tablename__ = "flow_run"
+    # Keyset pagination of the flow run listings, newest first, optionally per flow, status or user
+    __table_args__ = (
+        Index("ix_flow_run_flow_triggered_time_id", "flow", "triggered_time", "id"),
+        Index("ix_flow_run_triggered_time_id", "triggered_time", "id"),
+        Index("ix_flow_run_status_triggered_time_id", "status", "triggered_time", "id"),
+        Index("ix_flow_run_triggered_by_triggered_time_id", "triggered_by", "triggered_time", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     organization: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("organization.id"), nullable=True)
@@ -19,6 +26,10 @@ class FlowRun(Base):
     triggered_time = Column(DateTime(timezone=True), default=func.now(), nullable=True)
     end_time = Column(DateTime(timezone=True), nullable=True)
     triggered_by = Column(String, ForeignKey("user.email"), nullable=True)
+    claimed_by = Column(String, nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    # Incremented with every change of the flow run or its task runs; the ETag of its reads
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     task_runs = relationship("TaskRun", back_populates="belongs_to_flow_run", cascade="all, delete-orphan")
     belongs_to_flow = relationship("Flow", back_populates="flow_runs")
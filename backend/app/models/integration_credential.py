@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, DateTime, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, Index, String, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -16,7 +16,9 @@ class IntegrationCredential(Base):
     __tablename__ = 'integration_credential'
     __table_args__ = (
         UniqueConstraint('integration', 'modified_by_email', name='uix_integration_modified_by'),
-        UniqueConstraint('integration', 'created_by_email', name='uix_integration_created_by')   
+        UniqueConstraint('integration', 'created_by_email', name='uix_integration_created_by'),
+        # Lookups by (integration, modified_by_email) use the unique constraint; this serves the ones by user only
+        Index('ix_integration_credential_modified_by_email', 'modified_by_email'),
     )
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
@@ -9,7 +9,7 @@ import uuid
 from app.core.shared_models import TaskParameter
 from pydantic import BaseModel
 
-from sqlalchemy import TEXT, Column, DateTime, ForeignKey, String, TypeDecorator
+from sqlalchemy import TEXT, Column, DateTime, ForeignKey, Index, String, TypeDecorator, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -40,6 +40,11 @@ class TaskParameterType(TypeDecorator):
 
 class TaskDefinition(Base):
     __tablename__ = 'task_definition'
+    # Only task definitions that are not soft deleted are looked up by name or listed
+    __table_args__ = (
+        Index("ix_task_definition_active_task_name", "task_name", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_task_definition_active_created_date", "created_date", postgresql_where=text("deleted_at IS NULL")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)  # Ensure uuid is imported
     task_name = Column(String(64), nullable=False)  # Adjusted length according to Pydantic model constraints
@@ -9,12 +9,13 @@ from app.core.shared_models import Argument
 from attr import asdict
 from pydantic import BaseModel
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, TEXT, UniqueConstraint
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, TEXT, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.db.base_class import Base
+from app.models.types.text_pickle import TextPickleType
 from sqlalchemy.types import TypeDecorator, Text
 
 if TYPE_CHECKING:
@@ -35,6 +36,7 @@ class TaskOperation(Base):
     instruction: Mapped[Optional[str]] = mapped_column(String)
     index: Mapped[int] = mapped_column(Integer, nullable=False)
     sorted_index: Mapped[int] = mapped_column(Integer, nullable=True)
+    arguments: Mapped[Optional[list[dict]]] = mapped_column(TextPickleType, nullable=True)
 
     x: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     y: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -60,4 +62,5 @@ class TaskOperation(Base):
         back_populates="modified_task_operations", foreign_keys="TaskOperation.modified_by_email"
     )
 
-    __table_args__ = (UniqueConstraint("index", "flow", name="_index_flow_uc"),)
+    # The unique constraint leads with "index", so the task operations of a flow need an index of their own
+    __table_args__ = (UniqueConstraint("index", "flow", name="_index_flow_uc"), Index("ix_task_operation_flow", "flow"))
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import JSON, DateTime, ForeignKey, String
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import uuid4
@@ -19,6 +19,8 @@ class TaskPrepPrompt(Base):
 
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     messages: Mapped[JSON] = mapped_column(JSON, nullable=False)
+    prompt_hash: Mapped[str] = mapped_column(String, index=True, nullable=True)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=True)
     task_run: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("task_run.id"), nullable=False)
     created_date: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -3,7 +3,9 @@ import json
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import TEXT, Column, Integer, JSON, String, DateTime, ForeignKey, Enum as SqlAlchemyEnum, TypeDecorator
+from sqlalchemy import (
+    TEXT, Column, Index, Integer, JSON, String, DateTime, ForeignKey, Enum as SqlAlchemyEnum, TypeDecorator
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.mutable import Mutable
@@ -19,6 +21,13 @@ if TYPE_CHECKING:
 
 class TaskRun(Base):
     __tablename__ = "task_run"
+    # Keyset pagination of the task run listings, newest first, optionally per status; the task runs of a flow run
+    # are loaded for every flow run that is read or resumed
+    __table_args__ = (
+        Index("ix_task_run_start_time_id", "start_time", "id"),
+        Index("ix_task_run_status_start_time_id", "status", "start_time", "id"),
+        Index("ix_task_run_flow_run_start_time_id", "flow_run", "start_time", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     flow_run = Column(UUID(as_uuid=True), ForeignKey("flow_run.id"))
@@ -27,6 +36,7 @@ class TaskRun(Base):
     start_time = Column(DateTime(timezone=True), default=func.now())
     end_time = Column(DateTime(timezone=True))
     result = Column(JSON, nullable=True)
+    attempts = Column(JSON, nullable=True)
 
     belongs_to_flow_run = relationship("FlowRun", back_populates="task_runs")
 
@@ -17,10 +17,12 @@ from .task_definition import (
     TaskDefinitionInDBBase,
     TaskDefinitionUpdate,
     TaskDefinitionNamesList,
+    TaskDefinitionIndexSync,
+    TaskDefinitionIndexSyncStatus,
 )
 from .user import User, UserCreate, UserInDB, UserUpdate
-from .flow_run import FlowRunBase, FlowRunInDBBase, FlowRun, FlowRunCreate, FlowRunUpdate
-from .task_run import TaskRunBase, TaskRunInDBBase, TaskRun, TaskRunCreate, TaskRunUpdate
+from .flow_run import FlowRunBase, FlowRunInDBBase, FlowRun, FlowRunCreate, FlowRunSummary, FlowRunUpdate
+from .task_run import TaskRunBase, TaskRunInDBBase, TaskRun, TaskRunCreate, TaskRunSummary, TaskRunUpdate
 from .dependency import Dependency, DependencyBase, DependencyCreate, DependencyInDB, DependencyUpdate, DependencyList
 from .task_prep_prompt import (
     TaskPrepPrompt,
@@ -45,3 +47,5 @@ from .integration_credential import (
     IntegrationCredentialUpdate,
 )
 from .organization import Organization, OrganizationBase, OrganizationCreate, OrganizationInDB, OrganizationUpdate
+from .page import Page
+from .flow_run_event import FlowRunEvent, FlowRunEventType
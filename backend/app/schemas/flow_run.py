@@ -4,7 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel
 
 # Assuming FlowStatus is an enum or a valid Pydantic type, and TaskRunBase is defined elsewhere
-from app.schemas.task_run import TaskRunBase, TaskRunInDBBase
+from app.schemas.task_run import TaskRunBase, TaskRunInDBBase, TaskRunSummary
 from app.core.shared_models import FlowStatus
 
 
@@ -32,6 +32,9 @@ class FlowRunUpdate(FlowRunBase):
 class FlowRunInDBBase(FlowRunBase):
     id: UUID
     task_runs: Optional[List[TaskRunInDBBase]] = []
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    version: int = 0
 
     class Config:
         from_attributes = True
@@ -45,3 +48,18 @@ class FlowRun(FlowRunInDBBase):
 # Additional properties stored in DB
 class FlowRunInDB(FlowRunInDBBase):
     pass
+
+
+# Status and timings of a flow run and its task runs, without their results
+class FlowRunSummary(BaseModel):
+    id: UUID
+    flow: UUID
+    status: FlowStatus
+    triggered_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    triggered_by: Optional[str] = None
+    version: int
+    task_runs: List[TaskRunSummary] = []
+
+    class Config:
+        from_attributes = True
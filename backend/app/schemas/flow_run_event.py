@@ -0,0 +1,32 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.core.shared_models import TaskAttempt
+from app.schemas.task_prep_answer import TaskPrepAnswerBase
+
+
+class FlowRunEventType(str, Enum):
+    FLOW_RUN = "flow_run"
+    TASK_RUN = "task_run"
+
+
+class FlowRunEvent(BaseModel):
+    """
+    A state transition of a flow run or of one of its task runs, streamed to clients while the flow run executes.
+    Events of task runs carry the task run as far as it is known: the answer of its preparation and its result are
+    set once the task run is closed.
+    """
+
+    type: FlowRunEventType
+    flow_run: UUID
+    status: str
+    time: datetime
+    task_run: Optional[UUID] = None
+    task_operation_index: Optional[int] = None
+    task_prep_answer: Optional[TaskPrepAnswerBase] = None
+    result: Optional[dict | list] = None
+    attempts: Optional[List[TaskAttempt]] = None
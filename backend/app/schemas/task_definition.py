@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 from uuid import UUID
 from app.core.shared_models import TaskParameter
@@ -60,3 +61,23 @@ class TaskDefinitionNamesList(BaseModel):
 # TODO: Placeholder for data class to represent vectorized task definition in VDB
 class TaskDefinitionInVectorDBBase(TaskDefinitionBase):
     pass
+
+
+class TaskDefinitionIndexSyncStatus(str, Enum):
+    IDLE = "idle"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# Progress of the latest sync of the task definition embeddings with the catalog
+class TaskDefinitionIndexSync(BaseModel):
+    status: TaskDefinitionIndexSyncStatus = TaskDefinitionIndexSyncStatus.IDLE
+    total: int = 0
+    unchanged: int = 0
+    embedded: int = 0
+    to_embed: int = 0
+    deleted: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
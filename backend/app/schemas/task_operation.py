@@ -1,9 +1,11 @@
 from uuid import UUID
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 
+from app.core.shared_models import Argument
+
 
 # Shared properties
 class TaskOperationBase(BaseModel):
@@ -14,6 +16,12 @@ class TaskOperationBase(BaseModel):
     y: Optional[float] = None
     index: int
     sorted_index: Optional[int] = None
+    arguments: list[Argument] = []
+
+    @validator("arguments", pre=True)
+    def default_arguments(cls, arguments):
+        # Task operations stored without arguments have NULL in the database
+        return arguments or []
 
     class Config:
         from_attributes = True
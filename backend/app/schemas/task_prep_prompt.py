@@ -7,6 +7,8 @@ from pydantic import BaseModel
 # Shared properties
 class TaskPrepPromptBase(BaseModel):
     messages: list[dict[str, str]]
+    prompt_hash: Optional[str] = None
+    prompt_tokens: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -1,7 +1,7 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 from uuid import UUID
 from datetime import datetime
-from app.core.shared_models import TaskStatus
+from app.core.shared_models import TaskAttempt, TaskStatus
 
 from pydantic import BaseModel
 
@@ -18,6 +18,7 @@ class TaskRunBase(BaseModel):
     task_prep_answer: Optional[TaskPrepAnswerBase] = None
     result: Optional[dict | list] = None  # TODO: encapsulate this in a Result class
     end_time: Optional[datetime] = None
+    attempts: Optional[List[TaskAttempt]] = None
 
     class Config:
         from_orm = True
@@ -40,3 +41,17 @@ class TaskRunInDBBase(TaskRunBase):
 
 class TaskRun(TaskRunInDBBase):
     pass
+
+
+class TaskRunSummary(BaseModel):
+    """
+    The state of a task run without its result and preparation, for clients following the progress of a flow run.
+    """
+    id: UUID
+    task_operation_index: int
+    status: TaskStatus
+    start_time: datetime
+    end_time: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
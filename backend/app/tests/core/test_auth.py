@@ -0,0 +1,133 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials, SecurityScopes
+
+from app.core.auth import Auth0
+from app.core.config import settings
+from app.crud.crud_user import CRUDUser
+from app.models.user import User
+
+
+class FakeSession:
+    """
+    Session that only stands in for the commit of CRUDBase.update.
+    """
+
+    def add(self, obj: Any) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+    def refresh(self, obj: Any) -> None:
+        pass
+
+
+def _auth(monkeypatch: pytest.MonkeyPatch, expires_in: float = 60) -> Auth0:
+    """
+    Auth0 whose tokens are valid without verification; the tokens it decoded are in `decoded`.
+    """
+    auth = Auth0(domain="example.auth0.com", api_audience="https://api.example.com")
+    auth.decoded: List[str] = []  # type: ignore [attr-defined]
+
+    async def decode_token(token: str) -> Optional[Dict]:
+        auth.decoded.append(token)  # type: ignore [attr-defined]
+        return {"sub": f"auth0|{token}", "scope": "", "exp": time.time() + expires_in}
+
+    monkeypatch.setattr(auth, "_decode_token", decode_token)
+    return auth
+
+
+def _get_user(auth: Auth0, token: str) -> Any:
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(auth.get_user(SecurityScopes(), creds=creds, api_key=None))
+
+
+def test_get_user_verifies_token_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    auth = _auth(monkeypatch)
+
+    assert _get_user(auth, "token-1").id == "auth0|token-1"
+    assert _get_user(auth, "token-1").id == "auth0|token-1"
+    assert _get_user(auth, "token-2").id == "auth0|token-2"
+    assert auth.decoded == ["token-1", "token-2"]
+
+
+def test_get_user_verifies_expired_token_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    auth = _auth(monkeypatch, expires_in=-1)
+
+    _get_user(auth, "token-1")
+    _get_user(auth, "token-1")
+    assert auth.decoded == ["token-1", "token-1"]
+
+
+def test_verified_tokens_are_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "AUTH0_TOKEN_CACHE_MAX_SIZE", 2)
+    auth = _auth(monkeypatch)
+
+    for token in ("token-1", "token-2", "token-1", "token-3", "token-1", "token-2"):
+        _get_user(auth, token)
+    # token-2 was the least recently used when token-3 came in
+    assert auth.decoded == ["token-1", "token-2", "token-3", "token-2"]
+
+
+def test_unknown_kid_refreshes_signing_keys_rate_limited(monkeypatch: pytest.MonkeyPatch) -> None:
+    auth = Auth0(domain="example.auth0.com", api_audience="https://api.example.com")
+    auth._signing_keys = {"kid-1": {"kid": "kid-1", "kty": "RSA", "use": "sig", "n": "n", "e": "e"}}
+    auth._jwks_fetched_at = auth._jwks_attempted_at = time.monotonic()
+    refreshed: List[Optional[float]] = []
+
+    def refresh_jwks(fetched_at: Optional[float]) -> None:
+        refreshed.append(fetched_at)
+        auth._signing_keys["kid-2"] = {"kid": "kid-2", "kty": "RSA", "use": "sig", "n": "n", "e": "e"}
+
+    monkeypatch.setattr(auth, "refresh_jwks", refresh_jwks)
+
+    assert asyncio.run(auth._get_signing_key("kid-1"))["kid"] == "kid-1"
+    # The keys were just fetched, so a token with an unknown kid does not make Auth0 be asked again
+    assert asyncio.run(auth._get_signing_key("kid-2")) is None
+    assert refreshed == []
+
+    auth._jwks_attempted_at -= settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS
+    assert asyncio.run(auth._get_signing_key("kid-2"))["kid"] == "kid-2"
+    assert refreshed == [auth._jwks_fetched_at]
+
+
+def test_get_cached_by_email(monkeypatch: pytest.MonkeyPatch) -> None:
+    crud_user = CRUDUser(User, cache_max_size=10, cache_ttl_seconds=60)
+    user = User(id=uuid4(), email="user@example.com", auth0_id="auth0|user", full_name="User")
+    lookups: List[str] = []
+
+    def get_by_email(db: Any, *, email: str) -> Optional[User]:
+        lookups.append(email)
+        return user if email == user.email else None
+
+    monkeypatch.setattr(crud_user, "get_by_email", get_by_email)
+
+    cached_user = crud_user.get_cached_by_email(FakeSession(), email=user.email)
+    assert cached_user.id == user.id
+    assert crud_user.get_cached_by_email(FakeSession(), email=user.email) is cached_user
+    assert crud_user.get_cached_by_email(FakeSession(), email="nobody@example.com") is None
+    assert lookups == [user.email, "nobody@example.com"]
+
+    crud_user.update(FakeSession(), db_obj=user, obj_in={"full_name": "Renamed"})
+    assert crud_user.get_cached_by_email(FakeSession(), email=user.email).full_name == "Renamed"
+
+
+def test_cached_user_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    crud_user = CRUDUser(User, cache_max_size=10, cache_ttl_seconds=0)
+    user = User(id=uuid4(), email="user@example.com", auth0_id="auth0|user", full_name="User")
+    lookups: List[str] = []
+
+    def get_by_email(db: Any, *, email: str) -> Optional[User]:
+        lookups.append(email)
+        return user
+
+    monkeypatch.setattr(crud_user, "get_by_email", get_by_email)
+
+    crud_user.get_cached_by_email(FakeSession(), email=user.email)
+    crud_user.get_cached_by_email(FakeSession(), email=user.email)
+    assert lookups == [user.email, user.email]
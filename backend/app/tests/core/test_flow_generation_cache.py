@@ -0,0 +1,124 @@
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ContextManager, Dict, List
+from uuid import uuid4
+
+from app.core.flow_generation_cache import FlowGenerationCache
+from app.core.vector_index import LocalVectorIndex
+from app.schemas import FlowBase, TaskOperationBase
+
+
+class FakeEmbedder:
+    """
+    Embeds the requests it was given an embedding for, and counts the requests it embedded.
+    """
+
+    def __init__(self, embeddings: Dict[str, List[float]]) -> None:
+        self.embeddings = embeddings
+        self.embedded: List[str] = []
+
+    def get_embedding(self, text: str) -> List[float]:
+        self.embedded.append(text)
+        return self.embeddings[text]
+
+
+class CatalogSession:
+    """
+    Session answering the aggregate query of task_definition.get_catalog_version.
+    """
+
+    def __init__(self) -> None:
+        self.active_count = 3
+        self.last_modified = datetime(2024, 1, 1)
+
+    def query(self, *columns: Any) -> "CatalogSession":
+        return self
+
+    def one(self) -> tuple:
+        return self.active_count, self.last_modified
+
+
+EMBEDDINGS = {
+    "move the card to done": [1.0, 0.0, 0.0],
+    "move my card to done": [0.95, 0.31, 0.0],
+    "send a message to #general": [0.0, 0.0, 1.0],
+}
+
+
+def _cache(path: Path, catalog: CatalogSession, similarity_threshold: float = 0.9) -> FlowGenerationCache:
+    def session_factory() -> ContextManager[Any]:
+        return nullcontext(catalog)
+
+    return FlowGenerationCache(
+        index=LocalVectorIndex(str(path / "flow_cache")),
+        embedder=FakeEmbedder(EMBEDDINGS),
+        similarity_threshold=similarity_threshold,
+        max_size=10,
+        session_factory=session_factory,
+    )
+
+
+def _flow() -> FlowBase:
+    return FlowBase(
+        name="Move card",
+        task_operations=[TaskOperationBase(name="Update Card", task_definition=uuid4(), index=0)],
+        dependencies=[],
+    )
+
+
+def test_normalize() -> None:
+    assert FlowGenerationCache.normalize("  Move the card\n to   Done!") == "move the card to done"
+    assert FlowGenerationCache.normalize("Move the card to done...") == "move the card to done"
+
+
+def test_exact_hit_without_embedding(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, CatalogSession())
+    flow = _flow()
+    cache.put("Move the card to done.", flow)
+    cache.embedder.embedded.clear()
+
+    assert cache.get("move the card   to DONE") == flow
+    assert cache.embedder.embedded == []
+    assert (cache.exact_hits, cache.similar_hits, cache.misses) == (1, 0, 0)
+
+
+def test_similar_hit_above_threshold(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, CatalogSession(), similarity_threshold=0.9)
+    flow = _flow()
+    cache.put("move the card to done", flow)
+
+    assert cache.get("move my card to done") == flow
+    assert cache.get("send a message to #general") is None
+    assert (cache.exact_hits, cache.similar_hits, cache.misses) == (0, 1, 1)
+
+
+def test_miss_below_threshold(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, CatalogSession(), similarity_threshold=0.99)
+    cache.put("move the card to done", _flow())
+
+    assert cache.get("move my card to done") is None
+    assert cache.misses == 1
+
+
+def test_catalog_change_invalidates_entries(tmp_path: Path) -> None:
+    catalog = CatalogSession()
+    cache = _cache(tmp_path, catalog)
+    cache.put("move the card to done", _flow())
+
+    catalog.last_modified = datetime(2024, 1, 2)
+
+    assert cache.get("move the card to done") is None
+    assert len(cache.index) == 0
+
+
+def test_entries_are_shared_between_processes(tmp_path: Path) -> None:
+    # Caches sharing the path of their index, as in every process of the API
+    catalog = CatalogSession()
+    cache, other_cache = _cache(tmp_path, catalog), _cache(tmp_path, catalog)
+    assert other_cache.get("move the card to done") is None
+
+    flow = _flow()
+    cache.put("move the card to done", flow)
+
+    assert other_cache.get("move the card to done") == flow
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.core.vector_index import LocalVectorIndex
+
+
+def _index(tmp_path: Path) -> LocalVectorIndex:
+    return LocalVectorIndex(str(tmp_path / "index"))
+
+
+def test_upsert_and_overwrite(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    index.upsert([{"id": "a", "values": [1, 0], "metadata": {"name": "A"}}, {"id": "b", "values": [0, 1]}])
+    index.upsert([{"id": "a", "values": [0, 2], "metadata": {"name": "A2"}}])
+
+    assert index.ids() == ["a", "b"]
+    assert index.fetch_metadata(["a", "b", "c"]) == {"a": {"name": "A2"}, "b": {}}
+    # The overwritten vector is normalized like the others
+    assert index.query([0, 1], top_k=2)[0]["score"] == pytest.approx(1.0)
+
+
+def test_delete(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    index.upsert([{"id": id, "values": [1, i]} for i, id in enumerate("abc")])
+
+    index.delete(["b", "unknown"])
+
+    assert index.ids() == ["a", "c"]
+    assert len(index) == 2
+    assert {match["id"] for match in index.query([1, 0], top_k=5)} == {"a", "c"}
+
+
+def test_dimension_mismatch(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    index.upsert([{"id": "a", "values": [1, 0]}])
+
+    with pytest.raises(ValueError, match="dimension 3"):
+        index.upsert([{"id": "b", "values": [1, 0, 0]}])
+    assert index.ids() == ["a"]
+
+
+def test_query_returns_top_k_most_similar_first(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    angles = {"a": 0.0, "b": 0.3, "c": 0.6, "d": 0.9, "e": 1.2}
+    index.upsert([{"id": id, "values": [np.cos(angle), np.sin(angle)]} for id, angle in angles.items()])
+
+    matches = index.query([np.cos(1.0), np.sin(1.0)], top_k=3)
+
+    assert [match["id"] for match in matches] == ["d", "e", "c"]
+    assert matches[0]["score"] == pytest.approx(np.cos(0.1))
+    assert len(index.query([1, 0], top_k=10)) == 5
+    assert _index(tmp_path / "empty").query([1, 0], top_k=3) == []
+
+
+def test_reload_from_persisted_files(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    index.upsert([{"id": "a", "values": [1, 0], "metadata": {"name": "A"}}, {"id": "b", "values": [0, 1]}])
+
+    reloaded = _index(tmp_path)
+
+    assert reloaded.ids() == ["a", "b"]
+    assert reloaded.fetch_metadata(["a"]) == {"a": {"name": "A"}}
+    assert reloaded.query([1, 0], top_k=1)[0]["id"] == "a"
+
+
+def test_reload_writes_of_another_instance(tmp_path: Path) -> None:
+    index, other_index = _index(tmp_path), _index(tmp_path)
+
+    other_index.upsert([{"id": "a", "values": [1, 0]}])
+    assert index.ids() == ["a"]
+
+    other_index.delete(["a"])
+    assert len(index) == 0
+
+
+def test_start_empty_if_files_do_not_match(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    index.upsert([{"id": "a", "values": [1, 0]}])
+    (tmp_path / "index.json").write_text('{"ids": ["a", "b"], "metadata": [{}, {}]}')
+
+    assert len(_index(tmp_path)) == 0
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.core.config import settings
+from app.core.shared_models import TaskStatus
+from app.schemas.dependency import DependencyBase
+from app.schemas.flow import FlowCreate
+from app.schemas.task_operation import TaskOperationBase
+from app.tests.utils.flow import create_random_flow_run
+from app.tests.utils.utils import random_lower_string
+
+
+def test_create_flow_with_task_operations_and_dependencies(db: Session) -> None:
+    user = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
+    task_definition = crud.task_definition.get_multi(db, limit=1)[0]
+    flow_in = FlowCreate(
+        name=random_lower_string(),
+        task_operations=[
+            TaskOperationBase(name=random_lower_string(), task_definition=task_definition.id, index=index)
+            for index in range(20)
+        ],
+        dependencies=[
+            DependencyBase(source_task_operation=index, target_task_operation=index + 1) for index in range(19)
+        ],
+    )
+    flow = crud.flow.create(db=db, flow=flow_in, current_user=user)
+
+    assert flow.id
+    assert sorted(task_op.index for task_op in flow.task_operations) == list(range(20))
+    assert all(task_op.created_by_email == user.email for task_op in flow.task_operations)
+    assert len(flow.dependencies) == 19
+
+
+def test_read_flows_and_flow_runs_with_a_constant_number_of_queries(db: Session) -> None:
+    for _ in range(3):
+        flow_run = create_random_flow_run(db)
+        crud.task_run.insert_many(
+            db,
+            rows=[
+                {
+                    "flow_run": flow_run.id,
+                    "task_operation_index": 0,
+                    "status": TaskStatus.COMPLETED,
+                    "start_time": datetime.now(),
+                }
+            ],
+        )
+    db.commit()
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    db.expire_all()
+    event.listen(db.get_bind(), "before_cursor_execute", count_statement)
+    try:
+        flows = [schemas.Flow.from_orm(flow) for flow in crud.flow.get_multi(db, limit=3)]
+        flow_queries = len(statements)
+        flow_runs = [schemas.FlowRun.from_orm(flow_run) for flow_run in crud.flow_run.get_multi(db, limit=3)]
+        flow_run_queries = len(statements) - flow_queries
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", count_statement)
+
+    assert len(flows) == 3 and len(flow_runs) == 3
+    # Flows, their task operations and their dependencies
+    assert flow_queries == 3
+    # Flow runs, their task runs, and the task preparation prompts and answers of those
+    assert flow_run_queries == 4
@@ -0,0 +1,147 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.core.shared_models import FlowStatus, TaskStatus
+from app.tests.utils.flow import create_random_flow, create_random_flow_run
+
+
+def test_claim_pending_flow_run(db: Session) -> None:
+    flow_run = create_random_flow_run(db)
+    claimed = crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-1", claim_timeout_seconds=3600)
+    assert claimed
+    assert claimed.status == FlowStatus.IN_PROGRESS
+    assert claimed.claimed_by == "worker-1"
+    assert claimed.claimed_at
+
+
+def test_claim_flow_run_only_once(db: Session) -> None:
+    flow_run = create_random_flow_run(db)
+    assert crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-1", claim_timeout_seconds=3600)
+    assert crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-2", claim_timeout_seconds=3600) is None
+
+
+def test_reclaim_flow_run_with_expired_claim(db: Session) -> None:
+    flow_run = create_random_flow_run(db)
+    assert crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-1", claim_timeout_seconds=3600)
+    claimed = crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-2", claim_timeout_seconds=-1)
+    assert claimed
+    assert claimed.claimed_by == "worker-2"
+
+
+def test_claim_finished_flow_run(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.COMPLETED)
+    assert crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-1", claim_timeout_seconds=-1) is None
+
+
+def test_reopen_failed_flow_run(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.FAILED)
+    reopened = crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.PENDING, claim_timeout_seconds=3600)
+    assert reopened.status == FlowStatus.PENDING
+    assert reopened.end_time is None
+    assert crud.flow_run.claim(db, id=flow_run.id, worker_id="worker-1", claim_timeout_seconds=3600)
+
+
+def test_reopen_flow_run_only_once(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.CANCELLED)
+    assert crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.PENDING, claim_timeout_seconds=3600)
+    assert crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.PENDING, claim_timeout_seconds=3600) is None
+
+
+def test_reopen_completed_flow_run(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.COMPLETED)
+    assert crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.PENDING, claim_timeout_seconds=3600) is None
+
+
+def test_take_claim_of_flow_run_in_process(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.IN_PROGRESS)
+    assert crud.flow_run.take_claim(db, id=flow_run.id, worker_id="host:1")
+    assert not crud.flow_run.take_claim(db, id=flow_run.id, worker_id="host:2")
+    db.refresh(flow_run)
+    assert flow_run.claimed_by == "host:1"
+    assert flow_run.claimed_at
+
+
+def test_reopen_orphaned_flow_run_in_progress(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.IN_PROGRESS)
+    assert crud.flow_run.take_claim(db, id=flow_run.id, worker_id="host:1")
+    assert crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.IN_PROGRESS, claim_timeout_seconds=3600) is None
+
+    reopened = crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.IN_PROGRESS, claim_timeout_seconds=-1)
+    assert reopened.status == FlowStatus.IN_PROGRESS
+    assert reopened.claimed_by is None
+    assert reopened.claimed_at
+    assert crud.flow_run.take_claim(db, id=flow_run.id, worker_id="host:2")
+
+
+def test_reopen_unclaimed_flow_run_in_progress(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.IN_PROGRESS)
+    assert crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.PENDING, claim_timeout_seconds=3600) is None
+    assert crud.flow_run.reopen(db, id=flow_run.id, status=FlowStatus.PENDING, claim_timeout_seconds=-1)
+
+
+def test_write_task_runs_in_bulk(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.IN_PROGRESS)
+    task_run_ids = crud.task_run.insert_many(
+        db,
+        rows=[
+            {
+                "flow_run": flow_run.id,
+                "task_operation_index": index,
+                "status": TaskStatus.IN_PROGRESS,
+                "start_time": datetime.now(),
+            }
+            for index in range(3)
+        ],
+    )
+    crud.task_run.update_many(db, rows=[{"id": id, "status": TaskStatus.COMPLETED} for id in task_run_ids])
+    status, end_time = crud.flow_run.set_status(
+        db, id=flow_run.id, status=FlowStatus.COMPLETED, end_time=datetime.now()
+    )
+    db.commit()
+
+    assert len(task_run_ids) == 3
+    assert status == FlowStatus.COMPLETED
+    assert end_time
+    assert all(crud.task_run.get(db, id).status == TaskStatus.COMPLETED for id in task_run_ids)
+
+
+def test_page_through_flow_runs_of_a_flow(db: Session) -> None:
+    flow = create_random_flow(db)
+    for _ in range(5):
+        flow_run = models.FlowRun(flow=flow.id, status=FlowStatus.COMPLETED, triggered_time=datetime.now())
+        crud.flow_run.create(db=db, obj_in=flow_run)
+
+    first_page, cursor = crud.flow_run.get_page(db, flow_id=flow.id, limit=3)
+    second_page, last_cursor = crud.flow_run.get_page(db, flow_id=flow.id, cursor=cursor, limit=3)
+
+    assert len(first_page) == 3 and len(second_page) == 2
+    assert last_cursor is None
+    assert not {flow_run.id for flow_run in first_page} & {flow_run.id for flow_run in second_page}
+    assert first_page[-1].triggered_time >= second_page[0].triggered_time
+
+
+def test_flow_run_version_and_summary(db: Session) -> None:
+    flow_run = create_random_flow_run(db, status=FlowStatus.IN_PROGRESS)
+    assert crud.flow_run.get_version(db, flow_run.id) == 0
+
+    crud.task_run.insert_many(
+        db,
+        rows=[
+            {
+                "flow_run": flow_run.id,
+                "task_operation_index": 0,
+                "status": TaskStatus.COMPLETED,
+                "start_time": datetime.now(),
+                "result": {"data": "large"},
+            }
+        ],
+    )
+    crud.flow_run.increment_version(db, ids=[flow_run.id])
+    db.commit()
+
+    summary = schemas.FlowRunSummary.from_orm(crud.flow_run.get_summary(db, flow_run.id))
+    assert summary.version == 1
+    assert [task_run.status for task_run in summary.task_runs] == [TaskStatus.COMPLETED]
+    assert "result" not in summary.task_runs[0].model_dump()
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Any, List
+from uuid import uuid4
+
+from app.core.shared_models import Argument, FlowStatus, TaskParameter, TaskStatus
+from app.flow_execution.binding import parameter_binder, parse_task_reference
+from app.schemas.flow import FlowBase
+from app.schemas.flow_run import FlowRunBase
+from app.schemas.task_definition import TaskDefinition
+from app.schemas.task_operation import TaskOperationBase
+from app.schemas.task_run import TaskRunBase
+
+
+def _flow(arguments: List[Argument]) -> FlowBase:
+    return FlowBase(
+        name="Move card",
+        task_operations=[
+            TaskOperationBase(name="Get Boards", task_definition=uuid4(), index=0),
+            TaskOperationBase(name="Update Card", task_definition=uuid4(), index=1, arguments=arguments),
+        ],
+        dependencies=[],
+    )
+
+
+def _flow_run(result: Any, status: TaskStatus = TaskStatus.COMPLETED) -> FlowRunBase:
+    flow_run_id = uuid4()
+    return FlowRunBase(
+        flow=uuid4(),
+        status=FlowStatus.IN_PROGRESS,
+        task_runs=[
+            TaskRunBase(
+                flow_run=flow_run_id, task_operation_index=0, status=status, start_time=datetime.now(), result=result
+            )
+        ],
+    )
+
+
+def test_parse_task_reference() -> None:
+    assert parse_task_reference("get_board.output") == ("get_board", [])
+    assert parse_task_reference("Get Boards.output[0].id") == ("Get Boards", [0, "id"])
+    assert parse_task_reference("Get Boards.output.cards[2].name") == ("Get Boards", ["cards", 2, "name"])
+    assert parse_task_reference("Get Boards") is None
+    assert parse_task_reference("Get Boards.result") is None
+
+
+def test_bind_task_output_of_operation_named_after_task_definition() -> None:
+    argument = Argument(name="board_id", data_type="str", value="Get Boards.output[1].id", source="@tasks()")
+    flow = _flow([argument])
+
+    parameters = parameter_binder.bind(flow, _flow_run([{"id": "a"}, {"id": "b"}]), flow.task_operations[1])
+
+    assert [(parameter.name, parameter.value) for parameter in parameters] == [("board_id", "b")]
+
+
+def test_leave_output_of_unfinished_operation_unbound() -> None:
+    argument = Argument(name="board_id", data_type="str", value="Get Boards.output[0].id", source="@tasks()")
+    flow = _flow([argument])
+
+    flow_run = _flow_run(None, status=TaskStatus.IN_PROGRESS)
+
+    assert parameter_binder.bind(flow, flow_run, flow.task_operations[1]) == []
+
+
+def test_bind_literals() -> None:
+    arguments = [
+        Argument(name="name", data_type="str", value="Done", source="@context()"),
+        Argument(name="labels", data_type="list[str]", value='["urgent"]', source="@context()"),
+        Argument(name="members", data_type="list[str]", value="not json", source="@context()"),
+    ]
+    flow = _flow(arguments)
+
+    parameters = parameter_binder.bind(flow, _flow_run([]), flow.task_operations[1])
+
+    assert [(parameter.name, parameter.value) for parameter in parameters] == [("name", "Done"), ("labels", ["urgent"])]
+
+
+def test_bind_metadata() -> None:
+    arguments = [
+        Argument(name="board_id", data_type="str", value="board_id", source="@metadata()"),
+        Argument(name="list_id", data_type="str", value="list_id", source="@metadata()"),
+        Argument(name="card_id", data_type="str", value="card", source="@metadata()"),
+    ]
+    flow = _flow(arguments)
+    request_metadata = [
+        {"board_id": "board-1"},
+        # Name/value pairs are matched on their name only, not on any of their other fields
+        {"name": "other", "value": "card-1", "description": "card"},
+        {"name": "list_id", "value": "list-1"},
+    ]
+
+    parameters = parameter_binder.bind(flow, _flow_run([]), flow.task_operations[1], request_metadata)
+
+    assert [(parameter.name, parameter.value) for parameter in parameters] == [
+        ("board_id", "board-1"),
+        ("list_id", "list-1"),
+    ]
+
+
+def test_unresolved_parameters() -> None:
+    task_definition = TaskDefinition(
+        id=uuid4(),
+        task_name="Update Card",
+        integration=uuid4(),
+        parameters=[
+            TaskParameter(name="card_id", data_type="str", position=0, doc_string="", optional=False),
+            TaskParameter(name="name", data_type="str", position=1, doc_string="", optional=False),
+            TaskParameter(name="description", data_type="str", position=2, doc_string="", optional=True),
+        ],
+        input_type="UpdateCardInput",
+        input_yml="",
+        description="Updates a card",
+        python_method_name="update_card",
+        output_type="Card",
+        output_yml="",
+        created_date=datetime.now(),
+        modified_date=datetime.now(),
+    )
+    flow = _flow([Argument(name="card_id", data_type="str", value="card-1", source="@context()")])
+    parameters = parameter_binder.bind(flow, _flow_run([]), flow.task_operations[1])
+
+    assert parameter_binder.unresolved_parameters(task_definition, parameters) == ["name"]
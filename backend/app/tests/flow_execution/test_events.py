@@ -0,0 +1,38 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.flow_execution.events import PostgresEventBroker
+from app.schemas.flow_run_event import FlowRunEvent, FlowRunEventType
+
+
+def _event(flow_run_id, result=None) -> FlowRunEvent:
+    return FlowRunEvent(
+        type=FlowRunEventType.TASK_RUN,
+        flow_run=flow_run_id,
+        status="in_progress",
+        time=datetime.now(tz=timezone.utc),
+        task_run=uuid4(),
+        result=result,
+    )
+
+
+def test_postgres_event_broker_delivers_events_between_brokers() -> None:
+    # Brokers of two processes: one publishes, the other has the subscriber
+    publisher = PostgresEventBroker(max_queue_size=10)
+    broker = PostgresEventBroker(max_queue_size=10)
+    flow_run_id = uuid4()
+
+    async def follow() -> FlowRunEvent:
+        subscription = await broker.subscribe(flow_run_id)
+        try:
+            publisher.publish(_event(uuid4()))
+            publisher.publish(_event(flow_run_id, result={"id": "card-1"}))
+            return await asyncio.wait_for(subscription.get(), timeout=10)
+        finally:
+            subscription.close()
+
+    event = asyncio.run(follow())
+
+    assert event.flow_run == flow_run_id
+    assert event.result == {"id": "card-1"}
@@ -0,0 +1,42 @@
+import asyncio
+import gc
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.flow_execution.integration_pool import IntegrationPool
+
+
+class FakeAsyncIntegration:
+    closed = []
+
+    def __init__(self, user: SimpleNamespace) -> None:
+        self.user = user
+
+    async def aclose(self) -> None:
+        FakeAsyncIntegration.closed.append(self)
+
+
+def test_instances_of_a_loop_are_closed_once_it_is_collected() -> None:
+    pool = IntegrationPool(ttl_seconds=60)
+    user, integration_id = SimpleNamespace(email="user@example.com"), uuid4()
+    loop, other_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+
+    instance = pool.get_instance(user, integration_id, FakeAsyncIntegration, scope=pool.loop_scope(loop))
+    assert pool.get_instance(user, integration_id, FakeAsyncIntegration, scope=pool.loop_scope(loop)) is instance
+    other_instance = pool.get_instance(user, integration_id, FakeAsyncIntegration, scope=pool.loop_scope(other_loop))
+    assert other_instance is not instance
+
+    loop.close()
+    del loop
+    gc.collect()
+    for _ in range(50):
+        if FakeAsyncIntegration.closed:
+            break
+        time.sleep(0.1)
+
+    assert FakeAsyncIntegration.closed == [instance]
+    assert pool.get_instance(user, integration_id, FakeAsyncIntegration, scope=pool.loop_scope(other_loop)) is (
+        other_instance
+    )
+    other_loop.close()
@@ -0,0 +1,124 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import httpx
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from app.core.shared_models import TaskAttempt
+from app.flow_execution.rate_limit import RateLimitedError
+from app.flow_execution.retry import RetryPolicy, is_retryable
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.trello.com/1/boards")
+    return httpx.HTTPStatusError("Error", request=request, response=httpx.Response(status_code, request=request))
+
+
+def _validation_error() -> ValidationError:
+    class Card(BaseModel):
+        id: str
+
+    with pytest.raises(ValidationError) as exc_info:
+        Card()
+    return exc_info.value
+
+
+def _fail(
+    policy: RetryPolicy, error: Exception, attempts: int, first_start: Optional[datetime] = None
+) -> List[TaskAttempt]:
+    """
+    Records `attempts` failed attempts with the error, the first one started at `first_start`, and returns them.
+    """
+    recorded = []
+    for _ in range(attempts):
+        recorded = policy.record_failure(recorded, first_start or datetime.now(tz=timezone.utc), error)
+    return recorded
+
+
+def test_backoff_is_jittered_below_exponential_ceiling() -> None:
+    random.seed(0)
+    policy = RetryPolicy(max_attempts=10, base_delay_seconds=1, max_delay_seconds=5, deadline_seconds=60)
+
+    for attempt, ceiling in [(1, 1), (2, 2), (3, 4), (4, 5), (8, 5)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Full jitter: spread over the whole range rather than close to the ceiling
+        assert min(delays) < ceiling * 0.1 and max(delays) > ceiling * 0.9
+
+
+def test_max_attempts_counts_the_first_attempt() -> None:
+    policy = RetryPolicy(max_attempts=3, base_delay_seconds=0, deadline_seconds=60)
+
+    attempts = _fail(policy, TimeoutError("Timed out"), attempts=3)
+
+    assert [attempt.attempt for attempt in attempts] == [1, 2, 3]
+    assert [attempt.backoff_seconds is not None for attempt in attempts] == [True, True, False]
+
+
+def test_single_attempt_is_not_retried() -> None:
+    policy = RetryPolicy(max_attempts=1, base_delay_seconds=0, deadline_seconds=60)
+
+    assert _fail(policy, TimeoutError("Timed out"), attempts=1)[0].backoff_seconds is None
+
+
+def test_no_retry_past_deadline() -> None:
+    policy = RetryPolicy(max_attempts=5, base_delay_seconds=0, deadline_seconds=10)
+    first_start = datetime.now(tz=timezone.utc) - timedelta(seconds=11)
+
+    attempts = _fail(policy, TimeoutError("Timed out"), attempts=1, first_start=first_start)
+
+    assert attempts[0].retryable
+    assert attempts[0].backoff_seconds is None
+
+
+def test_no_retry_if_the_backoff_ends_past_deadline() -> None:
+    policy = RetryPolicy(max_attempts=5, base_delay_seconds=1, deadline_seconds=10)
+
+    attempts = policy.record_failure([], datetime.now(tz=timezone.utc), RateLimitedError("Rate limited", 30))
+
+    assert attempts[0].backoff_seconds is None
+
+
+def test_rate_limit_waits_for_retry_after() -> None:
+    policy = RetryPolicy(max_attempts=3, base_delay_seconds=1, deadline_seconds=60)
+
+    attempts = policy.record_failure([], datetime.now(tz=timezone.utc), RateLimitedError("Rate limited", 7))
+
+    assert attempts[0].backoff_seconds == 7
+
+
+@pytest.mark.parametrize(
+    "error",
+    [ValueError("Bad value"), TypeError("Bad type"), KeyError("id"), AttributeError("id"), NotImplementedError()],
+)
+def test_fatal_errors_are_not_retried(error: Exception) -> None:
+    policy = RetryPolicy(max_attempts=3, base_delay_seconds=0, deadline_seconds=60)
+
+    attempts = policy.record_failure([], datetime.now(tz=timezone.utc), error)
+
+    assert not is_retryable(error)
+    assert not attempts[0].retryable and attempts[0].backoff_seconds is None
+
+
+def test_validation_errors_are_not_retried() -> None:
+    assert not is_retryable(_validation_error())
+
+
+def test_transient_errors_are_retried() -> None:
+    assert is_retryable(RateLimitedError("Rate limited", 1))
+    assert is_retryable(TimeoutError())
+    assert is_retryable(ConnectionError())
+    assert is_retryable(httpx.ConnectError("Connection refused"))
+    assert is_retryable(_status_error(503))
+    assert is_retryable(_status_error(429))
+    assert not is_retryable(_status_error(404))
+    # Unknown errors are retried
+    assert is_retryable(RuntimeError("Unknown"))
+
+
+def test_classifier_overrides_classification() -> None:
+    assert not is_retryable(TimeoutError(), classifier=lambda error: False)
+    assert is_retryable(ValueError(), classifier=lambda error: True)
+    assert not is_retryable(ValueError(), classifier=lambda error: None)
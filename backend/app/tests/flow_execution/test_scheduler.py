@@ -0,0 +1,151 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Iterable, List, Tuple
+from uuid import uuid4
+
+from app.core.shared_models import FlowStatus, TaskStatus
+from app.flow_execution.core import ExecutionContext, TaskOutcome
+from app.flow_execution.decorators import TaskResult
+from app.flow_execution.scheduler import DAGScheduler
+from app.schemas.dependency import DependencyBase
+from app.schemas.flow import FlowBase
+from app.schemas.flow_run import FlowRun
+from app.schemas.task_operation import TaskOperationBase
+from app.schemas.task_run import TaskRun
+
+
+def _flow(task_operation_count: int, edges: Iterable[Tuple[int, int]] = ()) -> FlowBase:
+    flow = FlowBase(
+        name="Flow",
+        task_operations=[
+            TaskOperationBase(name=f"Task {index}", task_definition=uuid4(), index=index)
+            for index in range(task_operation_count)
+        ],
+        dependencies=[
+            DependencyBase(source_task_operation=source, target_task_operation=target) for source, target in edges
+        ],
+    )
+    flow.topological_sort()
+    return flow
+
+
+# 0 -> 1 -> 3 and 0 -> 2 -> 3
+DIAMOND = [(0, 1), (0, 2), (1, 3), (2, 3)]
+
+
+class FakeStateWriter:
+    """
+    Drops the state changes the ExecutionContext would write to the database.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return lambda *args, **kwargs: None
+
+
+class FakeExecutionContext(ExecutionContext):
+    """
+    ExecutionContext without a database, whose tasks sleep for a moment instead of calling an integration.
+    """
+
+    def __init__(self, flow: FlowBase, max_concurrency: int, failing: Iterable[int] = ()) -> None:
+        flow_run = FlowRun(id=uuid4(), flow=uuid4(), status=FlowStatus.IN_PROGRESS, triggered_time=datetime.now())
+        super().__init__(db=None, user=None, flow=flow, flow_run=flow_run, max_concurrency=max_concurrency)
+        self.state_writer = FakeStateWriter()
+        self.failing = set(failing)
+        self.started: List[int] = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def _get_flow_request(self) -> None:
+        return None
+
+    def _hold_claim(self, flow_run: FlowRun) -> None:
+        return None
+
+    def _publish_flow_run(self, flow_run: FlowRun) -> None:
+        pass
+
+    def _publish_task_run(self, task_run: TaskRun) -> None:
+        pass
+
+    def _dispatch_task(self, executor: ThreadPoolExecutor, task_op: TaskOperationBase, task_run: TaskRun) -> Future:
+        return executor.submit(self._fake_task, task_op)
+
+    def _fake_task(self, task_op: TaskOperationBase) -> TaskOutcome:
+        with self.lock:
+            self.started.append(task_op.index)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+
+        if task_op.index in self.failing:
+            return TaskResult.failure("Failed"), None, None
+        return TaskResult.success([]), None, None
+
+
+def test_ready_once_upstream_completed() -> None:
+    scheduler = DAGScheduler(_flow(4, DIAMOND))
+
+    assert [task_op.index for task_op in scheduler.ready()] == [0]
+    scheduler.mark_dispatched(0)
+    assert scheduler.ready() == []
+
+    scheduler.mark_completed(0)
+    assert [task_op.index for task_op in scheduler.ready()] == [1, 2]
+
+    scheduler.mark_completed(1)
+    # 3 still waits for 2
+    assert [task_op.index for task_op in scheduler.ready()] == [2]
+
+    scheduler.mark_completed(2)
+    assert [task_op.index for task_op in scheduler.ready()] == [3]
+    assert not scheduler.is_finished()
+    scheduler.mark_completed(3)
+    assert scheduler.is_finished()
+
+
+def test_ancestors_and_descendants() -> None:
+    scheduler = DAGScheduler(_flow(5, DIAMOND))
+
+    assert scheduler.ancestors(3) == {0, 1, 2}
+    assert scheduler.descendants([1]) == {3}
+    assert scheduler.descendants([0]) == {1, 2, 3}
+    assert scheduler.descendants([4]) == set()
+
+
+def test_run_flow_respects_max_concurrency() -> None:
+    context = FakeExecutionContext(_flow(6), max_concurrency=2)
+
+    flow_run = context.run_flow()
+
+    assert flow_run.status == FlowStatus.COMPLETED
+    assert sorted(context.started) == list(range(6))
+    assert context.max_running == 2
+
+
+def test_run_flow_runs_independent_tasks_in_parallel() -> None:
+    context = FakeExecutionContext(_flow(4, DIAMOND), max_concurrency=4)
+
+    context.run_flow()
+
+    assert context.started[0] == 0 and context.started[-1] == 3
+    # 1 and 2 only depend on 0, so they run at the same time
+    assert context.max_running == 2
+
+
+def test_failure_cancels_dependents() -> None:
+    # 0 -> 1 -> 2, and 3 on its own
+    context = FakeExecutionContext(_flow(4, [(0, 1), (1, 2)]), max_concurrency=2, failing=[0])
+
+    flow_run = context.run_flow()
+
+    assert flow_run.status == FlowStatus.FAILED
+    # Dependents of the failed task are never started; 3 was dispatched next to it
+    assert sorted(context.started) == [0, 3]
+    statuses = {task_run.task_operation_index: task_run.status for task_run in flow_run.task_runs}
+    assert statuses == {0: TaskStatus.FAILED, 3: TaskStatus.COMPLETED}
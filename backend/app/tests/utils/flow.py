@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.core.shared_models import FlowStatus
+from app.models.flow import Flow
+from app.models.flow_run import FlowRun
+from app.schemas.flow import FlowCreate
+from app.schemas.task_operation import TaskOperationBase
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_flow(db: Session) -> Flow:
+    user = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
+    task_definition = crud.task_definition.get_multi(db, limit=1)[0]
+    flow_in = FlowCreate(
+        name=random_lower_string(),
+        task_operations=[TaskOperationBase(name=random_lower_string(), task_definition=task_definition.id, index=0)],
+        dependencies=[],
+    )
+    return crud.flow.create(db=db, flow=flow_in, current_user=user)
+
+
+def create_random_flow_run(db: Session, status: FlowStatus = FlowStatus.PENDING) -> FlowRun:
+    user = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
+    flow = create_random_flow(db)
+    flow_run = models.FlowRun(flow=flow.id, status=status, triggered_time=datetime.now(), triggered_by=user.email)
+    return crud.flow_run.create(db=db, obj_in=flow_run, current_user=user)
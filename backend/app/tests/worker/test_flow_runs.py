@@ -0,0 +1,50 @@
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.shared_models import FlowStatus
+from app.db.session import session_scope
+from app.flow_execution.core import ExecutionContext
+from app.tests.utils.flow import create_random_flow_run
+from app.worker.flow_runs import run_flow
+
+
+@pytest.fixture
+def eager_celery(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+
+def test_run_flow_on_eager_broker(db: Session, eager_celery: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    executed = []
+    monkeypatch.setattr(ExecutionContext, "run_flow", lambda self: executed.append(self.flow_run.id))
+    flow_run = create_random_flow_run(db)
+
+    assert run_flow.delay(str(flow_run.id), settings.FIRST_SUPERUSER).get() == str(flow_run.id)
+    # A redelivered message does not execute the claimed flow run again
+    assert run_flow.delay(str(flow_run.id), settings.FIRST_SUPERUSER).get() is None
+    assert executed == [flow_run.id]
+    db.refresh(flow_run)
+    assert flow_run.status == FlowStatus.IN_PROGRESS
+    assert flow_run.claimed_by
+
+
+def test_run_flow_refreshes_its_claim(db: Session, eager_celery: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    claimed_at = []
+
+    def run_flow_slowly(self: ExecutionContext) -> None:
+        for _ in range(2):
+            with session_scope() as session:
+                claimed_at.append(crud.flow_run.get(session, self.flow_run.id).claimed_at)
+            time.sleep(0.5)
+
+    monkeypatch.setattr(settings, "FLOW_RUN_CLAIM_HEARTBEAT_SECONDS", 0.1)
+    monkeypatch.setattr(ExecutionContext, "run_flow", run_flow_slowly)
+    flow_run = create_random_flow_run(db)
+
+    run_flow.delay(str(flow_run.id), settings.FIRST_SUPERUSER).get()
+
+    assert claimed_at[1] > claimed_at[0]
@@ -1,3 +1,4 @@
 from app.core.celery_app import celery_app
 
 from .tests import test_celery
+from .flow_runs import run_flow
@@ -0,0 +1,57 @@
+import os
+import socket
+from typing import Optional
+
+from celery.utils.log import get_task_logger
+
+from app import crud, schemas
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.flow_execution.claims import start_claim_heartbeat
+from app.flow_execution.core import ExecutionContext
+
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(bind=True, acks_late=True)
+def run_flow(self, flow_run_id: str, user_email: str, max_concurrency: Optional[int] = None) -> Optional[str]:
+    """
+    Executes a pending flow run on a worker.
+
+    The flow run is claimed in the database before it is executed, so a message that is delivered more
+    than once (e.g. after a worker was lost with acks_late) does not execute the same run twice.
+    The run is always resumed from its checkpoint: task operations that already completed, in an earlier
+    attempt or on a worker that was lost, are not executed again. While the run executes, its claim is
+    refreshed in the background, so a redelivery of a run that takes longer than the claim timeout does not
+    execute it a second time.
+    """
+    db = SessionLocal()
+    stop_heartbeat = None
+    try:
+        # A redelivered message keeps its id, so the process is part of the id of the worker
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{self.request.id}"
+        flow_run_db = crud.flow_run.claim(
+            db, id=flow_run_id, worker_id=worker_id, claim_timeout_seconds=settings.FLOW_RUN_CLAIM_TIMEOUT_SECONDS
+        )
+        if flow_run_db is None:
+            logger.info(f"Flow run {flow_run_id} is already claimed or finished; skipping.")
+            return None
+
+        stop_heartbeat = start_claim_heartbeat(flow_run_id, worker_id)
+
+        user = crud.user.get_cached_by_email(db, email=user_email)
+        flow = schemas.Flow.from_orm(crud.flow.get(db, flow_run_db.flow))
+        flow_run = schemas.FlowRun.from_orm(flow_run_db)
+
+        execution_context = ExecutionContext(
+            db=db, user=user, flow=flow, flow_run=flow_run, max_concurrency=max_concurrency, resume=True
+        )
+        execution_context.run_flow()
+
+        return flow_run_id
+    finally:
+        if stop_heartbeat is not None:
+            stop_heartbeat.set()
+        db.close()
+
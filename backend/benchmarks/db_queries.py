@@ -0,0 +1,208 @@
+"""
+Benchmark of the hot lookup queries of the CRUD layer against a local Postgres.
+
+Seeds the database with flows, flow runs and task runs at a realistic volume (by default 200 flows with 50 runs of
+10 tasks each, i.e. 100,000 task runs), then runs each lookup `--repeat` times and prints its median and p95 latency
+and its query plan, so a missing index shows up as a sequential scan.
+
+Needs a database migrated to the latest revision, with the first superuser and the task definitions synced (as the
+app does on startup). Seeded rows are not removed; use a throwaway database.
+
+Usage, from the backend directory with the usual environment variables set:
+
+    python -m benchmarks.db_queries --flows 200 --runs-per-flow 50 --tasks-per-run 10
+    python -m benchmarks.db_queries --skip-seed --repeat 50
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Query, Session
+
+from app import crud
+from app.core.config import settings
+from app.core.shared_models import FlowStatus, TaskStatus
+from app.db.session import SessionLocal, engine
+from app.models import FlowRun, TaskDefinition, TaskRun
+from app.schemas.dependency import DependencyBase
+from app.schemas.flow import FlowCreate
+from app.schemas.task_operation import TaskOperationBase
+
+# Task runs are inserted in batches of this many rows
+BATCH_SIZE = 5000
+
+
+def seed(db: Session, flows: int, runs_per_flow: int, tasks_per_run: int) -> None:
+    user = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
+    task_definition = crud.task_definition.get_multi(db, limit=1)[0]
+    now = datetime.now(tz=timezone.utc)
+
+    task_runs = []
+    for flow_number in range(flows):
+        flow = crud.flow.create(
+            db=db,
+            flow=FlowCreate(
+                name=f"benchmark-{flow_number}",
+                task_operations=[
+                    TaskOperationBase(name=f"task-{index}", task_definition=task_definition.id, index=index)
+                    for index in range(tasks_per_run)
+                ],
+                dependencies=[
+                    DependencyBase(source_task_operation=index, target_task_operation=index + 1)
+                    for index in range(tasks_per_run - 1)
+                ],
+            ),
+            current_user=user,
+        )
+
+        # A year of history, most runs completed
+        triggered_times = sorted(
+            now - timedelta(minutes=random.randint(0, 365 * 24 * 60)) for _ in range(runs_per_flow)
+        )
+        flow_run_ids = crud.flow_run.insert_many(
+            db,
+            rows=[
+                {
+                    "flow": flow.id,
+                    "status": random.choices([FlowStatus.COMPLETED, FlowStatus.FAILED], weights=[9, 1])[0],
+                    "triggered_time": triggered_time,
+                    "end_time": triggered_time + timedelta(seconds=tasks_per_run * 2),
+                    "triggered_by": user.email,
+                }
+                for triggered_time in triggered_times
+            ],
+        )
+        for flow_run_id, triggered_time in zip(flow_run_ids, triggered_times):
+            for index in range(tasks_per_run):
+                start_time = triggered_time + timedelta(seconds=index * 2)
+                task_runs.append(
+                    {
+                        "flow_run": flow_run_id,
+                        "task_operation_index": index,
+                        "status": TaskStatus.COMPLETED,
+                        "start_time": start_time,
+                        "end_time": start_time + timedelta(seconds=1),
+                        "result": {"data": {"id": str(flow_run_id), "index": index}},
+                    }
+                )
+        if len(task_runs) >= BATCH_SIZE:
+            crud.task_run.insert_many(db, rows=task_runs)
+            task_runs = []
+        db.commit()
+        print(f"Seeded {flow_number + 1}/{flows} flows", end="\r")
+
+    crud.task_run.insert_many(db, rows=task_runs)
+    db.commit()
+    print()
+
+    # Fresh statistics, so the planner knows the tables are no longer small
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+
+
+def explain(db: Session, query: Query) -> str:
+    compiled = query.statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True, "render_postcompile": True}
+    )
+    rows = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) {compiled}")).all()
+    return "\n".join(f"    {row[0]}" for row in rows)
+
+
+def measure(lookup: Callable[[], Any], repeat: int) -> List[float]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lookup()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def lookups(db: Session) -> List[Tuple[str, Callable[[], Any], Query]]:
+    """
+    The lookups to benchmark: the CRUD method that is timed, and the main query it issues, whose plan is shown.
+    """
+    user = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
+    flow_run = db.query(FlowRun).order_by(FlowRun.triggered_time.desc()).first()
+    flow_id, flow_run_id = flow_run.flow, flow_run.id
+    task_names = [name for (name,) in db.query(TaskDefinition.task_name).filter(TaskDefinition.deleted_at.is_(None))]
+    integration_id: UUID = db.query(TaskDefinition.integration).first()[0]
+
+    return [
+        (
+            "task runs of a flow run",
+            lambda: crud.task_run.get_page(db, flow_run_id=flow_run_id),
+            db.query(TaskRun).filter(TaskRun.flow_run == flow_run_id).order_by(TaskRun.start_time.desc()),
+        ),
+        (
+            "flow runs of a flow, latest first",
+            lambda: crud.flow_run.get_multi_by_flow_id(db, flow_id, limit=20),
+            db.query(FlowRun).filter(FlowRun.flow == flow_id).order_by(FlowRun.triggered_time.desc()).limit(20),
+        ),
+        (
+            "failed flow runs, latest first",
+            lambda: crud.flow_run.get_page(db, status=FlowStatus.FAILED, limit=20),
+            db.query(FlowRun)
+            .filter(FlowRun.status == FlowStatus.FAILED)
+            .order_by(FlowRun.triggered_time.desc(), FlowRun.id.desc())
+            .limit(21),
+        ),
+        (
+            "flow with its graph",
+            lambda: crud.flow.get(db, flow_id),
+            db.query(crud.task_operation.model).filter(crud.task_operation.model.flow == flow_id),
+        ),
+        (
+            "task definitions by name",
+            lambda: crud.task_definition.get_by_names(db, task_names),
+            db.query(TaskDefinition).filter(
+                TaskDefinition.task_name.in_(task_names), TaskDefinition.deleted_at.is_(None)
+            ),
+        ),
+        (
+            "integration credential of a user",
+            lambda: crud.integration_credential.get_by_integration_and_user_email(
+                db, integration_id=integration_id, modified_by_email=user.email
+            ),
+            db.query(crud.integration_credential.model).filter(
+                crud.integration_credential.model.integration == integration_id,
+                crud.integration_credential.model.modified_by_email == user.email,
+            ),
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", type=int, default=200, help="Number of flows to seed")
+    parser.add_argument("--runs-per-flow", type=int, default=50, help="Number of flow runs per flow")
+    parser.add_argument("--tasks-per-run", type=int, default=10, help="Number of task operations per flow")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of times each lookup is run")
+    parser.add_argument("--skip-seed", action="store_true", help="Benchmark the rows already in the database")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if not args.skip_seed:
+            seed(db, args.flows, args.runs_per_flow, args.tasks_per_run)
+        print(f"{db.query(TaskRun).count()} task runs, {db.query(FlowRun).count()} flow runs\n")
+
+        for name, lookup, query in lookups(db):
+            durations = measure(lookup, args.repeat)
+            db.expunge_all()
+            print(
+                f"{name:<36} median {statistics.median(durations):7.2f} ms, "
+                f"p95 {sorted(durations)[max(0, int(len(durations) * 0.95) - 1)]:7.2f} ms"
+            )
+            print(explain(db, query))
+            db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
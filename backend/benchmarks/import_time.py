@@ -0,0 +1,68 @@
+"""
+Benchmark of the time it takes to import the app, i.e. the time before a new API or worker process can serve.
+
+Imports `app.main` in a fresh interpreter with `-X importtime`, then prints the total and the modules that took
+longest themselves (excluding what they import). Importing must not contact other systems: services that do are
+registered with `app.core.services` and built on first use or on warm-up, after the server accepts traffic.
+
+Exits with a non-zero status if the import takes longer than `--budget-ms`, so it can guard the budget in CI.
+
+Usage, from the backend directory with the usual environment variables set:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module app.worker --top 30 --budget-ms 3000
+"""
+import argparse
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+# A line of the `-X importtime` output: "import time: <self us> | <cumulative us> | <indented module name>"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure(module: str) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """
+    Imports the module in a new interpreter. Returns the total in milliseconds, and the self and cumulative
+    milliseconds of every module imported along the way.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{process.stderr[-4000:]}")
+
+    modules = []
+    total = 0.0
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+        if not indent:
+            # Top-level imports of the interpreter and of the module itself add up to the total
+            total += int(cumulative_us) / 1000
+    return total, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest modules to print")
+    parser.add_argument("--budget-ms", type=float, default=5000, help="Maximum import time in milliseconds")
+    args = parser.parse_args()
+
+    total, modules = measure(args.module)
+    print(f"{'module':<60} {'self ms':>9} {'cumul. ms':>10}")
+    for name, self_ms, cumulative_ms in sorted(modules, key=lambda module: module[1], reverse=True)[: args.top]:
+        print(f"{name:<60} {self_ms:9.1f} {cumulative_ms:10.1f}")
+    print(f"\nImporting {args.module} took {total:.0f} ms ({len(modules)} modules), budget {args.budget_ms:.0f} ms")
+
+    if total > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of the HTTP layer of the TrelloIntegration against a local stub of the Trello API.
+
+Runs a chained Get Boards -> Get Board -> Update Board flow, once with a new connection per call (the module-level
+`requests` functions the integration used before) and once through the shared, keep-alive httpx client. The stub
+server sleeps for `--handshake-ms` on every new connection, to stand in for the TCP and TLS handshake with
+api.trello.com.
+
+Usage, from the backend directory with the usual environment variables set:
+
+    python -m benchmarks.trello_http --chains 50 --handshake-ms 30
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import requests
+
+from app.flow_execution.http_client import close_http_clients, get_http_client
+from app.flow_execution.integrations.trello import TrelloIntegration
+from app.flow_execution.models.trello import TrelloBoardGet, TrelloBoardUpdate
+from app.flow_execution.rate_limit import TokenBucket
+
+
+class StubTrelloHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs stall kept-alive connections
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+
+    def setup(self) -> None:
+        super().setup()
+        time.sleep(self.handshake_seconds)
+
+    def _respond(self) -> None:
+        if self.path.split("?")[0].endswith("members/me/boards"):
+            body = [{"id": f"board-{i}", "name": f"Board {i}"} for i in range(10)]
+        else:
+            body = {"id": "board-0", "name": "Board 0"}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_PUT = do_POST = do_DELETE = _respond
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def stub_trello_integration(base_url: str) -> TrelloIntegration:
+    """
+    Creates a TrelloIntegration pointing at the stub server, without fetching credentials from the key vault.
+    """
+    trello = TrelloIntegration.__new__(TrelloIntegration)
+    trello.key, trello.token, trello.user = "key", "token", None
+    trello.base_url = base_url
+    trello.headers = trello._construct_headers()
+    trello.base_params = trello._construct_base_params()
+    trello.client = get_http_client(base_url)
+    # Unlimited, so the benchmark measures the HTTP layer and not the pacing
+    trello.rate_limit = TokenBucket(rate=float("inf"), capacity=float("inf"), max_wait_seconds=0)
+    return trello
+
+
+def chain_with_requests(trello: TrelloIntegration) -> None:
+    boards = requests.get(url=f"{trello.base_url}members/me/boards", headers=trello.headers, params=trello.base_params)
+    board_id = boards.json()[0]["id"]
+    requests.get(url=f"{trello.base_url}boards/{board_id}", headers=trello.headers, params=trello.base_params)
+    requests.put(
+        url=f"{trello.base_url}boards/{board_id}",
+        headers=trello.headers,
+        params={**trello.base_params, "name": "Renamed"},
+    )
+
+
+def chain_with_shared_client(trello: TrelloIntegration) -> None:
+    boards = trello.get_boards()
+    board_id = boards.data[0]["id"]
+    trello.get_board(TrelloBoardGet(id=board_id))
+    trello.update_board(TrelloBoardUpdate(id=board_id, name="Renamed"))
+
+
+def measure(chain: Callable[[TrelloIntegration], None], trello: TrelloIntegration, chains: int) -> List[float]:
+    durations = []
+    for _ in range(chains):
+        start = time.perf_counter()
+        chain(trello)
+        durations.append((time.perf_counter() - start) * 1000 / 3)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chains", type=int, default=50, help="Number of Get -> Get -> Update chains per variant")
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Simulated connection setup time")
+    args = parser.parse_args()
+
+    StubTrelloHandler.handshake_seconds = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTrelloHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    trello = stub_trello_integration(f"http://127.0.0.1:{server.server_address[1]}/1/")
+    try:
+        variants = [
+            ("requests, new connection per call", chain_with_requests),
+            ("shared httpx client", chain_with_shared_client),
+        ]
+        for name, chain in variants:
+            durations = measure(chain, trello, args.chains)
+            print(
+                f"{name:<36} per call: median {statistics.median(durations):7.2f} ms, "
+                f"p95 {sorted(durations)[int(len(durations) * 0.95) - 1]:7.2f} ms"
+            )
+    finally:
+        close_http_clients()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
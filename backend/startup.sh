@@ -7,4 +7,4 @@ echo "========================================"
 echo "Running the application"
 
 
-uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 12
\ No newline at end of file
+uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY:-12}"
\ No newline at end of file